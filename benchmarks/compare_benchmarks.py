@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Benchmark Compare - ベンチマーク結果の比較スクリプト
+run_benchmarks.pyが出力した2つの結果JSON（比較元・比較先）をステージ別に比較し、
+しきい値を超えて遅くなったステージがあれば終了コード1を返す（CIでの回帰検出用）
+
+使用例:
+    python benchmarks/compare_benchmarks.py output/benchmarks/base.json output/benchmarks/head.json --threshold 0.15
+"""
+
+import sys
+import json
+import argparse
+from pathlib import Path
+
+# 比較対象外とする短いステージ（計測誤差が大きいため）の既定値（ミリ秒）
+DEFAULT_MIN_MS = 5.0
+
+
+def load_result(path):
+    """ベンチマーク結果JSONを読み込み"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def compare_results(base, head, threshold, min_ms):
+    """ステージ別の中央値を比較
+
+    Returns:
+        (rows, regressions): 比較行のリストと、しきい値を超えて遅くなった行のリスト
+    """
+    rows = []
+    regressions = []
+    for generator, head_stages in head.get('generators', {}).items():
+        base_stages = base.get('generators', {}).get(generator, {})
+        for stage, head_stage in head_stages.items():
+            base_stage = base_stages.get(stage)
+            if not base_stage:
+                continue
+            base_ms = base_stage['median_ms']
+            head_ms = head_stage['median_ms']
+            ratio = (head_ms - base_ms) / base_ms if base_ms else 0.0
+            row = {
+                'generator': generator,
+                'stage': stage,
+                'base_ms': base_ms,
+                'head_ms': head_ms,
+                'ratio': ratio
+            }
+            rows.append(row)
+            if ratio > threshold and max(base_ms, head_ms) >= min_ms:
+                regressions.append(row)
+    return rows, regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='ベンチマーク結果の比較（回帰検出）')
+    parser.add_argument('base', help='比較元の結果JSON')
+    parser.add_argument('head', help='比較先の結果JSON')
+    parser.add_argument('--threshold', type=float, default=0.1, help='回帰とみなす増加率 (default: 0.1 = 10%%)')
+    parser.add_argument('--min-ms', type=float, default=DEFAULT_MIN_MS, help=f'比較対象とする最小の処理時間 (default: {DEFAULT_MIN_MS}ms)')
+    args = parser.parse_args()
+
+    base = load_result(args.base)
+    head = load_result(args.head)
+    if base.get('size') != head.get('size'):
+        print(f"警告: 合成仕様の規模が異なります: {base.get('size', {}).get('label')} / {head.get('size', {}).get('label')}")
+
+    rows, regressions = compare_results(base, head, args.threshold, args.min_ms)
+
+    print(f"比較元: {Path(args.base).name} ({base.get('git_revision')})  比較先: {Path(args.head).name} ({head.get('git_revision')})")
+    print(f"{'generator':<12} {'stage':<40} {'base(ms)':>10} {'head(ms)':>10} {'change':>8}")
+    for row in rows:
+        mark = ' !' if row in regressions else ''
+        print(
+            f"{row['generator']:<12} {row['stage']:<40} {row['base_ms']:>10.1f} "
+            f"{row['head_ms']:>10.1f} {row['ratio']:>+8.1%}{mark}"
+        )
+
+    if regressions:
+        print(f"{len(regressions)}ステージでしきい値（{args.threshold:.0%}）を超える処理時間の増加を検出しました")
+        return 1
+    print("処理時間の回帰は検出されませんでした")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+"""
+Generator Benchmarks - ジェネレーターパイプラインのベンチマーク実行スクリプト
+合成OpenAPI仕様に対して各ジェネレーターを実行し、ステージ別の処理時間をJSONで出力する
+
+使用例:
+    python benchmarks/run_benchmarks.py --size large --repeat 5 --output output/benchmarks/head.json
+"""
+
+import sys
+import os
+import json
+import time
+import shutil
+import logging
+import argparse
+import platform
+import statistics
+import subprocess
+import tempfile
+from dataclasses import asdict
+from datetime import datetime
+from pathlib import Path
+
+import yaml
+
+# プロジェクトルートをPythonパスに追加
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from benchmarks.synthetic_spec import SyntheticSpecBuilder, add_size_arguments, size_from_args
+from generator.scripts import (
+    csv_generator, ddl_generator, spring_generator, angular_generator,
+    java_enum_generator, junit_test_generator, jmh_benchmark_generator, generation_manifest, instrumentation
+)
+
+logger = logging.getLogger(__name__)
+
+# 結果JSONの形式バージョン（compare_benchmarks.pyで互換性を確認する）
+RESULT_VERSION = 1
+
+# ベンチマーク対象のジェネレーター（実行順。ddlはcsv、junit-testはspringの結果を使用する）
+GENERATORS = ['csv', 'ddl', 'spring', 'angular', 'java-enum', 'junit-test', 'jmh']
+
+# ジェネレーターごとに計測するメソッド（ステージ）。時間は呼び出し単位の包含時間で集計する
+GENERATOR_STAGES = {
+    'csv': [
+        'load_multiple_openapi_specs', 'extract_table_definitions', 'openapi_type_to_sql_type',
+        'extract_table_options', 'resolve_foreign_keys'
+    ],
+    'ddl': [
+        'apply_table_options', 'build_all_index_definitions', 'build_seed_blocks',
+        'generate_ddl', 'generate_per_table'
+    ],
+    'spring': [
+        'load_multiple_openapi_specs', 'extract_models_and_paths_for_api', 'convert_schema_to_model',
+        'generate_validation_annotations', 'build_endpoint_descriptor', 'build_controller_context',
+        'write_controller_shards', 'generate_dto', 'generate_enum', 'write_patterns_classes',
+        'save_generation_metadata'
+    ],
+    'angular': [
+        'load_multiple_openapi_specs', 'extract_models_and_services_for_api', 'convert_schema_to_interface',
+        'convert_path_to_service_method', 'write_models', 'generate_interface', 'generate_service',
+        'write_operation_functions'
+    ],
+    'java-enum': [
+        'load_multiple_openapi_specs', 'extract_java_enums', 'generate_enum_file', 'write_enum_files'
+    ],
+    'junit-test': [
+        'load_spring_manifest', 'build_controller_test_context', 'build_dto_test_context', 'run_test_jobs'
+    ],
+    'jmh': [
+        'load_multiple_openapi_specs', 'extract_benchmark_targets', 'generate_benchmark'
+    ]
+}
+
+# ファイル書き込み時間を計測するモジュール（モジュール内の open をラップする）
+WRITE_MODULES = [
+    csv_generator, ddl_generator, spring_generator, angular_generator,
+    java_enum_generator, junit_test_generator, jmh_benchmark_generator, generation_manifest, instrumentation
+]
+
+# ファイル書き込みのステージ名
+FILE_WRITE_STAGE = 'file_write'
+
+
+class StageRecorder:
+    """ステージ別の呼び出し回数・処理時間の記録"""
+
+    def __init__(self):
+        self.stages = {}
+
+    def record(self, stage, seconds, calls=1):
+        entry = self.stages.setdefault(stage, {'calls': 0, 'seconds': 0.0})
+        entry['calls'] += calls
+        entry['seconds'] += seconds
+
+    def wrap_methods(self, generator, stage_names):
+        """ジェネレーターのインスタンスメソッドを計測付きのものに差し替える"""
+        for stage in stage_names:
+            method = getattr(generator, stage, None)
+            if method is None:
+                logger.warning(f"計測対象のメソッドが見つかりません: {type(generator).__name__}.{stage}")
+                continue
+            setattr(generator, stage, self.timed(stage, method))
+
+    def timed(self, stage, function):
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.record(stage, time.perf_counter() - started)
+        return wrapper
+
+    def timed_open(self, original_open):
+        """書き込みモードのファイルのopen・write・closeにかかった時間を計測するopen（呼び出し回数はファイル数）"""
+        recorder = self
+
+        class TimedFile:
+            def __init__(self, file):
+                self._file = file
+
+            def __getattr__(self, name):
+                return getattr(self._file, name)
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc_info):
+                self.close()
+
+            def write(self, data):
+                started = time.perf_counter()
+                try:
+                    return self._file.write(data)
+                finally:
+                    recorder.record(FILE_WRITE_STAGE, time.perf_counter() - started, calls=0)
+
+            def close(self):
+                if self._file.closed:
+                    return
+                started = time.perf_counter()
+                self._file.close()
+                recorder.record(FILE_WRITE_STAGE, time.perf_counter() - started)
+
+        def wrapper(file, mode='r', *args, **kwargs):
+            if not any(flag in mode for flag in 'wax+'):
+                return original_open(file, mode, *args, **kwargs)
+            started = time.perf_counter()
+            opened = original_open(file, mode, *args, **kwargs)
+            recorder.record(FILE_WRITE_STAGE, time.perf_counter() - started, calls=0)
+            return TimedFile(opened)
+
+        return wrapper
+
+
+class BenchmarkRunner:
+    """合成仕様に対してジェネレーターを実行し、ステージ別の処理時間を計測する"""
+
+    def __init__(self, size, config_path, workers=1, work_dir=None):
+        self.size = size
+        self.config_path = Path(config_path).resolve()
+        self.workers = workers
+        self.work_dir = Path(work_dir) if work_dir else Path(tempfile.mkdtemp(prefix='generator-bench-'))
+
+    def prepare(self):
+        """作業ディレクトリに合成仕様とベンチマーク用の設定ファイルを用意"""
+        self.work_dir.mkdir(parents=True, exist_ok=True)
+        self.openapi_files = SyntheticSpecBuilder(self.size).write(self.work_dir / 'specs')
+
+        with open(self.config_path, 'r', encoding='utf-8') as f:
+            config = yaml.safe_load(f) or {}
+        # 計測値を比較できるよう並列ワーカー数を固定する（プロセスプール内の処理は計測できないため既定は1）
+        for section in ('spring', 'junit'):
+            config.setdefault(section, {})['parallel_workers'] = self.workers
+        self.bench_config_path = self.work_dir / 'generator_config.yaml'
+        with open(self.bench_config_path, 'w', encoding='utf-8') as f:
+            yaml.safe_dump(config, f, allow_unicode=True, sort_keys=False)
+
+    def redirect_output(self, generator):
+        """生成物の出力先を作業ディレクトリに切り替える"""
+        generator.project_root = self.work_dir
+        if hasattr(generator, 'base_output_dir'):
+            if isinstance(generator, spring_generator.SpringGenerator):
+                generator.base_output_dir = self.work_dir / "output" / "backend" / "src"
+            else:
+                generator.base_output_dir = self.work_dir / "output" / "frontend"
+        if isinstance(generator, csv_generator.CSVGenerator):
+            generator.output_dir = self.work_dir / "output" / "csv"
+        if isinstance(generator, ddl_generator.DDLGenerator):
+            generator.csv_dir = self.work_dir / "output" / "csv"
+            generator.csv_path = generator.csv_dir / "table_definitions.csv"
+            generator.output_dir = self.work_dir / "output" / "ddl"
+
+    def create_generator(self, name, state):
+        config_path = str(self.bench_config_path)
+        if name == 'csv':
+            return csv_generator.CSVGenerator(self.openapi_files, config_path)
+        if name == 'ddl':
+            return ddl_generator.DDLGenerator(config_path=config_path, table_definitions=state.get('table_definitions'))
+        if name == 'spring':
+            return spring_generator.SpringGenerator(self.openapi_files, config_path)
+        if name == 'angular':
+            return angular_generator.AngularGenerator(self.openapi_files, config_path)
+        if name == 'java-enum':
+            return java_enum_generator.JavaEnumGenerator(self.openapi_files, config_path)
+        if name == 'junit-test':
+            return junit_test_generator.JunitTestGenerator(config_path)
+        return jmh_benchmark_generator.JmhBenchmarkGenerator(self.openapi_files, config_path)
+
+    def run_generator(self, name, state):
+        """ジェネレーターを1回実行し、ステージ別の計測結果を返す"""
+        recorder = StageRecorder()
+        generator = self.create_generator(name, state)
+        self.redirect_output(generator)
+        recorder.wrap_methods(generator, GENERATOR_STAGES[name])
+
+        original_opens = {module: module.__dict__.get('open') for module in WRITE_MODULES}
+        for module in WRITE_MODULES:
+            module.open = recorder.timed_open(open)
+        started = time.perf_counter()
+        try:
+            result = generator.generate()
+        except Exception as e:
+            # 失敗したジェネレーターは計測対象外とし、後続のジェネレーターは計測を続ける
+            logger.error(f"{name} の実行に失敗したため計測結果から除外します: {e}")
+            return None
+        finally:
+            total = time.perf_counter() - started
+            for module, original in original_opens.items():
+                if original is None:
+                    del module.open
+                else:
+                    module.open = original
+
+        if name == 'csv':
+            state['table_definitions'] = result
+        recorder.record('total', total)
+        return recorder.stages
+
+    def run_once(self):
+        """全ジェネレーターを1回ずつ実行（出力は毎回作り直し、前回結果による差分スキップを避ける）"""
+        output_dir = self.work_dir / 'output'
+        if output_dir.exists():
+            shutil.rmtree(output_dir)
+
+        cwd = os.getcwd()
+        os.chdir(self.work_dir)
+        try:
+            state = {}
+            return {name: self.run_generator(name, state) for name in self.generators}
+        finally:
+            os.chdir(cwd)
+
+    def run(self, generators, repeat):
+        """指定回数実行し、ステージ別の中央値・最小値を集計"""
+        self.generators = generators
+        self.prepare()
+
+        runs = []
+        for iteration in range(repeat):
+            runs.append(self.run_once())
+            logger.info(f"ベンチマーク {iteration + 1}/{repeat} 回目完了")
+
+        results = {}
+        for name in generators:
+            completed = [run[name] for run in runs if run[name] is not None]
+            if not completed:
+                continue
+            stages = {}
+            for stage in completed[0]:
+                samples = [run[stage]['seconds'] * 1000 for run in completed if stage in run]
+                stages[stage] = {
+                    'calls': completed[0][stage]['calls'],
+                    'median_ms': round(statistics.median(samples), 3),
+                    'min_ms': round(min(samples), 3),
+                    'max_ms': round(max(samples), 3)
+                }
+            results[name] = stages
+        return results
+
+
+def get_git_revision():
+    """計測対象のコミット（git管理外の場合はNone）"""
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=project_root,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='ジェネレーターパイプラインのベンチマーク')
+    add_size_arguments(parser)
+    parser.add_argument(
+        '--generators', nargs='+', choices=GENERATORS, default=GENERATORS,
+        help='計測対象のジェネレーター (default: 全て)'
+    )
+    parser.add_argument('--repeat', type=int, default=3, help='計測回数（中央値を採用, default: 3）')
+    parser.add_argument('--workers', type=int, default=1, help='Spring/JUnitの並列ワーカー数 (default: 1)')
+    parser.add_argument('--config', default=str(project_root / 'config' / 'generator_config.yaml'), help='設定ファイルのパス')
+    parser.add_argument('--work-dir', help='合成仕様・生成物の作業ディレクトリ（省略時は一時ディレクトリ）')
+    parser.add_argument('--output', help='結果JSONの出力先（省略時は標準出力）')
+    args = parser.parse_args()
+
+    # 生成ログは計測のノイズになるため警告以上のみ出力する
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s')
+    logger.setLevel(logging.INFO)
+
+    # ddlはcsv、junit-testはspringの結果を入力にするため、依存先も実行する（計測結果には含める）
+    generators = [name for name in GENERATORS if name in args.generators]
+    if 'ddl' in generators and 'csv' not in generators:
+        generators.insert(0, 'csv')
+    if 'junit-test' in generators and 'spring' not in generators:
+        generators.insert(generators.index('junit-test'), 'spring')
+
+    size = size_from_args(args)
+    runner = BenchmarkRunner(size, args.config, workers=args.workers, work_dir=args.work_dir)
+    try:
+        stages = runner.run(generators, max(args.repeat, 1))
+    finally:
+        if not args.work_dir:
+            shutil.rmtree(runner.work_dir, ignore_errors=True)
+
+    result = {
+        'version': RESULT_VERSION,
+        'generated_at': datetime.now().isoformat(),
+        'git_revision': get_git_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'size': {'label': size.label, **asdict(size)},
+        'repeat': max(args.repeat, 1),
+        'workers': args.workers,
+        'generators': stages
+    }
+
+    content = json.dumps(result, ensure_ascii=False, indent=2)
+    if args.output:
+        output_file = Path(args.output)
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(output_file, 'w', encoding='utf-8') as f:
+            f.write(content + '\n')
+        logger.info(f"ベンチマーク結果を保存しました: {output_file}")
+    else:
+        print(content)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Startup Benchmark - generator/main.py の起動時間ベンチマーク
+新しいPythonプロセスで main.py と対象ごとのジェネレーターを読み込むまでの時間を計測し、
+対象に不要な重いモジュール（SQLAlchemy等）が読み込まれていないことを確認する
+
+使用例:
+    python benchmarks/startup_benchmark.py --targets angular spring --repeat 10 --budget-ms 300
+"""
+
+import sys
+import json
+import argparse
+import platform
+import statistics
+import subprocess
+import time
+from datetime import datetime
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+
+# 対象ごとに main.py が読み込むジェネレーターモジュール
+TARGET_MODULES = {
+    'csv': ['generator.scripts.csv_generator'],
+    'ddl': ['generator.scripts.ddl_generator'],
+    'spring': ['generator.scripts.spring_generator'],
+    'angular': ['generator.scripts.angular_generator'],
+    'java-enum': ['generator.scripts.java_enum_generator'],
+    'junit-test': ['generator.scripts.junit_test_generator'],
+    'jmh': ['generator.scripts.jmh_benchmark_generator'],
+    'typespec': ['generator.scripts.typespec_generator']
+}
+
+# typespec以外の対象で読み込まれてはいけないモジュール（DB接続・ORM）
+FORBIDDEN_MODULES = ['sqlalchemy', 'psycopg2', 'generator.database']
+
+
+def build_probe(modules):
+    """計測用の子プロセスで実行するコード（読み込んだモジュールの一覧をJSONで出力）"""
+    imports = '; '.join(f"import {module}" for module in modules)
+    return (
+        f"import sys; sys.path.insert(0, {str(project_root)!r}); "
+        f"import generator.main; {imports}; "
+        "import json; print(json.dumps(sorted(sys.modules)))"
+    )
+
+
+def measure_target(target, repeat):
+    """対象の起動時間（プロセス起動〜ジェネレーター読み込み完了）を計測"""
+    probe = build_probe(TARGET_MODULES[target])
+    samples = []
+    loaded = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        completed = subprocess.run(
+            [sys.executable, '-c', probe], cwd=project_root, capture_output=True, text=True, check=True
+        )
+        samples.append((time.perf_counter() - started) * 1000)
+        loaded = json.loads(completed.stdout)
+
+    forbidden = [] if target == 'typespec' else [
+        module for module in FORBIDDEN_MODULES
+        if any(name == module or name.startswith(f"{module}.") for name in loaded)
+    ]
+    return {
+        'median_ms': round(statistics.median(samples), 3),
+        'min_ms': round(min(samples), 3),
+        'max_ms': round(max(samples), 3),
+        'modules_loaded': len(loaded),
+        'forbidden_modules': forbidden
+    }
+
+
+def measure_interpreter(repeat):
+    """比較用: Pythonインタープリター単体の起動時間"""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, '-c', 'pass'], check=True)
+        samples.append((time.perf_counter() - started) * 1000)
+    return round(statistics.median(samples), 3)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='generator/main.py の起動時間ベンチマーク')
+    parser.add_argument('--targets', nargs='+', choices=sorted(TARGET_MODULES), default=sorted(TARGET_MODULES), help='計測対象 (default: 全て)')
+    parser.add_argument('--repeat', type=int, default=5, help='計測回数（中央値を採用, default: 5）')
+    parser.add_argument('--budget-ms', type=float, help='typespec以外の対象の起動時間の上限（超えた場合は終了コード1）')
+    parser.add_argument('--output', help='結果JSONの出力先（省略時は標準出力）')
+    args = parser.parse_args()
+
+    repeat = max(args.repeat, 1)
+    targets = {target: measure_target(target, repeat) for target in args.targets}
+    result = {
+        'generated_at': datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'repeat': repeat,
+        'interpreter_ms': measure_interpreter(repeat),
+        'targets': targets
+    }
+
+    content = json.dumps(result, ensure_ascii=False, indent=2)
+    if args.output:
+        output_file = Path(args.output)
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(output_file, 'w', encoding='utf-8') as f:
+            f.write(content + '\n')
+    else:
+        print(content)
+
+    failures = []
+    for target, measured in targets.items():
+        if measured['forbidden_modules']:
+            failures.append(f"{target}: 不要なモジュールを読み込んでいます: {', '.join(measured['forbidden_modules'])}")
+        if args.budget_ms and target != 'typespec' and measured['median_ms'] > args.budget_ms:
+            failures.append(f"{target}: 起動時間 {measured['median_ms']:.1f}ms が上限 {args.budget_ms:.1f}ms を超えています")
+    for failure in failures:
+        print(failure, file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
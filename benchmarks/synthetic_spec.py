@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Synthetic Spec - ベンチマーク用の合成OpenAPI仕様生成スクリプト
+tsp-output（TypeSpecコンパイル結果）と同じ形のOpenAPI仕様を、指定した規模で生成する
+"""
+
+import argparse
+import random
+from dataclasses import dataclass, asdict
+from pathlib import Path
+
+import yaml
+
+# x-unitCheckStringで使用する文字種（XExtensionParserが解釈する値）
+UNIT_CHECK_STRINGS = [
+    'jisX0213withAlphaNumericSymbol',
+    'alphanumericPattern',
+    'halfWidthNumber',
+    'all'
+]
+
+# 文字種ごとの正規表現（TypeSpecデコレーターが出力するpatternと同じ形）
+UNIT_CHECK_PATTERNS = {
+    'jisX0213withAlphaNumericSymbol': '^[\\u3040-\\u309F\\u30A0-\\u30FF\\u4E00-\\u9FAFa-zA-Z0-9\\s!-/:-@\\[-`{-~]+$',
+    'alphanumericPattern': '^[a-zA-Z0-9]+$',
+    'halfWidthNumber': '^[0-9]+$'
+}
+
+
+@dataclass(frozen=True)
+class SpecSize:
+    """合成仕様の規模（API数 × スキーマ数 × プロパティ数 × x-拡張数 × オペレーション数）"""
+    apis: int = 3
+    schemas: int = 50
+    properties: int = 12
+    extensions: int = 3
+    operations: int = 40
+    seed: int = 0
+
+    @property
+    def label(self) -> str:
+        return f"a{self.apis}-s{self.schemas}-p{self.properties}-x{self.extensions}-o{self.operations}"
+
+
+# 規模のプリセット（--size で指定）
+PRESETS = {
+    'small': SpecSize(apis=1, schemas=10, properties=6, extensions=1, operations=8),
+    'medium': SpecSize(),
+    'large': SpecSize(apis=5, schemas=200, properties=20, extensions=4, operations=150)
+}
+
+
+class SyntheticSpecBuilder:
+    """合成OpenAPI仕様ビルダー"""
+
+    def __init__(self, size: SpecSize):
+        self.size = size
+        self.random = random.Random(size.seed)
+
+    def schema_name(self, index):
+        return f"Entity{index:04d}"
+
+    def build_property(self, index):
+        """プロパティ定義（型・制約・x-拡張を順番に割り当てる）"""
+        kind = index % 6
+        if kind == 0:
+            prop = {'type': 'integer', 'format': 'int64', 'minimum': 0, 'maximum': 1000000}
+            if self.size.extensions >= 2:
+                prop['x-unitCheckNumber'] = {'min': 0, 'max': 1000000}
+        elif kind == 1:
+            check = UNIT_CHECK_STRINGS[index % len(UNIT_CHECK_STRINGS)]
+            prop = {'type': 'string', 'maxLength': 10 + index % 90}
+            if self.size.extensions >= 1:
+                prop['x-unitCheckString'] = check
+                if check in UNIT_CHECK_PATTERNS:
+                    prop['pattern'] = UNIT_CHECK_PATTERNS[check]
+        elif kind == 2:
+            prop = {'type': 'string', 'format': 'date-time'}
+            if self.size.extensions >= 3:
+                prop['x-unitCheckInstant'] = True
+        elif kind == 3:
+            prop = {'type': 'boolean', 'default': False}
+        elif kind == 4:
+            prop = {'type': 'number', 'format': 'double'}
+            if self.size.extensions >= 2:
+                prop['x-unitCheckNumber'] = {'min': 0}
+        else:
+            prop = {'type': 'array', 'items': {'type': 'string', 'maxLength': 20}, 'minItems': 0, 'maxItems': 10}
+            if self.size.extensions >= 4:
+                prop['x-unitCheckArray'] = {'minItems': 0, 'maxItems': 10}
+        prop['description'] = f"プロパティ{index}"
+        return prop
+
+    def build_schema(self, index):
+        """エンティティスキーマ（id・タイムスタンプ付き、先行スキーマへの参照を含む）"""
+        properties = {
+            'id': {'type': 'integer', 'format': 'int64', 'description': 'ID'}
+        }
+        for prop_index in range(self.size.properties):
+            properties[f"field{prop_index:02d}"] = self.build_property(prop_index + index)
+
+        # 先行するスキーマへの参照（$ref・allOf）でスキーマグラフの解決コストも計測する
+        if index > 0:
+            target = self.schema_name(self.random.randrange(index))
+            properties['parent'] = {
+                'allOf': [{'$ref': f"#/components/schemas/{target}"}],
+                'description': '親エンティティ'
+            }
+            if self.size.extensions >= 3:
+                properties['parent']['x-unitCheckObject'] = True
+            properties['children'] = {
+                'type': 'array',
+                'items': {'$ref': f"#/components/schemas/{target}"},
+                'description': '子エンティティ'
+            }
+        properties['status'] = {
+            'allOf': [{'$ref': '#/components/schemas/EntityStatus'}],
+            'description': '状態'
+        }
+        properties['createdAt'] = {'type': 'string', 'format': 'date-time'}
+        properties['updatedAt'] = {'type': 'string', 'format': 'date-time'}
+
+        return {
+            'type': 'object',
+            'required': ['id'] + [f"field{i:02d}" for i in range(0, self.size.properties, 2)],
+            'properties': properties,
+            'description': f"エンティティ{index}"
+        }
+
+    def build_operation(self, api_name, index):
+        """オペレーション定義（一覧・取得・作成・更新・削除を順番に割り当てる）"""
+        schema = self.schema_name(index % self.size.schemas)
+        tag = f"group{index % 5}"
+        collection = f"/api/{api_name}/{schema.lower()}s"
+        item = f"{collection}/{{id}}"
+        schema_ref = {'$ref': f"#/components/schemas/{schema}"}
+        id_param = {'name': 'id', 'in': 'path', 'required': True, 'schema': {'type': 'integer', 'format': 'int64'}}
+        ok = {'200': {'description': 'The request has succeeded.', 'content': {'application/json': {'schema': schema_ref}}}}
+
+        kind = index % 5
+        if kind == 0:
+            return collection, 'get', {
+                'operationId': f"list{schema}{index}",
+                'tags': [tag],
+                'parameters': [{'name': 'keyword', 'in': 'query', 'required': False, 'schema': {'type': 'string'}}],
+                'responses': {'200': {'description': 'The request has succeeded.', 'content': {
+                    'application/json': {'schema': {'type': 'array', 'items': schema_ref}}
+                }}}
+            }
+        if kind == 1:
+            return item, 'get', {'operationId': f"get{schema}{index}", 'tags': [tag], 'parameters': [id_param], 'responses': ok}
+        if kind == 2:
+            return collection, 'post', {
+                'operationId': f"create{schema}{index}",
+                'tags': [tag],
+                'parameters': [],
+                'requestBody': {'required': True, 'content': {'application/json': {'schema': schema_ref}}},
+                'responses': ok
+            }
+        if kind == 3:
+            return item, 'put', {
+                'operationId': f"update{schema}{index}",
+                'tags': [tag],
+                'parameters': [id_param],
+                'requestBody': {'required': True, 'content': {'application/json': {'schema': schema_ref}}},
+                'responses': ok
+            }
+        return item, 'delete', {
+            'operationId': f"delete{schema}{index}",
+            'tags': [tag],
+            'parameters': [id_param],
+            'responses': {'204': {'description': 'There is no content to send for this request.'}}
+        }
+
+    def build_spec(self, api_name):
+        """1API分のOpenAPI仕様"""
+        schemas = {
+            'EntityStatus': {
+                'type': 'string',
+                'enum': ['active', 'inactive', 'archived'],
+                'x-makeEnumJava': True,
+                'description': '状態'
+            }
+        }
+        for index in range(self.size.schemas):
+            schemas[self.schema_name(index)] = self.build_schema(index)
+
+        paths = {}
+        for index in range(self.size.operations):
+            path, method, operation = self.build_operation(api_name, index)
+            # 同じパス・メソッドが重複する場合は連番のパスに振り分ける
+            while method in paths.get(path, {}):
+                path = f"{path}/v{index}"
+            paths.setdefault(path, {})[method] = operation
+
+        return {
+            'openapi': '3.0.0',
+            'info': {'title': f"{api_name} API", 'version': '0.0.0'},
+            'tags': [{'name': f"group{i}"} for i in range(5)],
+            'paths': paths,
+            'components': {'schemas': schemas}
+        }
+
+    def write(self, output_dir):
+        """API数分の仕様ファイルを出力し、{api_name: file_path} を返す"""
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        openapi_files = {}
+        for api_index in range(self.size.apis):
+            api_name = f"bench{api_index}"
+            spec_file = output_dir / f"{api_name}.yaml"
+            with open(spec_file, 'w', encoding='utf-8') as f:
+                yaml.safe_dump(self.build_spec(api_name), f, allow_unicode=True, sort_keys=False)
+            openapi_files[api_name] = str(spec_file)
+        return openapi_files
+
+
+def add_size_arguments(parser):
+    """規模指定の引数を追加（run_benchmarks.pyと共通）"""
+    parser.add_argument('--size', choices=sorted(PRESETS), default='medium', help='規模のプリセット (default: medium)')
+    for field in ('apis', 'schemas', 'properties', 'extensions', 'operations', 'seed'):
+        parser.add_argument(f"--{field}", type=int, help=f"{field}の数（プリセットを上書き）")
+
+
+def size_from_args(args):
+    """引数からSpecSizeを組み立てる"""
+    values = asdict(PRESETS[args.size])
+    for field in values:
+        if getattr(args, field, None) is not None:
+            values[field] = getattr(args, field)
+    return SpecSize(**values)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='ベンチマーク用の合成OpenAPI仕様を生成')
+    add_size_arguments(parser)
+    parser.add_argument('--output', default='output/benchmarks/specs', help='出力ディレクトリ (default: output/benchmarks/specs)')
+    args = parser.parse_args()
+
+    size = size_from_args(args)
+    for api_name, spec_file in SyntheticSpecBuilder(size).write(args.output).items():
+        print(f"{api_name}: {spec_file}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -11,6 +11,8 @@ import os
 import argparse
 import logging
 import glob
+import json
+import time
 import yaml
 from pathlib import Path
 
@@ -18,13 +20,11 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-from generator.scripts.csv_generator import CSVGenerator
-from generator.scripts.ddl_generator import DDLGenerator
-from generator.scripts.spring_generator import SpringGenerator  
-from generator.scripts.angular_generator import AngularGenerator
-from generator.scripts.java_enum_generator import JavaEnumGenerator
-from generator.scripts.junit_test_generator import JunitTestGenerator
-from generator.scripts.typespec_generator import TypeSpecGenerator
+# 各ジェネレーターは実行する対象のものだけを読み込む（起動時間短縮のため。
+# 特にtypespecターゲットはSQLAlchemy・DB接続を読み込むため、他の対象では読み込まない）
+from generator.scripts.instrumentation import metrics
+from generator.scripts.profiling import PROFILE_MODES
+from generator.scripts.spec_cache import SpecCache
 
 # ログ設定
 logging.basicConfig(
@@ -87,12 +87,42 @@ def load_multi_api_config(config_path):
     return config
 
 
+def write_instrumentation(args, elapsed):
+    """計測結果（--stats の合計値・--trace のChromeトレース）を出力"""
+    if args.trace:
+        metrics.write_chrome_trace(args.trace)
+        logger.info(f"Chromeトレースを保存しました: {args.trace}（chrome://tracing または https://ui.perfetto.dev で表示）")
+    if args.stats == 'json':
+        stats = {
+            'target': args.target,
+            'total_ms': round(elapsed * 1000, 3),
+            **metrics.to_stats()
+        }
+        # ログは標準エラー出力のため、標準出力はJSONのみ
+        print(json.dumps(stats, ensure_ascii=False, indent=2))
+
+
 def main():
     """メイン処理 - マルチAPI対応"""
     parser = argparse.ArgumentParser(description='TypeSpec Generator - マルチAPI対応版')
+    parser.add_argument(
+        'command',
+        nargs='?',
+        choices=['generate', 'watch', 'artifacts'],
+        default='generate',
+        help='generate: 1回生成して終了 / watch: 常駐して仕様・テンプレート・設定の変更時に再生成 / '
+             'artifacts: 生成物の履歴の操作 (default: generate)'
+    )
+    parser.add_argument(
+        'artifact_args',
+        nargs='*',
+        metavar='ACTION [RUN_ID ...]',
+        help='artifacts の操作: list / diff [OLD [NEW]] / restore RUN_ID / gc '
+             '（RUN_ID は実行IDの先頭一致、latest、previous）'
+    )
     parser.add_argument(
         '--target', 
-        choices=['all', 'csv', 'ddl', 'spring', 'angular', 'java-enum', 'junit-test', 'typespec'],
+        choices=['all', 'csv', 'ddl', 'spring', 'angular', 'java-enum', 'junit-test', 'jmh', 'typespec'],
         default='all',
         help='生成対象 (default: all)'
     )
@@ -115,14 +145,172 @@ def main():
         '--api-name',
         help='TypeSpec生成対象のAPI名 (typespecターゲット時のみ有効)'
     )
+    parser.add_argument(
+        '--stats',
+        choices=['json'],
+        help='ステージ別の処理時間とカウンター（読み込んだ仕様数・書き込みファイル数等）の合計を標準出力に出力'
+    )
+    parser.add_argument(
+        '--trace',
+        help='Chromeトレース形式（JSON）の出力先。並列ワーカーのステージも含めて時系列で表示できる'
+    )
+    parser.add_argument(
+        '--profile',
+        choices=PROFILE_MODES,
+        help='生成処理をプロファイルし output/metadata/ に保存 (cprofile: .prof / sampling: pyinstrumentのspeedscope形式)'
+    )
+    parser.add_argument(
+        '--profile-top',
+        type=int,
+        default=20,
+        help='表示するホットな関数の件数 (default: 20)'
+    )
+    parser.add_argument(
+        '--socket',
+        default=str(project_root / "output" / "metadata" / "generator.sock"),
+        help='watch時の制御用Unixソケット（エディター連携用。空文字で無効, default: output/metadata/generator.sock）'
+    )
+    parser.add_argument(
+        '--poll-interval',
+        type=float,
+        default=0.2,
+        help='watch時の変更検出の間隔（秒, default: 0.2）'
+    )
+    parser.add_argument(
+        '--patch',
+        action='store_true',
+        help='artifacts diff で変更されたファイルの差分（unified diff）も表示'
+    )
     
     args = parser.parse_args()
+    if args.artifact_args and args.command != 'artifacts':
+        # 操作・実行IDの指定は artifacts のみ（他のコマンドでは無視せずエラーにする）
+        parser.error(f"{args.command} には引数を指定できません: {' '.join(args.artifact_args)}")
+    
+    if args.command == 'watch':
+        return watch(args)
+    if args.command == 'artifacts':
+        return artifacts(args)
+    
+    # 計測は --stats / --trace 指定時のみ有効（未指定時はステージの時刻取得も行わない）
+    metrics.enabled = bool(args.stats or args.trace)
+    
+    if not args.profile:
+        return run(args)
+        
+    # プロセスプールのワーカー内の処理はプロファイルに含まれないため、プロファイル取得中は並列生成しない
+    from generator.scripts.profiling import GenerationProfiler
+    profiler = GenerationProfiler(args.profile, project_root / "output" / "metadata", args.target, top=args.profile_top)
+    logger.info("プロファイル取得中はController・テストを並列生成せずに実行します（parallel_workers: 1）")
+    try:
+        with profiler:
+            result = run(args)
+    except RuntimeError as e:
+        logger.error(str(e))
+        return 1
+    profiler.save()
+    profiler.print_hot_functions()
+    return result
+
+
+def watch(args):
+    """常駐モード（ジェネレーター・テンプレート・仕様を保持し、変更された対象・APIのみ再生成）"""
+    if args.target == 'typespec':
+        logger.error("typespecターゲットは常駐モードに対応していません")
+        return 1
+    if args.legacy_mode:
+        args.input = 'output/openapi/openapi.yaml'
+        
+    from generator.scripts.watch_daemon import GeneratorDaemon, expand_targets
+    daemon = GeneratorDaemon(
+        args.input,
+        args.config,
+        expand_targets(args.target),
+        socket_path=args.socket or None,
+        poll_interval=args.poll_interval
+    )
+    return daemon.run()
+
+
+def artifacts(args):
+    """生成物の履歴の操作（一覧・差分・復元・保持期間を過ぎた履歴の削除）"""
+    from generator.scripts.artifact_store import ArtifactStore, get_artifact_settings
+    config = load_multi_api_config(args.config)
+    store = ArtifactStore.from_config(project_root, config)
+    action, *run_ids = args.artifact_args or ['list']
+    
+    try:
+        if action == 'list':
+            runs = store.list_runs()
+            if not runs:
+                logger.info(f"生成物の履歴がありません: {store.store_dir}")
+            for run_id in runs:
+                run = store.load_run(run_id)
+                summary = run['summary']
+                restored = f" <- {run['restored_from']}" if run.get('restored_from') else ''
+                print(
+                    f"{run_id}  {','.join(run['targets']):<24} {summary['files']:>6}ファイル  "
+                    f"+{summary['added']} ~{summary['modified']} -{summary['removed']}{restored}"
+                )
+                
+        elif action == 'diff':
+            if len(run_ids) > 2:
+                logger.error("artifacts diff に指定できる実行IDは2つまでです")
+                return 1
+            # 省略時は1つ前の実行 -> 最新の実行
+            old_id, new_id = (run_ids + ['latest'])[:2] if run_ids else ('previous', 'latest')
+            old_run, new_run = store.load_run(old_id), store.load_run(new_id)
+            changes = store.diff(old_run['run_id'], new_run['run_id'])
+            logger.info(f"{old_run['run_id']} -> {new_run['run_id']}")
+            for mark, kind in (('A', 'added'), ('M', 'modified'), ('D', 'removed')):
+                for path in changes[kind]:
+                    print(f"{mark} {path}")
+            if args.patch:
+                for path in changes['added'] + changes['modified'] + changes['removed']:
+                    old_entry, new_entry = old_run['files'].get(path), new_run['files'].get(path)
+                    sys.stdout.writelines(store.text_diff(
+                        path,
+                        old_entry['sha256'] if old_entry else None,
+                        new_entry['sha256'] if new_entry else None
+                    ))
+                    
+        elif action == 'restore':
+            if len(run_ids) != 1:
+                logger.error("artifacts restore には復元する実行IDを1つ指定してください")
+                return 1
+            result = store.restore(run_ids[0])
+            logger.info(
+                f"{result['restored_from']} の生成物に戻しました: 書き込み{len(result['written'])}件、"
+                f"削除{len(result['removed'])}件（実行ID: {result['run_id']}）"
+            )
+            
+        elif action == 'gc':
+            settings = get_artifact_settings(config)
+            result = store.gc(settings['keep_runs'], settings['keep_days'], sweep=True)
+            logger.info(
+                f"履歴を削除しました: 実行{result['runs_removed']}件、"
+                f"ブロブ{result['objects_removed']}件（{result['bytes_freed']:,}バイト）"
+            )
+            
+        else:
+            logger.error(f"未対応の操作です: {action}（list / diff / restore / gc）")
+            return 1
+    except (OSError, ValueError) as e:
+        logger.error(f"生成物の履歴を操作できませんでした: {e}")
+        return 1
+    return 0
+
+
+def run(args):
+    """指定された対象の生成処理を実行"""
+    started = time.perf_counter()
     
     try:
         # TypeSpec生成の場合はOpenAPIファイル検索をスキップ
         if args.target == 'typespec':
             # TypeSpec生成処理
             logger.info("TypeSpec生成を開始...")
+            from generator.scripts.typespec_generator import TypeSpecGenerator
             typespec_gen = TypeSpecGenerator(args.config)
             
             if args.api_name:
@@ -159,44 +347,81 @@ def main():
         
         logger.info(f"検出されたAPI: {list(openapi_files.keys())}")
         
+        # CSV生成で得たテーブル定義（同一実行内ではDDL生成へメモリ上で受け渡す）
+        table_definitions = None
+        
+        # パース済みOpenAPI仕様（同一実行内の生成対象間で共有し、YAMLのパースを1回にする）
+        spec_cache = SpecCache()
+        
         # 各ジェネレータの実行
         if args.target in ['all', 'csv']:
             logger.info("CSV生成を開始...")
+            from generator.scripts.csv_generator import CSVGenerator
             csv_gen = CSVGenerator(openapi_files, args.config)
-            csv_gen.generate()
+            csv_gen.spec_cache = spec_cache
+            with metrics.stage('csv.total'):
+                table_definitions = csv_gen.generate()
             logger.info("CSV生成完了")
             
         if args.target in ['all', 'ddl']:
             logger.info("DDL生成を開始...")
-            ddl_gen = DDLGenerator(config_path=args.config)
-            ddl_gen.generate()
+            from generator.scripts.ddl_generator import DDLGenerator
+            ddl_gen = DDLGenerator(config_path=args.config, table_definitions=table_definitions)
+            with metrics.stage('ddl.total'):
+                ddl_gen.generate()
             logger.info("DDL生成完了")
             
         if args.target in ['all', 'spring']:
             logger.info("Spring Boot生成を開始...")
+            from generator.scripts.spring_generator import SpringGenerator
             spring_gen = SpringGenerator(openapi_files, args.config)
-            spring_gen.generate()
+            spring_gen.spec_cache = spec_cache
+            with metrics.stage('spring.total'):
+                spring_gen.generate()
             logger.info("Spring Boot生成完了")
             
         if args.target in ['all', 'angular']:
             logger.info("Angular生成を開始...")
+            from generator.scripts.angular_generator import AngularGenerator
             angular_gen = AngularGenerator(openapi_files, args.config)
-            angular_gen.generate()
+            angular_gen.spec_cache = spec_cache
+            with metrics.stage('angular.total'):
+                angular_gen.generate()
             logger.info("Angular生成完了")
             
         if args.target in ['all', 'java-enum']:
             logger.info("Java Enum生成を開始...")
+            from generator.scripts.java_enum_generator import JavaEnumGenerator
             java_enum_gen = JavaEnumGenerator(openapi_files, args.config)
-            java_enum_gen.generate()
+            java_enum_gen.spec_cache = spec_cache
+            with metrics.stage('java_enum.total'):
+                java_enum_gen.generate()
             logger.info("Java Enum生成完了")
             
         if args.target in ['all', 'junit-test']:
             logger.info("JUnit Test生成を開始...")
+            from generator.scripts.junit_test_generator import JunitTestGenerator
             junit_gen = JunitTestGenerator(args.config)
-            junit_gen.generate()
+            with metrics.stage('junit.total'):
+                junit_gen.generate()
             logger.info("JUnit Test生成完了")
             
+        # JMHベンチマークは実行時間の長いベンチマーク用のため all には含めない
+        if args.target == 'jmh':
+            logger.info("JMHベンチマーク生成を開始...")
+            from generator.scripts.jmh_benchmark_generator import JmhBenchmarkGenerator
+            jmh_gen = JmhBenchmarkGenerator(openapi_files, args.config)
+            jmh_gen.spec_cache = spec_cache
+            with metrics.stage('jmh.total'):
+                jmh_gen.generate()
+            logger.info("JMHベンチマーク生成完了")
+            
+        # 生成物の履歴（内容アドレス方式。以前の版の参照・差分・復元は main.py artifacts）
+        from generator.scripts.artifact_store import record_generation
+        record_generation(project_root, config, [args.target])
+            
         logger.info("全ての生成処理が完了しました")
+        write_instrumentation(args, time.perf_counter() - started)
         return 0
         
     except Exception as e:
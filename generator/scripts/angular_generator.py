@@ -5,15 +5,34 @@ OpenAPI仕様からAngularのTypeScript型定義とAPIサービスを生成
 """
 
 import os
+import re
 import yaml
 import logging
-from datetime import datetime
 from pathlib import Path
-from jinja2 import Environment, FileSystemLoader
+from jinja2 import Environment, FileSystemLoader, Template
 from .x_extension_parser import XExtensionParser
+from .schema_graph import SchemaGraph
+from .instrumentation import SCHEMAS_PROCESSED, SPECS_LOADED, metrics
+from .spec_cache import load_openapi_spec
+from .generation_time import get_generated_at
 
 logger = logging.getLogger(__name__)
 
+# 配列レスポンスの返却方式（SpringGeneratorと共通: none / page / stream）
+LIST_RESPONSE_MODES = ('none', 'page', 'stream')
+
+# API呼び出しの出力形式（services: リソース単位の@Injectableサービス / functions: オペレーション単位の関数 / both: 両方）
+OUTPUT_MODES = ('services', 'functions', 'both')
+
+# 関数名に使用できないTypeScriptの予約語
+TS_RESERVED_WORDS = frozenset((
+    'break', 'case', 'catch', 'class', 'const', 'continue', 'debugger', 'default', 'delete', 'do', 'else',
+    'enum', 'export', 'extends', 'false', 'finally', 'for', 'function', 'if', 'import', 'in', 'instanceof',
+    'new', 'null', 'return', 'super', 'switch', 'this', 'throw', 'true', 'try', 'typeof', 'var', 'void',
+    'while', 'with', 'let', 'static', 'yield', 'await', 'implements', 'interface', 'package', 'private',
+    'protected', 'public'
+))
+
 
 class AngularGenerator:
     """Angular生成クラス - マルチAPI対応"""
@@ -36,6 +55,8 @@ class AngularGenerator:
             self.openapi_files = openapi_files
             
         self.config_path = config_path
+        # パース済みOpenAPI仕様のキャッシュ（SpecCache。main.py・常駐モードが設定し、未設定時は毎回パースする）
+        self.spec_cache = None
         self.project_root = Path(__file__).parent.parent.parent
         self.base_output_dir = self.project_root / "output" / "frontend"
         
@@ -50,14 +71,24 @@ class AngularGenerator:
         # x-拡張フィールドパーサーの初期化
         self.x_parser = XExtensionParser()
         
+        # 処理中のAPI仕様のスキーマグラフ（$ref・allOf解決用）
+        self.schema_graph = SchemaGraph()
+        
+        # コンパイル済みの埋め込みテンプレート（モデル・サービスごとに再コンパイルしない）
+        self.inline_templates = {}
+        
+        # 生成物に埋め込む生成日時（generation.include_timestamp が無効な場合はNone）
+        self.generated_at = None
+        
     def load_multiple_openapi_specs(self):
         """複数のOpenAPI仕様ファイルを読み込み"""
         specs = {}
         for api_name, file_path in self.openapi_files.items():
             try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    specs[api_name] = yaml.safe_load(f)
+                with metrics.stage('angular.load_spec', api=api_name):
+                    specs[api_name] = load_openapi_spec(file_path, self.spec_cache)
                     logger.info(f"{api_name} API仕様を読み込みました: {file_path}")
+                metrics.count(SPECS_LOADED)
             except Exception as e:
                 logger.error(f"{api_name} API仕様ファイルの読み込みに失敗: {e}")
                 raise
@@ -103,7 +134,9 @@ class AngularGenerator:
         base_dir = self.base_output_dir / "app" / module_name
         return {
             'models': base_dir / "models",
-            'services': base_dir / "services"
+            'services': base_dir / "services",
+            'interceptors': base_dir / "interceptors",
+            'operations': base_dir / "operations"
         }
     
     def get_api_base_url(self, api_name, config):
@@ -118,11 +151,14 @@ class AngularGenerator:
         base_url = config.get('angular', {}).get('api_base_url', 'http://localhost:8080/api')
         return f"{base_url}/{api_name}"
         
-    def extract_models_and_services_for_api(self, api_name, openapi_spec):
+    def extract_models_and_services_for_api(self, api_name, openapi_spec, config=None):
         """API別にモデルとサービスを抽出"""
+        # $ref・allOf解決用のスキーマグラフを構築
+        self.schema_graph = SchemaGraph(openapi_spec)
+        
         # スキーマからTypeScript interfaceを生成
         models = {}
-        schemas = openapi_spec.get('components', {}).get('schemas', {})
+        schemas = self.schema_graph.schemas
         
         for schema_name, schema_def in schemas.items():
             interface_data = self.convert_schema_to_interface(schema_name, schema_def)
@@ -141,16 +177,22 @@ class AngularGenerator:
                         services[service_name] = {
                             'name': service_name,
                             'api_name': api_name,
-                            'methods': []
+                            'methods': [],
+                            'request_cache': False
                         }
                     
-                    service_method = self.convert_path_to_service_method(path, method, method_def)
+                    service_method = self.convert_path_to_service_method(path, method, method_def, path_def, config)
                     services[service_name]['methods'].append(service_method)
+                    if service_method['client_cache_ttl'] is not None:
+                        services[service_name]['request_cache'] = True
                     
         return models, services
         
     def convert_schema_to_interface(self, schema_name, schema_def):
         """OpenAPIスキーマをTypeScriptインターフェースに変換（x-拡張フィールド対応版）"""
+        metrics.count(SCHEMAS_PROCESSED)
+        # allOfで合成されたスキーマは継承元のプロパティを統合
+        schema_def = self.schema_graph.compose(schema_def)
         properties = schema_def.get('properties', {})
         required = schema_def.get('required', [])
         
@@ -160,8 +202,9 @@ class AngularGenerator:
         
         for prop_name, prop_def in properties.items():
             # x-拡張フィールドからバリデーション情報を生成
-            validation_rules = self.x_parser.parse_property_extensions(prop_def)
-            angular_validators = self.x_parser.to_angular_validators(validation_rules)
+            with metrics.stage('angular.parse_x_extensions'):
+                validation_rules = self.x_parser.parse_property_extensions(prop_def)
+                angular_validators = self.x_parser.to_angular_validators(validation_rules)
             
             # バリデーター情報をフィールドに追加
             field_validators = []
@@ -223,7 +266,7 @@ class AngularGenerator:
             return service_name
         return f"{api_name.capitalize()}Service" if api_name else "ApiService"
         
-    def convert_path_to_service_method(self, path, method, method_def):
+    def convert_path_to_service_method(self, path, method, method_def, path_def=None, config=None):
         """OpenAPIパスをAngularサービスメソッドに変換"""
         operation_id = method_def.get('operationId', f"{method}_{path.replace('/', '_')}")
         
@@ -232,12 +275,8 @@ class AngularGenerator:
         path_params = []
         query_params = []
         
-        for param in method_def.get('parameters', []):
-            # $refパラメータの場合はスキップ（現時点では完全な参照解決は実装しない）
-            if '$ref' in param:
-                logger.debug(f"パラメータ参照をスキップ: {param.get('$ref')}")
-                continue
-                
+        # パス共通・components/parametersの$refを解決したパラメータ
+        for param in self.schema_graph.operation_parameters(path_def or {}, method_def):
             # nameが存在しない場合はスキップ
             if 'name' not in param:
                 logger.warning(f"パラメータに'name'がありません: {param}")
@@ -260,30 +299,51 @@ class AngularGenerator:
             
         # リクエストボディを抽出
         request_body = None
-        request_body_def = method_def.get('requestBody')
+        request_body_def = self.schema_graph.resolve(method_def.get('requestBody'))
         if request_body_def:
-            content = request_body_def.get('content', {})
-            json_content = content.get('application/json')
-            if json_content and json_content.get('schema'):
-                schema_ref = json_content['schema'].get('$ref', '')
-                if schema_ref:
-                    model_name = schema_ref.split('/')[-1]
-                    request_body = {
-                        'type': model_name,
-                        'required': request_body_def.get('required', False)
-                    }
+            model_name = self.schema_graph.type_name(self.schema_graph.json_schema(request_body_def))
+            if model_name:
+                request_body = {
+                    'type': model_name,
+                    'required': request_body_def.get('required', False)
+                }
                     
         # レスポンスタイプを抽出
         response_type = 'any'
         responses = method_def.get('responses', {})
         success_response = responses.get('200') or responses.get('201')
         if success_response:
-            content = success_response.get('content', {})
-            json_content = content.get('application/json')
-            if json_content and json_content.get('schema'):
-                schema = json_content['schema']
+            schema = self.schema_graph.json_schema(success_response)
+            if schema:
                 response_type = self.openapi_schema_to_typescript_type(schema)
+
+        # 配列を返すオペレーションはSpring側に合わせてページ分割・ストリーミングに切り替え
+        list_mode, item_type = self.get_list_response(method_def, success_response, config)
+        if list_mode == 'page':
+            response_type = f"Page<{item_type}>"
+            for name in ('page', 'size'):
+                if not any(param['name'] == name for param in query_params):
+                    param_info = {'name': name, 'type': 'number', 'required': False, 'description': ''}
+                    query_params.append(param_info)
+                    parameters.append(param_info)
+        elif list_mode == 'stream':
+            response_type = item_type
+
+        # x-cacheが指定されたGETはHTTPキャッシュインターセプターの対象にする
+        cache = None
+        if method.upper() == 'GET' and method_def.get('x-cache') and list_mode != 'stream':
+            if (config or {}).get('angular', {}).get('interceptors', True):
+                extension = method_def['x-cache'] if isinstance(method_def['x-cache'], dict) else {}
+                cache = {'max_age': int(extension.get('maxAge', 60))}
                 
+        # 重複排除・TTLキャッシュ（angular_features.request_cache）の対象はストリーミング以外のGET
+        client_cache_ttl = None
+        features = (config or {}).get('angular_features', {})
+        if features.get('request_cache', False) and method.upper() == 'GET' and list_mode != 'stream':
+            # TTLはx-cacheのclientTtl（なければmaxAge）、未指定は設定の既定値（秒）
+            extension = method_def.get('x-cache') if isinstance(method_def.get('x-cache'), dict) else {}
+            client_cache_ttl = int(extension.get('clientTtl', extension.get('maxAge', features.get('request_cache_ttl', 30))))
+
         return {
             'name': self.generate_method_name(method, path),
             'operation_id': operation_id,
@@ -294,10 +354,27 @@ class AngularGenerator:
             'query_params': query_params,
             'request_body': request_body,
             'response_type': response_type,
+            'list_mode': list_mode,
+            'cache': cache,
+            'client_cache_ttl': client_cache_ttl,
             'description': method_def.get('summary', ''),
             'detailed_description': method_def.get('description', '')
         }
         
+    def get_list_response(self, method_def, success_response, config=None):
+        """配列レスポンスの返却方式と要素型を取得（x-listResponseを優先し、未指定はlist_endpoints.modeを適用）"""
+        list_config = (config or {}).get('list_endpoints', {})
+        extension = method_def.get('x-listResponse') or {}
+        mode = extension.get('mode') or list_config.get('mode', 'none')
+        if mode not in LIST_RESPONSE_MODES or mode == 'none':
+            return None, None
+
+        schema = self.schema_graph.json_schema(success_response) if success_response else None
+        items = self.schema_graph.compose(schema).get('items') if schema else None
+        if items is None:
+            return None, None
+        return mode, self.openapi_schema_to_typescript_type(items)
+
     def generate_method_name(self, method, path):
         """HTTPメソッドとパスからメソッド名を生成"""
         method_lower = method.lower()
@@ -326,6 +403,11 @@ class AngularGenerator:
             
     def openapi_type_to_typescript_type(self, prop_def):
         """OpenAPIの型をTypeScriptの型に変換"""
+        # $ref・allOfの場合は参照先のインターフェース名を返す
+        type_name = self.schema_graph.type_name(prop_def)
+        if type_name:
+            return type_name
+            
         prop_type = prop_def.get('type')
         prop_format = prop_def.get('format')
         
@@ -350,8 +432,9 @@ class AngularGenerator:
             
     def openapi_schema_to_typescript_type(self, schema):
         """OpenAPIスキーマをTypeScriptの型に変換"""
-        if '$ref' in schema:
-            return schema['$ref'].split('/')[-1]
+        type_name = self.schema_graph.type_name(schema)
+        if type_name:
+            return type_name
         elif schema.get('type') == 'array':
             item_schema = schema.get('items', {})
             item_type = self.openapi_schema_to_typescript_type(item_schema)
@@ -364,7 +447,7 @@ class AngularGenerator:
         interface_template = """/**
  * {{ model_name }} インターフェース
  * {{ model.description }}
- * TypeSpecから自動生成 - {{ generated_at }}
+ * TypeSpecから自動生成{% if generated_at %} - {{ generated_at }}{% endif %}
  */
 export interface {{ model_name }} {
 {% for field in model.fields %}
@@ -375,29 +458,262 @@ export interface {{ model_name }} {
 {% endfor %}
 }"""
 
-        from jinja2 import Template
-        template = Template(interface_template)
-        return template.render(
-            model_name=model_name,
-            model=model,
-            generated_at=datetime.now().isoformat()
-        )
+        with metrics.stage('angular.render_model', model=model_name):
+            template = self.get_inline_template('interface', interface_template)
+            return template.render(
+                model_name=model_name,
+                model=model,
+                generated_at=self.generated_at
+            )
         
-    def generate_service(self, service_name, service, models, api_base_url):
+    def generate_page_interface(self):
+        """ページ分割レスポンスの共通インターフェースを生成（Spring Data の Page<T> に対応）"""
+        page_template = """/**
+ * Page インターフェース
+ * ページ分割された一覧レスポンス（Spring Data の Page<T> に対応）
+ * TypeSpecから自動生成{% if generated_at %} - {{ generated_at }}{% endif %}
+ */
+export interface Page<T> {
+  /**
+   * ページ内の要素
+   */
+  content: T[];
+  /**
+   * 総件数
+   */
+  totalElements: number;
+  /**
+   * 総ページ数
+   */
+  totalPages: number;
+  /**
+   * ページ番号（0始まり）
+   */
+  number: number;
+  /**
+   * ページサイズ
+   */
+  size: number;
+  first: boolean;
+  last: boolean;
+}"""
+
+        with metrics.stage('angular.render_model', model='Page'):
+            template = self.get_inline_template('page', page_template)
+            return template.render(generated_at=self.generated_at)
+
+    def get_inline_template(self, name, source):
+        """埋め込みテンプレートをコンパイル（インスタンス内でキャッシュ）"""
+        if name not in self.inline_templates:
+            self.inline_templates[name] = Template(source)
+        return self.inline_templates[name]
+
+    def get_model_signature(self, model):
+        """インターフェースの構造（フィールド名・型・省略可否）。説明文の差は無視する"""
+        return tuple((field['name'], field['type'], field['optional']) for field in model['fields'])
+
+    def write_models(self, extracted, model_layout):
+        """モデル（インターフェース）を出力し、API別に「モデル名 -> import パス」を返す
+
+        shared : 全APIのモデルを app/shared/models に1つずつ出力し、バレル（index.ts）を生成する。
+                 同名で構造が異なるモデルのみAPI別の models/ に出力する
+        per_api: API別の models/ に出力する
+        importパスは services/・operations/ からの相対パス。
+        """
+        if model_layout not in ('shared', 'per_api'):
+            logger.warning(f"未対応のモデル出力形式です（per_api として扱います）: {model_layout}")
+            model_layout = 'per_api'
+
+        # ページ分割メソッドがある場合はPageインターフェースも出力
+        page_apis = {
+            api_name for api_name, (_, services) in extracted.items()
+            if any(method['list_mode'] == 'page' for service in services.values() for method in service['methods'])
+        }
+
+        # 同名モデルの構造がAPI間で一致するものを共有対象にする
+        shared_names = set()
+        if model_layout == 'shared':
+            signatures = {}
+            for models, _ in extracted.values():
+                for model_name, model in models.items():
+                    signatures.setdefault(model_name, set()).add(self.get_model_signature(model))
+            shared_names = {name for name, variants in signatures.items() if len(variants) == 1}
+
+            # API別に出力するモデルを参照するモデルも、参照先がAPIごとに異なるため共有しない
+            changed = True
+            while changed:
+                changed = False
+                for name in list(shared_names):
+                    (signature,) = signatures[name]
+                    referenced = set(re.findall(r'[A-Za-z_][A-Za-z0-9_]*', ' '.join(field[1] for field in signature)))
+                    if referenced & (set(signatures) - shared_names):
+                        shared_names.discard(name)
+                        changed = True
+            for name in sorted(set(signatures) - shared_names):
+                logger.warning(f"API間で構造が異なる（または異なるモデルを参照する）同名モデルはAPI別に出力します: {name}")
+
+        shared_dir = self.base_output_dir / "app" / "shared" / "models"
+        shared_written = {}
+        model_paths = {}
+        for api_name, (models, _) in extracted.items():
+            output_dirs = self.get_api_output_dirs(api_name)
+            paths = {}
+            entries = list(models.items())
+            if api_name in page_apis:
+                entries.append(('Page', None))
+
+            for model_name, model in entries:
+                file_stem = f"{model_name.lower()}.model"
+                if model_layout == 'shared' and (model is None or model_name in shared_names):
+                    paths[model_name] = f"../../shared/models/{file_stem}"
+                    if model_name in shared_written:
+                        continue
+                    target_dir = shared_dir
+                    shared_written[model_name] = file_stem
+                else:
+                    paths[model_name] = f"../models/{file_stem}"
+                    target_dir = output_dirs['models']
+
+                target_dir.mkdir(parents=True, exist_ok=True)
+                interface_file = target_dir / f"{file_stem}.ts"
+                content = self.generate_page_interface() if model is None else self.generate_interface(model_name, model)
+                metrics.write_file(interface_file, content, stage='angular.write')
+                logger.info(f"TypeScriptインターフェースを生成しました: {interface_file}")
+            model_paths[api_name] = paths
+
+        if shared_written:
+            barrel_lines = [
+                "/**",
+                " * 共有モデルのバレル（全APIで構造が同じインターフェースを1つにまとめたもの）",
+                " * TypeSpecから自動生成" + (f" - {self.generated_at}" if self.generated_at else ""),
+                " */"
+            ]
+            barrel_lines.extend(
+                f"export type {{ {name} }} from './{file_stem}';"
+                for name, file_stem in sorted(shared_written.items())
+            )
+            metrics.write_file(shared_dir / "index.ts", "\n".join(barrel_lines) + "\n", stage='angular.write')
+            logger.info(f"共有モデルを生成しました: {shared_dir}（{len(shared_written)}インターフェース）")
+
+        return model_paths
+
+    def collect_method_models(self, method, models):
+        """メソッドのシグネチャ（パラメータ・リクエスト・レスポンス）が参照するモデル名を収集"""
+        type_names = [method['response_type']]
+        type_names.extend(param['type'] for param in method['parameters'])
+        if method['request_body']:
+            type_names.append(method['request_body']['type'])
+
+        referenced = set()
+        for type_name in type_names:
+            referenced.update(re.findall(r'[A-Za-z_][A-Za-z0-9_]*', type_name))
+        if method.get('list_mode') == 'page':
+            referenced.add('Page')
+        return sorted(name for name in referenced if name in models or name == 'Page')
+
+    def to_model_imports(self, model_names, model_paths=None):
+        """モデル名をimport文用の {name, path} に変換（パス未指定はAPI別の models/）"""
+        model_paths = model_paths or {}
+        return [
+            {'name': name, 'path': model_paths.get(name, f"../models/{name.lower()}.model")}
+            for name in model_names
+        ]
+
+    def to_file_stem(self, name):
+        """関数名からファイル名を生成（例: getUserById -> get-user-by-id）"""
+        stem = re.sub(r'([a-z0-9])([A-Z])', r'\1-\2', name).lower()
+        return re.sub(r'[^a-z0-9]+', '-', stem).strip('-') or 'operation'
+
+    def to_function_name(self, operation_id):
+        """operationIdからTypeScriptの関数名を生成
+
+        有効な識別子はそのまま使用し、operationId未指定時の既定値（例: get__api_items_{id}）のように
+        識別子に使えない文字を含む場合は区切ってキャメルケースにする（例: getApiItemsId）
+        """
+        if re.fullmatch(r'[A-Za-z_$][A-Za-z0-9_$]*', operation_id) and operation_id not in TS_RESERVED_WORDS:
+            return operation_id
+        words = [word for word in re.split(r'[^A-Za-z0-9]+', operation_id) if word]
+        if not words:
+            return 'operation'
+        name = words[0][0].lower() + words[0][1:] + ''.join(word[0].upper() + word[1:] for word in words[1:])
+        if name[0].isdigit():
+            name = f"op{name[0].upper()}{name[1:]}"
+        return f"{name}Operation" if name in TS_RESERVED_WORDS else name
+
+    def write_operation_functions(self, api_name, services, models, api_base_url, output_dir, model_paths=None):
+        """オペレーション単位のAPI関数とバレル（index.ts）を生成"""
+        output_dir.mkdir(parents=True, exist_ok=True)
+        base_url_name = f"{re.sub(r'[^0-9A-Za-z]+', '_', api_name).upper()}_BASE_URL"
+        generated_at = self.generated_at
+        operation_template = self.jinja_env.get_template("operation.ts.j2")
+
+        operations = []
+        used_names = set()
+        used_stems = set()
+        for service in services.values():
+            for method in service['methods']:
+                # 関数名・ファイル名が重複する場合は連番を付ける
+                base_name = self.to_function_name(method['operation_id'])
+                function_name = base_name
+                suffix = 2
+                while function_name in used_names or self.to_file_stem(function_name) in used_stems:
+                    function_name = f"{base_name}{suffix}"
+                    suffix += 1
+                if function_name != method['operation_id']:
+                    logger.info(f"{api_name} API: operationId '{method['operation_id']}' を関数名 {function_name} として出力します")
+                file_stem = self.to_file_stem(function_name)
+                used_names.add(function_name)
+                used_stems.add(file_stem)
+                with metrics.stage('angular.render_operation', operation=function_name):
+                    content = operation_template.render(
+                        api_name=api_name,
+                        method=method,
+                        function_name=function_name,
+                        base_url_name=base_url_name,
+                        model_imports=self.to_model_imports(self.collect_method_models(method, models), model_paths)
+                    )
+                metrics.write_file(output_dir / f"{file_stem}.ts", content, stage='angular.write')
+                operations.append({'function_name': function_name, 'file_stem': file_stem})
+
+        shared_files = {
+            'base-url.ts': 'base-url.ts.j2',
+            'index.ts': 'operations-index.ts.j2'
+        }
+        if any(method['list_mode'] == 'stream' for service in services.values() for method in service['methods']):
+            shared_files['ndjson.ts'] = 'ndjson.ts.j2'
+        for file_name, template_name in shared_files.items():
+            content = self.jinja_env.get_template(template_name).render(
+                api_name=api_name,
+                api_base_url=api_base_url,
+                base_url_name=base_url_name,
+                operations=operations,
+                generated_at=generated_at
+            )
+            metrics.write_file(output_dir / file_name, content, stage='angular.write')
+
+        logger.info(f"{api_name} API: API関数を生成しました: {output_dir}（{len(operations)}関数）")
+
+    def generate_service(self, service_name, service, models, api_base_url, model_paths=None):
         """Angularサービスを生成"""
         service_template = """import { Injectable } from '@angular/core';
-import { HttpClient, HttpParams } from '@angular/common/http';
+import { HttpClient, {% if service.methods|selectattr('cache')|list %}HttpContext, {% endif %}HttpParams } from '@angular/common/http';
 import { Observable } from 'rxjs';
+{% if service.request_cache %}
+import { shareReplay, tap } from 'rxjs/operators';
+{% endif %}
+{% if service.methods|selectattr('cache')|list %}
+import { HTTP_CACHE } from '../interceptors/http-cache.interceptor';
+{% endif %}
 
-{% for model_name in models.keys() %}
-import { {{ model_name }} } from '../models/{{ model_name.lower() }}.model';
+{% for model_import in model_imports %}
+import { {{ model_import.name }} } from '{{ model_import.path }}';
 {% endfor %}
 
 /**
  * {{ service_name }}
  * {{ service.api_name|title }} API用サービス
- * TypeSpecから自動生成されたAPIサービス
- * 生成日時: {{ generated_at }}
+ * TypeSpecから自動生成されたAPIサービス{% if generated_at %}
+ * 生成日時: {{ generated_at }}{% endif %}
  */
 @Injectable({
   providedIn: 'root'
@@ -405,6 +721,11 @@ import { {{ model_name }} } from '../models/{{ model_name.lower() }}.model';
 export class {{ service_name }} {
 
   private readonly baseUrl = '{{ api_base_url }}';
+{% if service.request_cache %}
+
+  // GETレスポンスのキャッシュ（キー: HTTPメソッド＋URL、完了前は実行中のリクエストを共有）
+  private readonly responseCache = new Map<string, { expiresAt: number; response$: Observable<unknown> }>();
+{% endif %}
 
   constructor(private http: HttpClient) {}
 
@@ -432,31 +753,120 @@ export class {{ service_name }} {
     {% endfor %}
     {% endif %}
 
-    {% if method.http_method == 'GET' %}
-    return this.http.get<{{ method.response_type }}>(url{% if method.query_params %}, { params }{% endif %});
-    {% elif method.http_method == 'POST' %}
-    return this.http.post<{{ method.response_type }}>(url, {% if method.request_body %}body{% else %}{}{% endif %}{% if method.query_params %}, { params }{% endif %});
-    {% elif method.http_method == 'PUT' %}
-    return this.http.put<{{ method.response_type }}>(url, {% if method.request_body %}body{% else %}{}{% endif %}{% if method.query_params %}, { params }{% endif %});
-    {% elif method.http_method == 'PATCH' %}
-    return this.http.patch<{{ method.response_type }}>(url, {% if method.request_body %}body{% else %}{}{% endif %}{% if method.query_params %}, { params }{% endif %});
-    {% elif method.http_method == 'DELETE' %}
-    return this.http.delete<{{ method.response_type }}>(url{% if method.query_params %}, { params }{% endif %});
+    {% if method.list_mode == 'stream' %}
+    return this.streamNdjson<{{ method.response_type }}>(url{% if method.query_params %}, params{% endif %});
+    {% elif method.http_method == 'GET' %}
+    {% if method.cache %}{% set request_call %}this.http.get<{{ method.response_type }}>(url, { {% if method.query_params %}params, {% endif %}context: new HttpContext().set(HTTP_CACHE, { maxAge: {{ method.cache.max_age }} }) }){% endset %}{% else %}{% set request_call %}this.http.get<{{ method.response_type }}>(url{% if method.query_params %}, { params }{% endif %}){% endset %}{% endif %}
+    {% if method.client_cache_ttl is not none %}
+    // 同じURLの実行中リクエストは共有し、完了後{{ method.client_cache_ttl }}秒間は結果を再利用
+    return this.cached<{{ method.response_type }}>(`GET ${url}{% if method.query_params %}?${params.toString()}{% endif %}`, {{ method.client_cache_ttl }}, () => {{ request_call }});
+    {% else %}
+    return {{ request_call }};
+    {% endif %}
+    {% else %}
+    {% if method.http_method == 'DELETE' %}{% set request_call %}this.http.delete<{{ method.response_type }}>(url{% if method.query_params %}, { params }{% endif %}){% endset %}{% else %}{% set request_call %}this.http.{{ method.http_method.lower() }}<{{ method.response_type }}>(url, {% if method.request_body %}body{% else %}{}{% endif %}{% if method.query_params %}, { params }{% endif %}){% endset %}{% endif %}
+    {% if service.request_cache %}
+    // 更新に成功したらこのサービスのキャッシュを破棄
+    return {{ request_call }}.pipe(tap(() => this.clearCache()));
+    {% else %}
+    return {{ request_call }};
+    {% endif %}
     {% endif %}
   }
 
 {% endfor %}
+{% if service.request_cache %}
+  /**
+   * このサービスのGETキャッシュを破棄（更新系メソッドの成功時に自動で呼び出し）
+   */
+  clearCache(): void {
+    this.responseCache.clear();
+  }
+
+  /**
+   * 同じキーの実行中リクエストを共有し（shareReplay）、完了後ttlSeconds秒間は結果を再利用する
+   * エラーになったリクエストはキャッシュしない
+   */
+  private cached<T>(key: string, ttlSeconds: number, request: () => Observable<T>): Observable<T> {
+    const current = this.responseCache.get(key);
+    if (current && current.expiresAt > Date.now()) {
+      return current.response$ as Observable<T>;
+    }
+
+    const entry = { expiresAt: Number.POSITIVE_INFINITY, response$: undefined as unknown as Observable<T> };
+    entry.response$ = request().pipe(
+      tap({
+        complete: () => {
+          entry.expiresAt = Date.now() + ttlSeconds * 1000;
+        },
+        error: () => {
+          if (this.responseCache.get(key) === entry) {
+            this.responseCache.delete(key);
+          }
+        }
+      }),
+      shareReplay({ bufferSize: 1, refCount: false })
+    );
+    this.responseCache.set(key, entry);
+    return entry.response$;
+  }
+
+{% endif %}
+{% if service.methods|selectattr('list_mode', 'equalto', 'stream')|list %}
+  /**
+   * NDJSON（1行1オブジェクトのJSON）を受信した行から順に流す
+   * HttpClientは応答全体をバッファするため、fetchのReadableStreamで逐次パースする
+   */
+  private streamNdjson<T>(url: string, params?: HttpParams): Observable<T> {
+    return new Observable<T>(subscriber => {
+      const controller = new AbortController();
+      const query = params ? `?${params.toString()}` : '';
+      fetch(`${url}${query}`, { headers: { Accept: 'application/x-ndjson' }, signal: controller.signal })
+        .then(async response => {
+          if (!response.ok || !response.body) {
+            throw new Error(`HTTP ${response.status}: ${url}`);
+          }
+          const reader = response.body.pipeThrough(new TextDecoderStream()).getReader();
+          let buffer = '';
+          for (;;) {
+            const { value, done } = await reader.read();
+            if (done) {
+              break;
+            }
+            buffer += value;
+            const lines = buffer.split('\\n');
+            buffer = lines.pop() ?? '';
+            for (const line of lines) {
+              if (line.trim()) {
+                subscriber.next(JSON.parse(line) as T);
+              }
+            }
+          }
+          if (buffer.trim()) {
+            subscriber.next(JSON.parse(buffer) as T);
+          }
+          subscriber.complete();
+        })
+        .catch(error => subscriber.error(error));
+      return () => controller.abort();
+    });
+  }
+
+{% endif %}
 }"""
 
-        from jinja2 import Template
-        template = Template(service_template)
-        return template.render(
-            service_name=service_name,
-            service=service,
-            models=models,
-            api_base_url=api_base_url,
-            generated_at=datetime.now().isoformat()
-        )
+        with metrics.stage('angular.render_service', service=service_name):
+            template = self.get_inline_template('service', service_template)
+            return template.render(
+                service_name=service_name,
+                service=service,
+                model_imports=self.to_model_imports(
+                    sorted({name for method in service['methods'] for name in self.collect_method_models(method, models)}),
+                    model_paths
+                ),
+                api_base_url=api_base_url,
+                generated_at=self.generated_at
+            )
         
     def generate(self):
         """Angular生成のメイン処理 - マルチAPI対応"""
@@ -464,13 +874,16 @@ export class {{ service_name }} {
             # 複数OpenAPI仕様とコンフィグを読み込み
             openapi_specs = self.load_multiple_openapi_specs()
             config = self.load_config()
+            self.generated_at = get_generated_at(config)
             
-            # 各APIごとに生成
+            # 全APIのモデルとサービスを先に抽出（API間で共通のモデルを判定するため）
+            extracted = {}
             for api_name, openapi_spec in openapi_specs.items():
                 logger.info(f"{api_name} APIのAngularコードを生成中...")
                 
                 # モデルとサービスを抽出
-                models, services = self.extract_models_and_services_for_api(api_name, openapi_spec)
+                with metrics.stage('angular.extract', api=api_name):
+                    models, services = self.extract_models_and_services_for_api(api_name, openapi_spec, config)
                 
                 if not models:
                     logger.warning(f"{api_name} API: モデル定義が見つかりませんでした")
@@ -479,36 +892,51 @@ export class {{ service_name }} {
                 if not services:
                     logger.warning(f"{api_name} API: API定義が見つかりませんでした")
                     services = {}
+                extracted[api_name] = (models, services)
+
+            # モデルの出力先を決定し、共有モデルとバレルを生成
+            model_layout = config.get('angular', {}).get('model_layout', 'per_api')
+            model_paths = self.write_models(extracted, model_layout)
                     
+            # 各APIごとに生成
+            for api_name, (models, services) in extracted.items():
                 # API別の出力ディレクトリを取得
                 output_dirs = self.get_api_output_dirs(api_name)
                 api_base_url = self.get_api_base_url(api_name, config)
-                
-                # モデルディレクトリを作成してインターフェース生成
-                if models:
-                    output_dirs['models'].mkdir(parents=True, exist_ok=True)
-                    
-                    for model_name, model in models.items():
-                        interface_content = self.generate_interface(model_name, model)
-                        interface_file = output_dirs['models'] / f"{model_name.lower()}.model.ts"
-                        
-                        with open(interface_file, 'w', encoding='utf-8') as f:
-                            f.write(interface_content)
-                        logger.info(f"TypeScriptインターフェースを生成しました: {interface_file}")
                         
+                output_mode = config.get('angular', {}).get('output_mode', 'services')
+                if output_mode not in OUTPUT_MODES:
+                    logger.warning(f"未対応のAngular出力形式です（services として扱います）: {output_mode}")
+                    output_mode = 'services'
+
                 # サービスディレクトリを作成してサービス生成
-                if services:
+                if services and output_mode in ('services', 'both'):
                     output_dirs['services'].mkdir(parents=True, exist_ok=True)
                     
                     for service_name, service in services.items():
-                        service_content = self.generate_service(service_name, service, models, api_base_url)
+                        service_content = self.generate_service(service_name, service, models, api_base_url, model_paths[api_name])
                         # サービス名からファイル名を生成（例: UserService -> user.service.ts）
                         service_file_name = service_name.lower().replace('service', '') + '.service.ts'
                         service_file = output_dirs['services'] / service_file_name
                         
-                        with open(service_file, 'w', encoding='utf-8') as f:
-                            f.write(service_content)
+                        metrics.write_file(service_file, service_content, stage='angular.write')
                         logger.info(f"Angularサービスを生成しました: {service_file}")
+
+                # オペレーション単位の関数（tree-shaking対応）を生成
+                if services and output_mode in ('functions', 'both'):
+                    self.write_operation_functions(
+                        api_name, services, models, api_base_url, output_dirs['operations'], model_paths[api_name]
+                    )
+
+                # x-cacheのGETがある場合はHTTPキャッシュインターセプターを生成
+                if any(method['cache'] for service in services.values() for method in service['methods']):
+                    output_dirs['interceptors'].mkdir(parents=True, exist_ok=True)
+                    interceptor_file = output_dirs['interceptors'] / "http-cache.interceptor.ts"
+                    template = self.jinja_env.get_template("http-cache.interceptor.ts.j2")
+                    metrics.write_file(
+                        interceptor_file, template.render(generated_at=self.generated_at), stage='angular.write'
+                    )
+                    logger.info(f"HTTPキャッシュインターセプターを生成しました: {interceptor_file}")
                         
                 logger.info(f"{api_name} API生成完了: {len(models)}モデル, {len(services)}サービス")
                 
@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""
+アーティファクトストア - 生成物の内容アドレス方式の履歴
+生成物を内容のハッシュ（SHA-256）をキーとするブロブとして保存し、実行ごとに「パス -> ハッシュ」の
+実行マニフェストを記録する。内容が同じファイルは1つのブロブを共有するため、履歴は変更分の容量しか増えない。
+実行間の差分・ロールバック（復元）・保持期間を過ぎた履歴の削除（GC）を行う
+
+  output/.artifacts/objects/ab/cdef...   ブロブ（ハッシュの先頭2文字でディレクトリを分割）
+  output/.artifacts/runs/<実行ID>.json    実行マニフェスト
+"""
+
+import os
+import json
+import difflib
+import hashlib
+import logging
+from datetime import datetime, timedelta
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+RUN_FORMAT = 'artifact-run'
+RUN_VERSION = 1
+
+# 実行ID（日時順に並ぶ形式）
+RUN_ID_FORMAT = '%Y%m%d_%H%M%S_%f'
+
+# 既定の設定（config/generator_config.yaml の artifacts で上書き）
+DEFAULT_SETTINGS = {
+    'store_dir': 'output/.artifacts',
+    # 履歴に記録するディレクトリ・ファイル（プロジェクトルートからの相対パス）
+    'tracked_paths': [
+        'output/backend',
+        'output/frontend',
+        'output/ddl',
+        'output/csv',
+        # 後続ジェネレーター・差分生成が参照するため、生成物と同じ時点に復元する
+        'output/metadata/spring_manifest.ndjson',
+        'output/metadata/spring_metadata.json',
+        'output/metadata/junit_test_cache.json'
+    ],
+    'exclude': ['*.tmp'],
+    'keep_runs': 20,
+    'keep_days': 14
+}
+
+
+def get_artifact_settings(config: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """アーティファクトストアの設定（未指定の項目は既定値）"""
+    return {**DEFAULT_SETTINGS, **((config or {}).get('artifacts') or {})}
+
+
+def file_digest(path: Union[str, Path]) -> str:
+    """ファイル内容のSHA-256"""
+    with open(path, 'rb') as f:
+        return hashlib.file_digest(f, 'sha256').hexdigest()
+
+
+def diff_files(old_files: Dict[str, Dict[str, Any]], new_files: Dict[str, Dict[str, Any]]) -> Dict[str, List[str]]:
+    """実行マニフェストのファイル一覧の差分（追加・削除・変更されたパス）"""
+    return {
+        'added': sorted(path for path in new_files if path not in old_files),
+        'removed': sorted(path for path in old_files if path not in new_files),
+        'modified': sorted(
+            path for path, entry in new_files.items()
+            if path in old_files and old_files[path]['sha256'] != entry['sha256']
+        )
+    }
+
+
+class ArtifactStore:
+    """生成物の内容アドレス方式の履歴"""
+
+    def __init__(self, project_root: Union[str, Path], store_dir: str = DEFAULT_SETTINGS['store_dir'],
+                 tracked_paths: Optional[Iterable[str]] = None, exclude: Optional[Iterable[str]] = None):
+        self.project_root = Path(project_root)
+        self.store_dir = self.project_root / store_dir
+        self.objects_dir = self.store_dir / 'objects'
+        self.runs_dir = self.store_dir / 'runs'
+        self.tracked_paths = list(DEFAULT_SETTINGS['tracked_paths'] if tracked_paths is None else tracked_paths)
+        self.exclude = list(DEFAULT_SETTINGS['exclude'] if exclude is None else exclude)
+
+    @classmethod
+    def from_config(cls, project_root: Union[str, Path], config: Optional[Dict[str, Any]]) -> 'ArtifactStore':
+        settings = get_artifact_settings(config)
+        return cls(project_root, settings['store_dir'], settings['tracked_paths'], settings['exclude'])
+
+    # --- ブロブ ---
+
+    def object_path(self, digest: str) -> Path:
+        return self.objects_dir / digest[:2] / digest[2:]
+
+    def put(self, path: Path, digest: str) -> None:
+        """ファイルをブロブとして保存（同じ内容のブロブがあれば何もしない）"""
+        object_path = self.object_path(digest)
+        if object_path.exists():
+            return
+        object_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = object_path.with_name(object_path.name + '.tmp')
+        with open(path, 'rb') as src, open(temp_path, 'wb') as dst:
+            while chunk := src.read(1 << 20):
+                dst.write(chunk)
+        os.replace(temp_path, object_path)
+
+    def read_blob(self, digest: str) -> bytes:
+        with open(self.object_path(digest), 'rb') as f:
+            return f.read()
+
+    # --- 実行マニフェスト ---
+
+    def iter_tracked_files(self) -> Iterator[Tuple[str, Path]]:
+        """履歴に記録するファイル（プロジェクトルートからの相対パス, 絶対パス）"""
+        store_dir = self.store_dir.resolve()
+        for tracked in self.tracked_paths:
+            root = self.project_root / tracked
+            if root.is_file():
+                candidates = [root]
+            elif root.is_dir():
+                candidates = sorted(path for path in root.rglob('*') if path.is_file())
+            else:
+                continue
+            for path in candidates:
+                if store_dir in path.resolve().parents:
+                    continue
+                if any(fnmatch(path.name, pattern) for pattern in self.exclude):
+                    continue
+                yield path.relative_to(self.project_root).as_posix(), path
+
+    def scan(self, previous: Optional[Dict[str, Any]] = None) -> Dict[str, Dict[str, Any]]:
+        """生成物をブロブとして保存し、ファイル一覧を作成
+
+        前回の実行からサイズ・更新時刻が変わっていないファイルは再ハッシュしない
+        """
+        previous_files = (previous or {}).get('files', {})
+        files = {}
+        for relative_path, path in self.iter_tracked_files():
+            stat = path.stat()
+            entry = previous_files.get(relative_path)
+            if entry is not None and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+                digest = entry['sha256']
+            else:
+                digest = file_digest(path)
+                self.put(path, digest)
+            files[relative_path] = {'sha256': digest, 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+        return files
+
+    def list_runs(self) -> List[str]:
+        """実行IDの一覧（古い順）"""
+        if not self.runs_dir.exists():
+            return []
+        return sorted(path.stem for path in self.runs_dir.glob('*.json'))
+
+    def resolve_run_id(self, run_id: str) -> str:
+        """実行IDを解決（latest: 最新 / previous: 1つ前 / 先頭一致）"""
+        runs = self.list_runs()
+        if run_id in ('latest', 'previous'):
+            index = -1 if run_id == 'latest' else -2
+            if len(runs) < -index:
+                raise ValueError(f"実行履歴がありません: {run_id}")
+            return runs[index]
+        matches = [run for run in runs if run.startswith(run_id)]
+        if len(matches) != 1:
+            raise ValueError(f"実行IDが見つからないか一意に決まりません: {run_id}")
+        return matches[0]
+
+    def load_run(self, run_id: str) -> Dict[str, Any]:
+        """実行マニフェストを読み込み"""
+        run_id = self.resolve_run_id(run_id)
+        with open(self.runs_dir / f"{run_id}.json", 'r', encoding='utf-8') as f:
+            run = json.load(f)
+        if run.get('format') != RUN_FORMAT or run.get('version') != RUN_VERSION:
+            raise ValueError(f"実行マニフェストの形式が不正です: {run_id}")
+        return run
+
+    def load_latest_run(self) -> Optional[Dict[str, Any]]:
+        return self.load_run('latest') if self.list_runs() else None
+
+    def record_run(self, targets: Iterable[str], **extra: Any) -> Tuple[Dict[str, Any], bool]:
+        """現在の生成物を実行マニフェストとして記録
+
+        Returns:
+            (実行マニフェスト, 記録したか)。前回の実行と内容が同じ場合は記録せず前回のマニフェストを返す
+        """
+        previous = self.load_latest_run()
+        files = self.scan(previous)
+        changes = diff_files(previous['files'] if previous else {}, files)
+        if previous is not None and not any(changes.values()):
+            return previous, False
+
+        now = datetime.now()
+        run_id = now.strftime(RUN_ID_FORMAT)
+        run = {
+            'format': RUN_FORMAT,
+            'version': RUN_VERSION,
+            'run_id': run_id,
+            'created_at': now.isoformat(),
+            'targets': list(targets),
+            **extra,
+            'summary': {
+                'files': len(files),
+                'bytes': sum(entry['size'] for entry in files.values()),
+                **{kind: len(paths) for kind, paths in changes.items()}
+            },
+            'files': files
+        }
+        self.runs_dir.mkdir(parents=True, exist_ok=True)
+        run_path = self.runs_dir / f"{run_id}.json"
+        temp_path = run_path.with_name(run_path.name + '.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(run, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(temp_path, run_path)
+        return run, True
+
+    # --- 差分・復元 ---
+
+    def diff(self, old_run_id: str, new_run_id: str) -> Dict[str, List[str]]:
+        """2つの実行の差分"""
+        return diff_files(self.load_run(old_run_id)['files'], self.load_run(new_run_id)['files'])
+
+    def text_diff(self, path: str, old_digest: Optional[str], new_digest: Optional[str]) -> List[str]:
+        """ファイルの統一差分形式（unified diff）の行"""
+        def read_lines(digest):
+            if digest is None:
+                return []
+            return self.read_blob(digest).decode('utf-8', errors='replace').splitlines(keepends=True)
+        return list(difflib.unified_diff(read_lines(old_digest), read_lines(new_digest), f"a/{path}", f"b/{path}"))
+
+    def restore(self, run_id: str) -> Dict[str, Any]:
+        """指定した実行の生成物に戻す（ロールバック）
+
+        最新の実行にあり指定した実行にないファイルは削除する。復元後の状態を新しい実行として記録する
+        """
+        target = self.load_run(run_id)
+        latest = self.load_latest_run() or {'files': {}}
+        written = []
+        for relative_path, entry in target['files'].items():
+            path = self.project_root / relative_path
+            if path.exists():
+                stat = path.stat()
+                current = latest['files'].get(relative_path)
+                if (current is not None and current['sha256'] == entry['sha256']
+                        and current['size'] == stat.st_size and current['mtime_ns'] == stat.st_mtime_ns):
+                    continue
+                if stat.st_size == entry['size'] and file_digest(path) == entry['sha256']:
+                    continue
+            path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = path.with_name(path.name + '.tmp')
+            with open(temp_path, 'wb') as f:
+                f.write(self.read_blob(entry['sha256']))
+            os.replace(temp_path, path)
+            written.append(relative_path)
+
+        removed = []
+        for relative_path in latest['files']:
+            if relative_path not in target['files']:
+                (self.project_root / relative_path).unlink(missing_ok=True)
+                removed.append(relative_path)
+
+        run, _ = self.record_run(['restore'], restored_from=target['run_id'])
+        return {'restored_from': target['run_id'], 'run_id': run['run_id'], 'written': written, 'removed': removed}
+
+    # --- 保持期間・GC ---
+
+    def gc(self, keep_runs: Optional[int] = DEFAULT_SETTINGS['keep_runs'],
+           keep_days: Optional[float] = DEFAULT_SETTINGS['keep_days'], sweep: bool = False) -> Dict[str, int]:
+        """保持対象外の実行を削除し、どの実行からも参照されないブロブを削除
+
+        最新の実行は常に残し、新しい順で keep_runs 件を超える実行、または keep_days 日より古い実行を削除する。
+        ブロブの走査は実行を削除した場合か sweep 指定時のみ行う
+        """
+        runs = self.list_runs()
+        cutoff = (datetime.now() - timedelta(days=keep_days)).strftime(RUN_ID_FORMAT) if keep_days else None
+        expired = [
+            run_id for index, run_id in enumerate(reversed(runs))
+            if index > 0 and ((keep_runs and index >= keep_runs) or (cutoff and run_id < cutoff))
+        ]
+        for run_id in expired:
+            (self.runs_dir / f"{run_id}.json").unlink(missing_ok=True)
+
+        result = {'runs_removed': len(expired), 'objects_removed': 0, 'bytes_freed': 0}
+        if not (expired or sweep) or not self.objects_dir.exists():
+            return result
+
+        referenced = set()
+        for run_id in self.list_runs():
+            referenced.update(entry['sha256'] for entry in self.load_run(run_id)['files'].values())
+        for object_path in self.objects_dir.glob('*/*'):
+            if object_path.parent.name + object_path.name in referenced:
+                continue
+            result['bytes_freed'] += object_path.stat().st_size
+            object_path.unlink()
+            result['objects_removed'] += 1
+        return result
+
+
+def record_generation(project_root: Union[str, Path], config: Optional[Dict[str, Any]],
+                      targets: Iterable[str]) -> Optional[Dict[str, Any]]:
+    """生成後に生成物の履歴を記録し、保持期間を過ぎた履歴を削除（generation.create_backup が false の場合は記録しない）
+
+    履歴の記録に失敗しても生成処理は失敗させない
+    """
+    if not (config or {}).get('generation', {}).get('create_backup', True):
+        return None
+    settings = get_artifact_settings(config)
+    store = ArtifactStore.from_config(project_root, config)
+    try:
+        run, recorded = store.record_run(targets)
+        collected = store.gc(settings['keep_runs'], settings['keep_days'])
+    except (OSError, ValueError) as e:
+        logger.warning(f"生成物の履歴を記録できませんでした: {e}")
+        return None
+
+    if recorded:
+        summary = run['summary']
+        logger.info(
+            f"生成物の履歴を記録しました: {run['run_id']}（{summary['files']}ファイル、"
+            f"追加{summary['added']} 変更{summary['modified']} 削除{summary['removed']}）"
+        )
+    else:
+        logger.info(f"生成物に変更がないため履歴は前回の実行を使用します: {run['run_id']}")
+    if collected['runs_removed']:
+        logger.info(
+            f"古い履歴を削除しました: 実行{collected['runs_removed']}件、"
+            f"ブロブ{collected['objects_removed']}件（{collected['bytes_freed']:,}バイト）"
+        )
+    return run
@@ -5,11 +5,16 @@ OpenAPI仕様からテーブル定義をCSV形式で出力し、DDL生成の中
 """
 
 import os
+import io
 import yaml
 import csv
+import re
 import logging
-from datetime import datetime
 from pathlib import Path
+from .schema_graph import SchemaGraph
+from .table_definition import ColumnDefinition, TableDefinition, table_definitions_to_csv_rows
+from .instrumentation import SCHEMAS_PROCESSED, SPECS_LOADED, metrics
+from .spec_cache import load_openapi_spec
 
 logger = logging.getLogger(__name__)
 
@@ -35,17 +40,23 @@ class CSVGenerator:
             self.openapi_files = openapi_files
             
         self.config_path = config_path
+        # パース済みOpenAPI仕様のキャッシュ（SpecCache。main.py・常駐モードが設定し、未設定時は毎回パースする）
+        self.spec_cache = None
         self.project_root = Path(__file__).parent.parent.parent
         self.output_dir = self.project_root / "output" / "csv"
         
+        # 処理中のAPI仕様のスキーマグラフ（$ref・allOf解決用）
+        self.schema_graph = SchemaGraph()
+        
     def load_multiple_openapi_specs(self):
         """複数のOpenAPI仕様ファイルを読み込み"""
         specs = {}
         for api_name, file_path in self.openapi_files.items():
             try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    specs[api_name] = yaml.safe_load(f)
+                with metrics.stage('csv.load_spec', api=api_name):
+                    specs[api_name] = load_openapi_spec(file_path, self.spec_cache)
                     logger.info(f"{api_name} API仕様を読み込みました: {file_path}")
+                metrics.count(SPECS_LOADED)
             except Exception as e:
                 logger.error(f"{api_name} API仕様ファイルの読み込みに失敗: {e}")
                 raise
@@ -108,6 +119,8 @@ class CSVGenerator:
             
     def openapi_type_to_sql_type(self, prop_def):
         """OpenAPIの型をSQL型に変換"""
+        # $ref・allOfは参照先の定義で判定（enum参照は文字列、モデル参照はJSONB）
+        prop_def = self.schema_graph.compose(prop_def)
         prop_type = prop_def.get('type', 'string')
         prop_format = prop_def.get('format')
         
@@ -138,25 +151,29 @@ class CSVGenerator:
         else:
             return type_mapping.get(prop_type, 'VARCHAR(255)')
             
-    def extract_table_definitions_to_csv(self, openapi_specs):
-        """複数のOpenAPI仕様からテーブル定義を抽出してCSV行のリストを作成"""
-        csv_rows = []
+    def extract_table_definitions(self, openapi_specs):
+        """複数のOpenAPI仕様からテーブル定義を抽出
+
+        Returns:
+            dict: {table_name: TableDefinition} の辞書（DDLGeneratorへそのまま受け渡し可能）
+        """
+        tables = {}
         processed_tables = set()  # 重複テーブル名の管理
         
-        # CSVヘッダー
-        csv_rows.append([
-            'api_name', 'table_name', 'column_name', 'data_type', 'nullable', 
-            'primary_key', 'unique', 'default_value', 'description'
-        ])
-        
         # 各API仕様を処理
         for api_name, openapi_spec in openapi_specs.items():
             logger.info(f"{api_name} APIからテーブル定義を抽出中...")
             
-            # OpenAPIのcomponentsセクションからスキーマを取得
-            schemas = openapi_spec.get('components', {}).get('schemas', {})
+            # OpenAPIのcomponentsセクションからスキーマを取得（$ref・allOf解決用のスキーマグラフを構築）
+            self.schema_graph = SchemaGraph(openapi_spec)
+            schemas = self.schema_graph.schemas
+            api_tables = {}  # {モデル名: TableDefinition}（外部キー解決用）
             
             for schema_name, schema_def in schemas.items():
+                metrics.count(SCHEMAS_PROCESSED)
+                # allOfで合成されたスキーマは継承元のプロパティを統合
+                schema_def = self.schema_graph.compose(schema_def)
+                
                 # エンティティかどうかを判定
                 if not self.is_entity_model(schema_name, schema_def):
                     continue
@@ -172,6 +189,13 @@ class CSVGenerator:
                 else:
                     processed_tables.add(table_name)
                 
+                table = TableDefinition(
+                    name=table_name,
+                    api_name=api_name,
+                    model_name=schema_name,
+                    options=self.extract_table_options(schema_def)
+                )
+                
                 # プロパティからカラム定義を生成
                 properties = schema_def.get('properties', {})
                 required_fields = schema_def.get('required', [])
@@ -200,91 +224,138 @@ class CSVGenerator:
                         default_value = 'false'
                     elif default_value and prop_name in ['created_at', 'updated_at']:
                         default_value = 'CURRENT_TIMESTAMP'
-                        
-                    # 説明
-                    description = prop_def.get('description', '')
                     
-                    csv_rows.append([
-                        api_name,
-                        table_name,
-                        prop_name, 
-                        data_type,
-                        'true' if nullable else 'false',
-                        'true' if is_primary else 'false',
-                        'true' if unique else 'false',
-                        str(default_value),
-                        description
-                    ])
+                    table.columns.append(ColumnDefinition(
+                        name=prop_name,
+                        data_type=data_type,
+                        nullable=nullable,
+                        primary_key=is_primary,
+                        unique=unique,
+                        default=str(default_value) or None,
+                        description=prop_def.get('description', '')
+                    ))
                     
                 # 共通カラムの追加（TypeSpecで定義されていない場合）
                 if 'createdAt' not in properties:
-                    csv_rows.append([
-                        api_name, table_name, 'created_at', 'TIMESTAMP WITH TIME ZONE',
-                        'false', 'false', 'false', 'CURRENT_TIMESTAMP', 'レコード作成日時'
-                    ])
+                    table.columns.append(ColumnDefinition(
+                        name='created_at', data_type='TIMESTAMP WITH TIME ZONE',
+                        nullable=False, default='CURRENT_TIMESTAMP', description='レコード作成日時'
+                    ))
                     
                 if 'updatedAt' not in properties:
-                    csv_rows.append([
-                        api_name, table_name, 'updated_at', 'TIMESTAMP WITH TIME ZONE', 
-                        'false', 'false', 'false', 'CURRENT_TIMESTAMP', 'レコード更新日時'
-                    ])
+                    table.columns.append(ColumnDefinition(
+                        name='updated_at', data_type='TIMESTAMP WITH TIME ZONE',
+                        nullable=False, default='CURRENT_TIMESTAMP', description='レコード更新日時'
+                    ))
                     
-        return csv_rows
+                tables[table_name] = table
+                api_tables[schema_name] = table
+            
+            # 外部キーを解決
+            self.resolve_foreign_keys(api_tables)
+                    
+        return tables
+        
+    def extract_table_options(self, schema_def):
+        """スキーマのx-拡張フィールドからテーブルオプション（パーティション・fillfactor等）を抽出"""
+        options = {}
+        
+        # x-partitionBy: カラム名、または {column, interval, precreate}
+        partition = schema_def.get('x-partitionBy')
+        if isinstance(partition, str):
+            options['partition_key'] = partition
+        elif isinstance(partition, dict) and partition.get('column'):
+            options['partition_key'] = partition['column']
+            if 'interval' in partition:
+                options['partition_interval'] = partition['interval']
+            if 'precreate' in partition:
+                options['partition_precreate'] = partition['precreate']
+        if 'x-partitionInterval' in schema_def:
+            options['partition_interval'] = schema_def['x-partitionInterval']
+        if 'x-partitionPrecreate' in schema_def:
+            options['partition_precreate'] = schema_def['x-partitionPrecreate']
+            
+        if 'x-fillfactor' in schema_def:
+            options['fillfactor'] = schema_def['x-fillfactor']
+        if schema_def.get('x-unlogged'):
+            options['unlogged'] = True
+            
+        return options
+        
+    def resolve_foreign_keys(self, api_tables):
+        """`userId` / `user_id` 形式のカラムを同一APIのエンティティテーブルへの外部キーとして解決"""
+        for table in api_tables.values():
+            for column in table.columns:
+                if column.primary_key:
+                    continue
+                match = re.match(r'^(.+?)(?:Id|_id)$', column.name)
+                if not match:
+                    continue
+                
+                # user_id -> User, orderItemId -> OrderItem
+                prefix = match.group(1)
+                model_name = ''.join(part[:1].upper() + part[1:] for part in prefix.split('_'))
+                target = api_tables.get(model_name)
+                
+                # 参照先に主キーidがある場合のみ外部キーとする
+                if target and any(c.primary_key and c.name == 'id' for c in target.columns):
+                    column.references = target.name
+        
+    def extract_table_definitions_to_csv(self, openapi_specs):
+        """複数のOpenAPI仕様からテーブル定義を抽出してCSV行のリストを作成"""
+        return table_definitions_to_csv_rows(self.extract_table_definitions(openapi_specs))
         
     def generate(self):
-        """CSV生成のメイン処理 - マルチAPI対応"""
+        """CSV生成のメイン処理 - マルチAPI対応
+
+        Returns:
+            dict: {table_name: TableDefinition} の辞書（同一プロセス内でDDLGeneratorへ受け渡す）
+        """
         try:
             # 複数OpenAPI仕様とコンフィグを読み込み
             openapi_specs = self.load_multiple_openapi_specs()
             config = self.load_config()
             
-            # テーブル定義をCSV形式で抽出
-            csv_rows = self.extract_table_definitions_to_csv(openapi_specs)
+            # テーブル定義を抽出
+            with metrics.stage('csv.extract'):
+                tables = self.extract_table_definitions(openapi_specs)
             
-            if len(csv_rows) <= 1:  # ヘッダーのみの場合
+            if not tables:
                 logger.warning("テーブル定義が見つかりませんでした")
-                return
+                return {}
                 
+            # CSVは成果物として出力（DDLへの受け渡しはメモリ上のテーブル定義で行う）
+            with metrics.stage('csv.render'):
+                buffer = io.StringIO()
+                csv.writer(buffer).writerows(table_definitions_to_csv_rows(tables))
+                csv_content = buffer.getvalue()
+            
             # 出力ディレクトリを作成
             self.output_dir.mkdir(parents=True, exist_ok=True)
             
             # CSVファイル出力
             output_file = self.output_dir / config['csv']['table_definition_file']
-            with open(output_file, 'w', encoding='utf-8', newline='') as f:
-                writer = csv.writer(f)
-                writer.writerows(csv_rows)
+            metrics.write_file(output_file, csv_content, stage='csv.write', newline='')
                 
+            # 以前の版は生成物の履歴（output/.artifacts）から参照・復元する（main.py artifacts）
             logger.info(f"マルチAPIテーブル定義CSVを生成しました: {output_file}")
             
-            # バックアップファイルも作成
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            backup_file = self.output_dir / f"table_definitions_{timestamp}.csv"
-            with open(backup_file, 'w', encoding='utf-8', newline='') as f:
-                writer = csv.writer(f)
-                writer.writerows(csv_rows)
-                
-            logger.info(f"バックアップCSVも作成しました: {backup_file}")
-            
             # API別統計をログ出力
             api_stats = {}
-            for row in csv_rows[1:]:  # ヘッダー除外
-                api_name = row[0]
-                table_name = row[1]
-                if api_name not in api_stats:
-                    api_stats[api_name] = set()
-                api_stats[api_name].add(table_name)
+            for table in tables.values():
+                api_stats.setdefault(table.api_name, []).append(table.name)
+            
+            for api_name, table_names in api_stats.items():
+                logger.info(f"{api_name} API: {len(table_names)}テーブル ({', '.join(table_names)})")
             
-            for api_name, tables in api_stats.items():
-                logger.info(f"{api_name} API: {len(tables)}テーブル ({', '.join(tables)})")
+            logger.info(f"生成されたテーブル数: {len(tables)}")
             
-            total_tables = sum(len(tables) for tables in api_stats.values())
-            logger.info(f"生成されたテーブル数: {total_tables}")
+            return tables
             
         except Exception as e:
             logger.error(f"CSV生成中にエラーが発生しました: {e}")
             raise
 
-
 if __name__ == "__main__":
     generator = CSVGenerator("output/openapi/openapi.yaml")
     generator.generate()
\ No newline at end of file
@@ -1,25 +1,49 @@
 #!/usr/bin/env python3
 """
 DDL Generator - PostgreSQL DDL生成スクリプト
-CSV形式のテーブル定義からPostgreSQLのDDLを生成
+テーブル定義（CSVGeneratorからのメモリ受け渡し、またはCSVファイル）からPostgreSQLのDDLを生成
 """
 
 import os
+import re
+import io
 import csv
+import json
 import yaml
 import logging
-from datetime import datetime
+from dataclasses import replace
+from datetime import date, datetime, timedelta
 from pathlib import Path
 from jinja2 import Environment, FileSystemLoader
+from .table_definition import (
+    ColumnDefinition,
+    IndexDefinition,
+    TableDefinition,
+    load_table_definitions_from_csv,
+    sort_tables_by_dependency,
+)
+from .generation_time import get_generated_at
+from .instrumentation import CACHE_HITS, metrics
 
 logger = logging.getLogger(__name__)
 
+# レンジパーティションの間隔
+PARTITION_INTERVALS = ('day', 'week', 'month', 'year')
+
 
 class DDLGenerator:
     """PostgreSQL DDL生成クラス"""
     
-    def __init__(self, csv_path=None, config_path=None):
+    def __init__(self, csv_path=None, config_path=None, table_definitions=None):
+        """
+        Args:
+            csv_path: テーブル定義CSVのパス（省略時は output/csv/table_definitions.csv）
+            config_path: 設定ファイルパス
+            table_definitions: {table_name: TableDefinition} の辞書
+                指定された場合はCSVを読み込まずにそのまま使用する
+        """
         self.config_path = config_path
+        self.table_definitions = table_definitions
         self.project_root = Path(__file__).parent.parent.parent
         self.csv_dir = self.project_root / "output" / "csv"
         self.output_dir = self.project_root / "output" / "ddl"
@@ -41,35 +65,7 @@ class DDLGenerator:
     def load_csv_definitions(self):
         """CSVファイルからテーブル定義を読み込み"""
         try:
-            tables = {}
-            with open(self.csv_path, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                
-                for row in reader:
-                    table_name = row['table_name']
-                    
-                    # テーブルが未登録の場合は初期化
-                    if table_name not in tables:
-                        tables[table_name] = {
-                            'name': table_name,
-                            'columns': []
-                        }
-                    
-                    # カラム情報を追加
-                    column = {
-                        'name': row['column_name'],
-                        'type': row['data_type'],
-                        'nullable': row['nullable'].lower() == 'true',
-                        'primary_key': row['primary_key'].lower() == 'true',
-                        'unique': row['unique'].lower() == 'true',
-                        'default': row['default_value'] if row['default_value'] else None,
-                        'description': row.get('description', '')
-                    }
-                    
-                    tables[table_name]['columns'].append(column)
-                    
-            return tables
-            
+            return load_table_definitions_from_csv(self.csv_path)
         except Exception as e:
             logger.error(f"CSVファイルの読み込みに失敗: {e}")
             raise
@@ -94,40 +90,396 @@ class DDLGenerator:
                 'extensions': ['uuid-ossp'],
                 'create_indexes': True,
                 'create_triggers': True,
-                'insert_sample_data': True
+                'insert_sample_data': True,
+                'seed_dir': 'config/seed',
+                'output_mode': 'single',
+                'generate_migrations': True,
+                'auto_index_foreign_keys': True,
+                'auto_index_timestamps': False,
+                'index_concurrently': False,
+                'partition_start': '2026-01-01'
             },
             'tables': {
                 'users': {
                     'primary_key': 'id',
                     'indexes': ['username', 'email', 'is_active'],
-                    'timestamps': True
+                    'timestamps': True,
+                    'seed_data': [
+                        {'username': 'admin', 'email': 'admin@example.com', 'full_name': '管理者'},
+                        {'username': 'user1', 'email': 'user1@example.com', 'full_name': '田中太郎'},
+                        {'username': 'user2', 'email': 'user2@example.com', 'full_name': '佐藤花子'}
+                    ]
                 }
             }
         }
         
-    def generate_ddl(self, tables, config):
+    def apply_table_options(self, table, config):
+        """spec由来のテーブルオプションに config.tables.<テーブル名> の設定を上書きしたテーブル定義を返す
+
+        設定例:
+            partition: {key: createdAt, interval: month, precreate: 3, start: "2026-01-01"}
+            fillfactor: 80
+            unlogged: true
+        """
+        table_config = (config.get('tables') or {}).get(table.name) or {}
+        options = dict(table.options)
+        
+        partition = table_config.get('partition')
+        if isinstance(partition, str):
+            options['partition_key'] = partition
+        elif isinstance(partition, dict):
+            for key in ('key', 'interval', 'precreate', 'start'):
+                if key in partition:
+                    options[f'partition_{key}'] = partition[key]
+        for key in ('fillfactor', 'unlogged'):
+            if key in table_config:
+                options[key] = table_config[key]
+                
+        # オプションの検証
+        if options.get('partition_key'):
+            if table.get_column(options['partition_key']) is None:
+                logger.warning(f"{table.name}テーブルにパーティションキー {options['partition_key']} がないため、パーティションを無効化")
+                options = {k: v for k, v in options.items() if not k.startswith('partition_')}
+            elif options.get('partition_interval', 'month') not in PARTITION_INTERVALS:
+                logger.warning(f"{table.name}テーブルのパーティション間隔が不正です（monthを使用）: {options['partition_interval']}")
+                options['partition_interval'] = 'month'
+        if options.get('partition_key'):
+            # 開始日を生成日から決めると実行日ごとにDDLが変わるため、固定の開始日を必須とする
+            start = options.get('partition_start') or (config.get('database') or {}).get('partition_start')
+            try:
+                options['partition_start'] = date.fromisoformat(str(start)).isoformat() if start else None
+            except ValueError:
+                options['partition_start'] = None
+                logger.warning(f"{table.name}テーブルのパーティション開始日が不正です: {start}")
+            if not options['partition_start']:
+                logger.warning(f"{table.name}テーブルのパーティション開始日（tables.{table.name}.partition.start / database.partition_start）がないため、パーティションを無効化")
+                options = {k: v for k, v in options.items() if not k.startswith('partition_')}
+        if 'fillfactor' in options:
+            # テンプレート・マイグレーションの差分で比較できるよう整数に正規化する
+            try:
+                fillfactor = int(options['fillfactor'])
+            except (TypeError, ValueError):
+                fillfactor = None
+            if fillfactor is None or not 10 <= fillfactor <= 100:
+                logger.warning(f"{table.name}テーブルのfillfactorは10〜100で指定してください: {options['fillfactor']}")
+                del options['fillfactor']
+            else:
+                options['fillfactor'] = fillfactor
+        if not options.get('unlogged'):
+            options.pop('unlogged', None)
+            
+        return replace(table, options=options) if options != table.options else table
+        
+    def drop_references_to_partitioned_tables(self, tables):
+        """パーティションテーブルへの外部キー制約を除外したテーブル定義を返す
+
+        パーティションテーブルの主キーは (id, パーティションキー) になり id 単独の一意制約を持てないため、
+        REFERENCES <パーティションテーブル>(id) はPostgreSQLで作成できない（カラム自体は残す）
+        """
+        partitioned = {name for name, table in tables.items() if table.partition_key}
+        if not partitioned:
+            return tables
+            
+        result = {}
+        for name, table in tables.items():
+            columns = []
+            for column in table.columns:
+                if column.references in partitioned:
+                    logger.warning(
+                        f"{name}.{column.name} の参照先 {column.references} はパーティションテーブルのため、外部キー制約を出力しません"
+                    )
+                    column = replace(column, references=None)
+                columns.append(column)
+            result[name] = replace(table, columns=columns) if columns != table.columns else table
+        return result
+        
+    def get_partition_period_start(self, value, interval):
+        """日付を含むパーティション期間の開始日を取得"""
+        if interval == 'day':
+            return value
+        if interval == 'week':
+            return value - timedelta(days=value.weekday())
+        if interval == 'year':
+            return value.replace(month=1, day=1)
+        return value.replace(day=1)
+        
+    def next_partition_period_start(self, value, interval):
+        """次のパーティション期間の開始日を取得"""
+        if interval == 'day':
+            return value + timedelta(days=1)
+        if interval == 'week':
+            return value + timedelta(weeks=1)
+        if interval == 'year':
+            return value.replace(year=value.year + 1)
+        return value.replace(year=value.year + value.month // 12, month=value.month % 12 + 1)
+        
+    def build_partition_definitions(self, table):
+        """事前作成するレンジパーティション（期間別 + DEFAULT）の定義を生成"""
+        if not table.partition_key:
+            return []
+            
+        interval = table.options.get('partition_interval', 'month')
+        precreate = int(table.options.get('partition_precreate', 3))
+        start = date.fromisoformat(str(table.options['partition_start']))
+        period_start = self.get_partition_period_start(start, interval)
+        suffix_format = {'year': '%Y', 'month': '%Y%m'}.get(interval, '%Y%m%d')
+        
+        partitions = []
+        for _ in range(precreate):
+            period_end = self.next_partition_period_start(period_start, interval)
+            partitions.append({
+                'name': f"{table.name}_p{period_start.strftime(suffix_format)}",
+                'start': period_start.isoformat(),
+                'end': period_end.isoformat(),
+                'default': False
+            })
+            period_start = period_end
+            
+        # 範囲外の行を受け止めるDEFAULTパーティション
+        partitions.append({'name': f"{table.name}_default", 'start': None, 'end': None, 'default': True})
+        return partitions
+        
+    def build_all_partition_definitions(self, tables):
+        """全テーブルのパーティション定義を生成"""
+        return {name: self.build_partition_definitions(table) for name, table in tables.items()}
+        
+    def build_index_definitions(self, table, config):
+        """テーブルのインデックス定義を生成
+
+        config.tables.<テーブル名>.indexes の設定に加え、外部キー・*_idカラム
+        （および設定により作成日時カラム）のインデックスを自動で追加する。
+        indexes の要素はカラム名の文字列、または以下のキーを持つ辞書:
+            columns: カラム名のリスト（複合インデックス）
+            name / unique / method / include / where / concurrently
+        """
+        db_config = config.get('database', {})
+        table_config = (config.get('tables') or {}).get(table.name) or {}
+        default_concurrently = db_config.get('index_concurrently', False)
+        column_names = {column.name for column in table.columns}
+        
+        indexes = []
+        seen = set()
+        
+        def add_index(columns, **options):
+            missing = [c for c in list(columns) + list(options.get('include') or []) if c not in column_names]
+            if missing:
+                logger.warning(f"{table.name}テーブルに存在しないカラムのインデックス設定をスキップ: {', '.join(missing)}")
+                return
+            name = options.get('name') or self.build_index_name(table.name, columns)
+            if name in seen:
+                return
+            seen.add(name)
+            indexes.append(IndexDefinition(
+                name=name,
+                table=table.name,
+                columns=list(columns),
+                unique=options.get('unique', False),
+                method=options.get('method'),
+                include=list(options.get('include') or []),
+                where=options.get('where'),
+                concurrently=options.get('concurrently', default_concurrently)
+            ))
+        
+        # 設定ファイルで指定されたインデックス
+        for index_config in table_config.get('indexes', []):
+            if isinstance(index_config, str):
+                add_index([index_config])
+            elif isinstance(index_config, dict) and index_config.get('columns'):
+                columns = index_config['columns']
+                options = {key: value for key, value in index_config.items() if key != 'columns'}
+                add_index([columns] if isinstance(columns, str) else columns, **options)
+            else:
+                logger.warning(f"{table.name}テーブルのインデックス設定が不正です: {index_config}")
+        
+        # パーティションテーブルの親には CREATE INDEX CONCURRENTLY を使えない
+        if table.partition_key:
+            for index in indexes:
+                if index.concurrently:
+                    logger.warning(f"{table.name}はパーティションテーブルのため {index.name} をCONCURRENTLYなしで作成します")
+                    index.concurrently = False
+                    
+        # 先頭カラムとして既にインデックスが張られているカラム（主キー・UNIQUE制約を含む）
+        leading_columns = {index.columns[0] for index in indexes if index.where is None}
+        leading_columns.update(c.name for c in table.columns if c.primary_key or c.unique)
+        
+        for column in table.columns:
+            if column.name in leading_columns:
+                continue
+            is_foreign_key = column.references or re.search(r'(?:_id|[a-z]Id)$', column.name)
+            is_timestamp = column.name in ('created_at', 'createdAt')
+            if (is_foreign_key and db_config.get('auto_index_foreign_keys', True)) or \
+               (is_timestamp and db_config.get('auto_index_timestamps', False)):
+                add_index([column.name], concurrently=default_concurrently and not table.partition_key)
+                
+        return indexes
+        
+    def build_index_name(self, table_name, columns):
+        """インデックス名を生成（PostgreSQLの識別子長63文字に収める）"""
+        return f"idx_{table_name}_{'_'.join(columns)}"[:63]
+        
+    def build_all_index_definitions(self, tables, config):
+        """全テーブルのインデックス定義を生成"""
+        if not config.get('database', {}).get('create_indexes', True):
+            return {name: [] for name in tables}
+        return {name: self.build_index_definitions(table, config) for name, table in tables.items()}
+        
+    def load_seed_data(self, tables, config):
+        """シードデータを読み込み（テーブルの依存順）
+
+        seed_dir の <テーブル名>.csv（ヘッダー行付き、空欄はNULL）と
+        tables.<テーブル名>.seed_data の行を結合する。
+
+        Returns:
+            {table_name: [{'columns': [...], 'rows': [[...], ...]}, ...]}
+        """
+        if not config['database'].get('insert_sample_data', False):
+            return {}
+            
+        seed_rows = {}
+        seed_dir = config['database'].get('seed_dir')
+        if seed_dir:
+            seed_path = Path(seed_dir)
+            if not seed_path.is_absolute():
+                seed_path = self.project_root / seed_path
+            for seed_file in sorted(seed_path.glob("*.csv")) if seed_path.is_dir() else []:
+                with open(seed_file, 'r', encoding='utf-8', newline='') as f:
+                    rows = [{k: (v if v != '' else None) for k, v in row.items()} for row in csv.DictReader(f)]
+                seed_rows.setdefault(seed_file.stem, []).extend(rows)
+                
+        for table_name, table_config in (config.get('tables') or {}).items():
+            rows = (table_config or {}).get('seed_data') or []
+            if rows:
+                seed_rows.setdefault(table_name, []).extend(rows)
+                
+        for table_name in seed_rows:
+            if table_name not in tables:
+                logger.warning(f"シードデータのテーブルが定義されていません（スキップ）: {table_name}")
+                
+        seeds = {}
+        for table_name, table in tables.items():
+            rows = seed_rows.get(table_name)
+            if not rows:
+                continue
+                
+            unknown_columns = sorted({name for row in rows for name in row if table.get_column(name) is None})
+            if unknown_columns:
+                logger.warning(
+                    f"シードデータに存在しないカラムがあります（{table_name}をスキップ）: {', '.join(unknown_columns)}"
+                )
+                continue
+                
+            # 連続する同じカラム構成の行を1つのCOPYにまとめる（行にないカラムはDEFAULT値になる）
+            groups = []
+            for row in rows:
+                columns = list(row.keys())
+                if not groups or groups[-1]['columns'] != columns:
+                    groups.append({'columns': columns, 'rows': []})
+                groups[-1]['rows'].append([row[name] for name in columns])
+            seeds[table_name] = groups
+            
+        return seeds
+        
+    def format_copy_value(self, value):
+        """COPY（CSV形式、NULL '\\N'）用に値を文字列化"""
+        if value is None:
+            return '\\N'
+        if isinstance(value, bool):
+            return 'true' if value else 'false'
+        return str(value)
+        
+    def format_copy_rows(self, rows, header=None):
+        """行リストをCOPY用のCSVテキストに変換"""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator='\n')
+        if header:
+            writer.writerow(header)
+        for row in rows:
+            writer.writerow([self.format_copy_value(value) for value in row])
+        return buffer.getvalue()
+        
+    def build_seed_blocks(self, tables, config):
+        """テンプレート用のCOPYブロック定義を作成（テーブルの依存順）"""
+        blocks = []
+        for table_name, groups in self.load_seed_data(tables, config).items():
+            table = tables[table_name]
+            for number, group in enumerate(groups, start=1):
+                # 明示的に値を投入したSERIALカラムはシーケンスを進める
+                serial_columns = [
+                    name for name in group['columns']
+                    if 'SERIAL' in table.get_column(name).data_type.upper()
+                ]
+                blocks.append({
+                    'table': table_name,
+                    'file_name': f"{table_name}.csv" if number == 1 else f"{table_name}_{number}.csv",
+                    'columns': group['columns'],
+                    'rows': group['rows'],
+                    'data': self.format_copy_rows(group['rows']),
+                    'serial_columns': serial_columns
+                })
+        return blocks
+        
+    def write_seed_files(self, seeds, config):
+        """シードデータのCSVファイルと依存順の一括ロードスクリプトを出力"""
+        seed_dir = self.output_dir / "seed"
+        if not seeds:
+            return None
+        seed_dir.mkdir(parents=True, exist_ok=True)
+        
+        # 他ツール（\copy・Testcontainers等）から使えるテーブル別CSV
+        for seed in seeds:
+            seed_file = seed_dir / seed['file_name']
+            if self.write_if_changed(seed_file, self.format_copy_rows(seed['rows'], header=seed['columns'])):
+                logger.info(f"シードデータCSVを生成しました: {seed_file}")
+                
+        seed_files = {seed['file_name'] for seed in seeds}
+        for stale_file in seed_dir.glob("*.csv"):
+            if stale_file.name not in seed_files:
+                stale_file.unlink()
+                logger.info(f"削除されたシードデータCSVを除去しました: {stale_file}")
+                
+        # 単一トランザクションでCOPYを依存順に実行するロードスクリプト
+        loader_file = seed_dir / "load_seed.sql"
+        loader_content = self.jinja_env.get_template('seed.sql.j2').render(
+            config=config,
+            seeds=seeds,
+            database_name=config['database']['name']
+        )
+        if self.write_if_changed(loader_file, loader_content):
+            logger.info(f"シードデータロードスクリプトを生成しました: {loader_file}")
+        return loader_file
+        
+    def generate_ddl(self, tables, config, indexes=None, seeds=None):
         """DDLを生成"""
+        if indexes is None:
+            indexes = self.build_all_index_definitions(tables, config)
+        if seeds is None:
+            seeds = self.build_seed_blocks(tables, config)
+        partitions = self.build_all_partition_definitions(tables)
+            
         try:
             template = self.jinja_env.get_template('schema.sql.j2')
         except Exception:
             # テンプレートファイルが存在しない場合はデフォルトのDDLを生成
-            return self.generate_default_ddl(tables, config)
+            return self.generate_default_ddl(tables, config, indexes)
             
         return template.render(
             tables=tables,
+            indexes=indexes,
+            partitions=partitions,
+            seeds=seeds,
             config=config,
-            generated_at=datetime.now().isoformat(),
+            generated_at=get_generated_at(config),
             database_name=config['database']['name']
         )
         
-    def generate_default_ddl(self, tables, config):
+    def generate_default_ddl(self, tables, config, indexes=None):
         """デフォルトのDDL生成（テンプレートファイルがない場合）"""
         ddl_parts = []
         
         # ヘッダー
+        generated_at = get_generated_at(config)
         ddl_parts.append(f"""-- TypeSpecから自動生成されたPostgreSQL DDL
--- 生成日時: {datetime.now().isoformat()}
-
+{f"-- 生成日時: {generated_at}" + chr(10) if generated_at else ""}
 -- データベース作成（必要に応じてコメントアウト）
 -- CREATE DATABASE {config['database']['name']};
 -- \\c {config['database']['name']};
@@ -145,43 +497,73 @@ class DDLGenerator:
             ddl_parts.append(f"CREATE TABLE {table_name} (")
             
             column_defs = []
-            for column in table_def['columns']:
-                column_def = f"    {column['name']} {column['type']}"
-                if not column['nullable']:
+            for column in table_def.columns:
+                column_def = f"    {column.name} {column.data_type}"
+                if not column.nullable:
                     column_def += " NOT NULL"
-                if column.get('unique'):
+                if column.unique:
                     column_def += " UNIQUE"
-                if column.get('default'):
-                    column_def += f" DEFAULT {column['default']}"
+                if column.default:
+                    column_def += f" DEFAULT {column.default}"
+                if column.references:
+                    column_def += f" REFERENCES {column.references}(id)"
                 column_defs.append(column_def)
                 
             ddl_parts.append(",\n".join(column_defs))
             ddl_parts.append(");")
             ddl_parts.append("")
             
+            for index in (indexes or {}).get(table_name, []):
+                unique = "UNIQUE " if index.unique else ""
+                ddl_parts.append(f"CREATE {unique}INDEX {index.name} ON {table_name}({', '.join(index.columns)});")
+            ddl_parts.append("")
+            
         return "\n".join(ddl_parts)
         
     def generate(self):
         """DDL生成のメイン処理"""
         try:
-            # CSVファイルとコンフィグを読み込み
+            # コンフィグを読み込み
             config = self.load_config()
             
-            # CSVファイルの存在チェック
-            if not os.path.exists(self.csv_path):
-                logger.error(f"CSVファイルが見つかりません: {self.csv_path}")
-                logger.info("先にCSV生成を実行してください")
-                return
-            
-            # CSVからテーブル定義を読み込み
-            tables = self.load_csv_definitions()
+            if self.table_definitions is not None:
+                # CSVGeneratorからメモリ上で受け渡されたテーブル定義を使用
+                # （エンティティがない仕様ではCSVを出力しない従来の動作に合わせ、既定テーブルでは生成しない）
+                tables = self.table_definitions
+                if not tables:
+                    logger.warning("DDL生成対象のテーブル定義がないため、DDLを生成しません")
+                    return
+            else:
+                # CSVファイルの存在チェック
+                if not os.path.exists(self.csv_path):
+                    logger.error(f"CSVファイルが見つかりません: {self.csv_path}")
+                    logger.info("先にCSV生成を実行してください")
+                    return
+                
+                # CSVからテーブル定義を読み込み
+                tables = self.load_csv_definitions()
             
             if not tables:
                 logger.warning("テーブル定義が見つかりませんでした")
                 tables = self.get_default_tables()
                 
+            # 外部キーの参照先が先に作成されるように並べ替え（設定ファイルのテーブルオプションを反映）
+            tables = {name: self.apply_table_options(tables[name], config) for name in sort_tables_by_dependency(tables)}
+            tables = self.drop_references_to_partitioned_tables(tables)
+            indexes = self.build_all_index_definitions(tables, config)
+            
+            # シードデータ（COPYブロック・CSV・ロードスクリプト）
+            seeds = self.build_seed_blocks(tables, config)
+            self.write_seed_files(seeds, config)
+            
+            # テーブル別ファイル出力モード
+            if config['database'].get('output_mode', 'single') == 'per_table':
+                self.generate_per_table(tables, indexes, config, seeds)
+                return
+                
             # DDLを生成
-            ddl_content = self.generate_ddl(tables, config)
+            with metrics.stage('ddl.render'):
+                ddl_content = self.generate_ddl(tables, config, indexes, seeds)
             
             # 出力ディレクトリを作成
             self.output_dir.mkdir(parents=True, exist_ok=True)
@@ -195,76 +577,280 @@ class DDLGenerator:
                 
             # ファイル出力
             output_file = self.output_dir / f"{primary_table}.sql"
-            with open(output_file, 'w', encoding='utf-8') as f:
-                f.write(ddl_content)
+            metrics.write_file(output_file, ddl_content, stage='ddl.write')
                 
+            # 以前の版は生成物の履歴（output/.artifacts）から参照・復元する（main.py artifacts）
             logger.info(f"PostgreSQL DDLを生成しました: {output_file}")
             
-            # バックアップファイルも作成
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            backup_file = self.output_dir / f"{primary_table}_{timestamp}.sql"
-            with open(backup_file, 'w', encoding='utf-8') as f:
-                f.write(ddl_content)
-                
-            logger.info(f"バックアップも作成しました: {backup_file}")
-            
         except Exception as e:
             logger.error(f"DDL生成中にエラーが発生しました: {e}")
             raise
             
+    def write_if_changed(self, file_path, content):
+        """内容が変わった場合のみファイルを書き込み（書き込んだ場合はTrue）"""
+        if file_path.exists():
+            with open(file_path, 'r', encoding='utf-8') as f:
+                if f.read() == content:
+                    metrics.count(CACHE_HITS)
+                    return False
+                    
+        metrics.write_file(file_path, content, stage='ddl.write')
+        return True
+        
+    def generate_per_table(self, tables, indexes, config, seeds=None):
+        """テーブル別DDLファイルと依存順の適用インデックスを生成"""
+        tables_dir = self.output_dir / "tables"
+        tables_dir.mkdir(parents=True, exist_ok=True)
+        
+        # 共通定義（拡張機能・トリガー関数）
+        prelude_file = self.output_dir / "00_prelude.sql"
+        prelude_content = self.jinja_env.get_template('prelude.sql.j2').render(config=config)
+        if self.write_if_changed(prelude_file, prelude_content):
+            logger.info(f"共通DDLを生成しました: {prelude_file}")
+        
+        # テーブル別DDL（定義が変わったテーブルのみ書き換え）
+        table_template = self.jinja_env.get_template('table.sql.j2')
+        table_files = []
+        written = 0
+        partitions = self.build_all_partition_definitions(tables)
+        for table_name, table in tables.items():
+            table_file = tables_dir / f"{table_name}.sql"
+            with metrics.stage('ddl.render', table=table_name):
+                content = table_template.render(
+                    table_name=table_name,
+                    table=table,
+                    indexes=indexes.get(table_name, []),
+                    partitions=partitions.get(table_name, []),
+                    config=config
+                )
+            if self.write_if_changed(table_file, content):
+                written += 1
+                logger.info(f"テーブルDDLを生成しました: {table_file}")
+            table_files.append(f"tables/{table_file.name}")
+            
+        # 定義から削除されたテーブルのファイルを削除
+        for stale_file in tables_dir.glob("*.sql"):
+            if stale_file.stem not in tables:
+                stale_file.unlink()
+                logger.info(f"削除されたテーブルのDDLを除去しました: {stale_file}")
+                
+        logger.info(f"テーブル別DDL: {written}/{len(tables)}テーブルを更新")
+        
+        # 依存順の適用インデックス
+        bundle_file = self.output_dir / "schema_bundle.sql"
+        bundle_content = self.jinja_env.get_template('bundle.sql.j2').render(
+            config=config,
+            database_name=config['database']['name'],
+            bundle_file=bundle_file.name,
+            prelude_file=prelude_file.name,
+            table_files=table_files,
+            seed_file="seed/load_seed.sql" if seeds else None
+        )
+        if self.write_if_changed(bundle_file, bundle_content):
+            logger.info(f"DDL適用インデックスを生成しました: {bundle_file}")
+            
+        # 前回のテーブル定義との差分からマイグレーションを生成
+        snapshot = self.load_table_snapshot()
+        if config['database'].get('generate_migrations', True) and snapshot is not None:
+            previous_tables, previous_indexes = snapshot
+            self.generate_migration(previous_tables, tables, config, previous_indexes, indexes)
+            
+        self.save_table_snapshot(tables, indexes)
+        
+    def get_snapshot_path(self):
+        """前回生成時のテーブル定義スナップショットのパス"""
+        return self.output_dir / "table_definitions.snapshot.json"
+        
+    def load_table_snapshot(self):
+        """前回生成時のテーブル定義とインデックス定義を読み込み（存在しない場合はNone）"""
+        snapshot_path = self.get_snapshot_path()
+        if not snapshot_path.exists():
+            return None
+            
+        try:
+            with open(snapshot_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            tables = {table['name']: TableDefinition.from_dict(table) for table in data.get('tables', [])}
+            indexes = {
+                table_name: [IndexDefinition.from_dict(index) for index in table_indexes]
+                for table_name, table_indexes in data.get('indexes', {}).items()
+            }
+            return tables, indexes
+        except Exception as e:
+            logger.warning(f"テーブル定義スナップショットの読み込みに失敗、マイグレーション生成をスキップ: {e}")
+            return None
+            
+    def save_table_snapshot(self, tables, indexes):
+        """今回のテーブル定義とインデックス定義をスナップショットとして保存"""
+        snapshot = {
+            'tables': [table.to_dict() for table in tables.values()],
+            'indexes': {
+                name: [index.to_dict() for index in table_indexes]
+                for name, table_indexes in indexes.items()
+            }
+        }
+        metrics.write_file(self.get_snapshot_path(), json.dumps(snapshot, ensure_ascii=False, indent=2), stage='ddl.write')
+            
+    def diff_table_definitions(self, previous_tables, tables):
+        """前回と今回のテーブル定義の差分を算出"""
+        created_tables = {name: table for name, table in tables.items() if name not in previous_tables}
+        dropped_tables = [name for name in reversed(sort_tables_by_dependency(previous_tables)) if name not in tables]
+        
+        altered_tables = []
+        for table_name, table in tables.items():
+            previous = previous_tables.get(table_name)
+            if previous is None or previous == table:
+                continue
+                
+            current_names = {column.name for column in table.columns}
+            change = {
+                'table_name': table_name,
+                'added_columns': [c for c in table.columns if previous.get_column(c.name) is None],
+                'dropped_columns': [c.name for c in previous.columns if c.name not in current_names],
+                'statements': self.build_alter_table_option_statements(table_name, previous.options, table.options)
+            }
+            for column in table.columns:
+                old_column = previous.get_column(column.name)
+                if old_column is not None and old_column != column:
+                    change['statements'].extend(self.build_alter_column_statements(table_name, old_column, column))
+                    
+            if change['added_columns'] or change['dropped_columns'] or change['statements']:
+                altered_tables.append(change)
+                
+        return created_tables, altered_tables, dropped_tables
+        
+    def build_alter_table_option_statements(self, table_name, old_options, options):
+        """テーブルオプションの変更をALTER TABLE文に変換"""
+        statements = []
+        partition_keys = ('partition_key', 'partition_interval')
+        if any(old_options.get(key) != options.get(key) for key in partition_keys):
+            statements.append(f"-- 要手動対応: {table_name} のパーティション設定が変更されました（テーブルの再作成が必要）")
+            return statements
+            
+        # パーティションテーブルはfillfactor/UNLOGGEDを各パーティションに設定済みのため親では変更しない
+        if options.get('partition_key'):
+            return statements
+            
+        if old_options.get('fillfactor') != options.get('fillfactor'):
+            if options.get('fillfactor'):
+                statements.append(f"ALTER TABLE {table_name} SET (fillfactor = {options['fillfactor']});")
+            else:
+                statements.append(f"ALTER TABLE {table_name} RESET (fillfactor);")
+        if bool(old_options.get('unlogged')) != bool(options.get('unlogged')):
+            statements.append(f"ALTER TABLE {table_name} SET {'UNLOGGED' if options.get('unlogged') else 'LOGGED'};")
+            
+        return statements
+        
+    def build_alter_column_statements(self, table_name, old_column, column):
+        """カラム定義の変更をALTER TABLE文に変換"""
+        statements = []
+        prefix = f"ALTER TABLE {table_name}"
+        name = column.name
+        
+        if old_column.data_type != column.data_type:
+            if any('SERIAL' in t or 'PRIMARY KEY' in t for t in (old_column.data_type, column.data_type)):
+                statements.append(f"-- 要手動対応: {name} の型を {old_column.data_type} から {column.data_type} へ変更")
+            else:
+                statements.append(f"{prefix} ALTER COLUMN {name} TYPE {column.data_type} USING {name}::{column.data_type};")
+                
+        if old_column.nullable != column.nullable:
+            action = "DROP NOT NULL" if column.nullable else "SET NOT NULL"
+            statements.append(f"{prefix} ALTER COLUMN {name} {action};")
+            
+        if old_column.default != column.default:
+            if column.default:
+                statements.append(f"{prefix} ALTER COLUMN {name} SET DEFAULT {column.default};")
+            else:
+                statements.append(f"{prefix} ALTER COLUMN {name} DROP DEFAULT;")
+                
+        if old_column.unique != column.unique:
+            constraint = f"{table_name}_{name}_key"
+            if column.unique:
+                statements.append(f"{prefix} ADD CONSTRAINT {constraint} UNIQUE ({name});")
+            else:
+                statements.append(f"{prefix} DROP CONSTRAINT IF EXISTS {constraint};")
+                
+        if old_column.references != column.references:
+            constraint = f"{table_name}_{name}_fkey"
+            if old_column.references:
+                statements.append(f"{prefix} DROP CONSTRAINT IF EXISTS {constraint};")
+            if column.references:
+                statements.append(
+                    f"{prefix} ADD CONSTRAINT {constraint} FOREIGN KEY ({name}) REFERENCES {column.references}(id);"
+                )
+                
+        if old_column.primary_key != column.primary_key:
+            statements.append(f"-- 要手動対応: {name} の主キー設定が変更されました")
+            
+        return statements
+        
+    def diff_index_definitions(self, previous_indexes, indexes, dropped_tables):
+        """前回と今回のインデックス定義の差分を算出（定義が変わったものは削除して再作成）"""
+        previous_by_name = {i.name: i for table_indexes in previous_indexes.values() for i in table_indexes}
+        current_by_name = {i.name: i for table_indexes in indexes.values() for i in table_indexes}
+        
+        dropped_indexes = [
+            index for name, index in previous_by_name.items()
+            if index.table not in dropped_tables and current_by_name.get(name) != index
+        ]
+        created_indexes = [index for name, index in current_by_name.items() if previous_by_name.get(name) != index]
+        return created_indexes, dropped_indexes
+        
+    def generate_migration(self, previous_tables, tables, config, previous_indexes=None, indexes=None):
+        """差分マイグレーション（ALTER TABLE / インデックス）ファイルを生成"""
+        created_tables, altered_tables, dropped_tables = self.diff_table_definitions(previous_tables, tables)
+        created_indexes, dropped_indexes = self.diff_index_definitions(
+            previous_indexes or {}, indexes or {}, dropped_tables
+        )
+        
+        if not (created_tables or altered_tables or dropped_tables or created_indexes or dropped_indexes):
+            logger.info("テーブル定義に変更がないため、マイグレーションは生成しません")
+            return None
+            
+        now = datetime.now()
+        migration_content = self.jinja_env.get_template('migration.sql.j2').render(
+            created_tables=created_tables,
+            partitions=self.build_all_partition_definitions(created_tables),
+            altered_tables=altered_tables,
+            dropped_tables=dropped_tables,
+            created_indexes=created_indexes,
+            dropped_indexes=dropped_indexes,
+            config=config,
+            generated_at=now.isoformat()
+        )
+        
+        migrations_dir = self.output_dir / "migrations"
+        migrations_dir.mkdir(parents=True, exist_ok=True)
+        migration_file = migrations_dir / f"V{now.strftime('%Y%m%d_%H%M%S')}__schema_changes.sql"
+        metrics.write_file(migration_file, migration_content, stage='ddl.write')
+            
+        logger.info(
+            f"マイグレーションを生成しました: {migration_file} "
+            f"(作成 {len(created_tables)}, 変更 {len(altered_tables)}, 削除 {len(dropped_tables)}, "
+            f"インデックス作成 {len(created_indexes)}, インデックス削除 {len(dropped_indexes)})"
+        )
+        return migration_file
+        
     def get_default_tables(self):
         """デフォルトのテーブル定義"""
         return {
-            'users': {
-                'name': 'users',
-                'columns': [
-                    {
-                        'name': 'id',
-                        'type': 'SERIAL PRIMARY KEY',
-                        'nullable': False,
-                        'primary_key': True
-                    },
-                    {
-                        'name': 'username',
-                        'type': 'VARCHAR(50)',
-                        'nullable': False,
-                        'unique': True
-                    },
-                    {
-                        'name': 'email', 
-                        'type': 'VARCHAR(255)',
-                        'nullable': False,
-                        'unique': True
-                    },
-                    {
-                        'name': 'full_name',
-                        'type': 'VARCHAR(100)',
-                        'nullable': True
-                    },
-                    {
-                        'name': 'is_active',
-                        'type': 'BOOLEAN',
-                        'nullable': False,
-                        'default': 'true'
-                    },
-                    {
-                        'name': 'created_at',
-                        'type': 'TIMESTAMP WITH TIME ZONE',
-                        'nullable': False,
-                        'default': 'CURRENT_TIMESTAMP'
-                    },
-                    {
-                        'name': 'updated_at',
-                        'type': 'TIMESTAMP WITH TIME ZONE', 
-                        'nullable': False,
-                        'default': 'CURRENT_TIMESTAMP'
-                    }
-                ],
-                'model_name': 'User'
-            }
+            'users': TableDefinition(
+                name='users',
+                model_name='User',
+                columns=[
+                    ColumnDefinition(name='id', data_type='SERIAL PRIMARY KEY', nullable=False, primary_key=True),
+                    ColumnDefinition(name='username', data_type='VARCHAR(50)', nullable=False, unique=True),
+                    ColumnDefinition(name='email', data_type='VARCHAR(255)', nullable=False, unique=True),
+                    ColumnDefinition(name='full_name', data_type='VARCHAR(100)', nullable=True),
+                    ColumnDefinition(name='is_active', data_type='BOOLEAN', nullable=False, default='true'),
+                    ColumnDefinition(name='created_at', data_type='TIMESTAMP WITH TIME ZONE',
+                                     nullable=False, default='CURRENT_TIMESTAMP'),
+                    ColumnDefinition(name='updated_at', data_type='TIMESTAMP WITH TIME ZONE',
+                                     nullable=False, default='CURRENT_TIMESTAMP')
+                ]
+            )
         }
 
-
 if __name__ == "__main__":
     generator = DDLGenerator()
     generator.generate()
\ No newline at end of file
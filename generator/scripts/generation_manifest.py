@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+生成マニフェスト - SpringGeneratorの生成結果を後続ジェネレーターへ受け渡す軽量フォーマット
+1行1レコードのJSON（NDJSON、インデントなし）で、先頭行にフォーマット名とバージョンを持つ
+"""
+
+import json
+import os
+import logging
+from pathlib import Path
+from typing import Any, Dict, Iterator, Union
+from .instrumentation import BYTES_WRITTEN, FILES_WRITTEN, metrics
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILE_NAME = 'spring_manifest.ndjson'
+MANIFEST_FORMAT = 'spring-manifest'
+MANIFEST_VERSION = 1
+
+# レコード種別
+#   header     : {"kind": "header", "format", "version", "generated_at"}
+#   controller : {"kind": "controller", "api_name", "class_name", "package", "endpoints": [...]}
+#   dto        : {"kind": "dto", "class_name", "package", "fields": [...]}
+
+
+class ManifestWriter:
+    """マニフェストを1レコードずつ書き込み（一時ファイルに書いて完了時に置き換え）"""
+
+    def __init__(self, manifest_path: Union[str, Path], generated_at: str):
+        self.manifest_path = Path(manifest_path)
+        self.temp_path = self.manifest_path.with_name(self.manifest_path.name + '.tmp')
+        self.generated_at = generated_at
+        self.count = 0
+        self._file = None
+
+    def __enter__(self) -> 'ManifestWriter':
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.temp_path, 'w', encoding='utf-8')
+        self._write({
+            'kind': 'header',
+            'format': MANIFEST_FORMAT,
+            'version': MANIFEST_VERSION,
+            'generated_at': self.generated_at
+        })
+        return self
+
+    def write(self, kind: str, record: Dict[str, Any]) -> None:
+        """controller / dto レコードを書き込み"""
+        self._write({'kind': kind, **record})
+        self.count += 1
+
+    def _write(self, record: Dict[str, Any]) -> None:
+        self._file.write(json.dumps(record, ensure_ascii=False, separators=(',', ':')))
+        self._file.write('\n')
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self._file.close()
+        if exc_type is None:
+            os.replace(self.temp_path, self.manifest_path)
+            metrics.count(FILES_WRITTEN)
+            metrics.count(BYTES_WRITTEN, self.manifest_path.stat().st_size)
+        else:
+            # 生成途中で失敗した場合は前回のマニフェストを残す
+            self.temp_path.unlink(missing_ok=True)
+
+
+def iter_manifest(manifest_path: Union[str, Path]) -> Iterator[Dict[str, Any]]:
+    """マニフェストのcontroller / dto レコードを先頭から順に読み込み（ヘッダーは検証のみ）"""
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        header = json.loads(f.readline() or '{}')
+        if header.get('kind') != 'header' or header.get('format') != MANIFEST_FORMAT:
+            raise ValueError(f"マニフェストの形式が不正です: {manifest_path}")
+        if header.get('version') != MANIFEST_VERSION:
+            raise ValueError(
+                f"未対応のマニフェストバージョンです: {header.get('version')}（対応: {MANIFEST_VERSION}）"
+            )
+
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
@@ -0,0 +1,27 @@
+#!/usr/bin/env python3
+"""
+生成日時 - 生成物のコメント・メタデータに埋め込む生成日時
+生成日時を埋め込むと入力が同じでも実行ごとに出力が変わり、未変更ファイルの書き込み省略や
+生成物の履歴（output/.artifacts）の重複排除・差分が機能しないため、既定では埋め込まない
+"""
+
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+
+def get_generated_at(config: Optional[Dict[str, Any]], section: Optional[str] = None,
+                     fmt: Optional[str] = None) -> Optional[str]:
+    """生成日時（generation.include_timestamp が有効な場合のみ。無効時はNone）
+
+    section を指定した場合は <section>.include_timestamp の指定を優先する（例: junit.include_timestamp）
+    """
+    config = config or {}
+    section_config = config.get(section) or {} if section else {}
+    if 'include_timestamp' in section_config:
+        enabled = section_config['include_timestamp']
+    else:
+        enabled = (config.get('generation') or {}).get('include_timestamp', False)
+    if not enabled:
+        return None
+    now = datetime.now()
+    return now.strftime(fmt) if fmt else now.isoformat()
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+計測 - 生成処理のステージ別タイマーとカウンター
+ジェネレーター共通の `metrics` にステージ（YAML読み込み・x-拡張解析・テンプレート描画・ファイル書き込み等）の
+処理時間と件数を記録し、合計値のJSONとChromeトレース（chrome://tracing / Perfetto）を出力する
+"""
+
+import os
+import json
+import time
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Union
+
+# カウンター名
+SPECS_LOADED = 'specs_loaded'
+SCHEMAS_PROCESSED = 'schemas_processed'
+ANNOTATIONS_BUILT = 'annotations_built'
+FILES_WRITTEN = 'files_written'
+BYTES_WRITTEN = 'bytes_written'
+CACHE_HITS = 'cache_hits'
+
+# 進捗通知の最小間隔（秒）。ファイル単位の通知が大量に発生しないよう間引く
+PROGRESS_INTERVAL = 0.1
+
+# 進捗通知の受け取り先（イベント名, データ）
+ProgressCallback = Callable[[str, Dict[str, Any]], None]
+
+
+class Instrumentation:
+    """ステージ別の処理時間・カウンターの記録
+
+    無効時はステージの計測（時刻取得・トレースイベント）を行わず、カウンターのみ加算する。
+    進捗通知の受け取り先を設定すると、ファイル書き込みの進捗を計測の有効・無効に関わらず通知する
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.progress: Optional[ProgressCallback] = None
+        self.reset()
+
+    def reset(self) -> None:
+        self.timers: Dict[str, Dict[str, Any]] = {}
+        self.counters: Dict[str, int] = {}
+        self.events: List[Dict[str, Any]] = []
+        self.last_file: Optional[str] = None
+        self._last_progress = 0.0
+
+    @contextmanager
+    def stage(self, name: str, **args: Any) -> Iterator[None]:
+        """ステージの処理時間を計測（`ジェネレーター.ステージ` 形式の名前で集計）"""
+        if not self.enabled:
+            yield
+            return
+        started = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter_ns() - started
+            timer = self.timers.setdefault(name, {'calls': 0, 'ns': 0})
+            timer['calls'] += 1
+            timer['ns'] += elapsed
+            self.events.append({
+                'name': name,
+                'cat': name.split('.', 1)[0],
+                'ph': 'X',
+                'ts': started / 1000,
+                'dur': elapsed / 1000,
+                'pid': os.getpid(),
+                'tid': threading.get_ident(),
+                'args': args
+            })
+
+    def count(self, name: str, value: int = 1) -> None:
+        """カウンターを加算"""
+        self.counters[name] = self.counters.get(name, 0) + value
+        if name == FILES_WRITTEN and self.progress is not None:
+            self.report_progress()
+
+    def set_progress(self, callback: Optional[ProgressCallback]) -> None:
+        """進捗通知の受け取り先を設定（None で解除）"""
+        self.progress = callback
+        self._last_progress = 0.0
+
+    def notify(self, event: str, **data: Any) -> None:
+        """進捗通知の受け取り先にイベントを送る（ステージの開始・終了等）"""
+        if self.progress is not None:
+            self.progress(event, data)
+
+    def report_progress(self, force: bool = False) -> None:
+        """書き込み済みファイル数・バイト数を通知（PROGRESS_INTERVAL ごとに間引く。force 指定時は必ず通知）"""
+        now = time.monotonic()
+        if not force and now - self._last_progress < PROGRESS_INTERVAL:
+            return
+        self._last_progress = now
+        self.notify(
+            'progress',
+            files_written=self.counters.get(FILES_WRITTEN, 0),
+            bytes_written=self.counters.get(BYTES_WRITTEN, 0),
+            file=self.last_file
+        )
+
+    def write_file(self, path: Union[str, Path], content: str, stage: str = 'write', newline: str = None) -> None:
+        """テキストファイルを書き込み、書き込み時間・ファイル数・バイト数を記録"""
+        with self.stage(stage, file=Path(path).name):
+            with open(path, 'w', encoding='utf-8', newline=newline) as f:
+                f.write(content)
+        self.last_file = Path(path).name
+        self.count(BYTES_WRITTEN, len(content.encode('utf-8')))
+        self.count(FILES_WRITTEN)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """プロセスプールのワーカーから親プロセスへ返す計測結果"""
+        return {'timers': self.timers, 'counters': self.counters, 'events': self.events, 'last_file': self.last_file}
+
+    def merge(self, snapshot: Dict[str, Any]) -> None:
+        """ワーカーの計測結果を取り込む"""
+        if snapshot.get('last_file'):
+            self.last_file = snapshot['last_file']
+        # 進捗はバイト数の加算後に通知する
+        for name, value in sorted(snapshot['counters'].items(), key=lambda item: item[0] == FILES_WRITTEN):
+            self.count(name, value)
+        if not self.enabled:
+            return
+        for name, worker_timer in snapshot['timers'].items():
+            timer = self.timers.setdefault(name, {'calls': 0, 'ns': 0})
+            timer['calls'] += worker_timer['calls']
+            timer['ns'] += worker_timer['ns']
+        self.events.extend(snapshot['events'])
+
+    def to_stats(self) -> Dict[str, Any]:
+        """カウンターとステージ別の合計時間（ミリ秒）"""
+        return {
+            'counters': dict(sorted(self.counters.items())),
+            'stages': {
+                name: {'calls': timer['calls'], 'total_ms': round(timer['ns'] / 1_000_000, 3)}
+                for name, timer in sorted(self.timers.items())
+            }
+        }
+
+    def write_chrome_trace(self, path: Union[str, Path]) -> None:
+        """Chromeトレース形式（Trace Event Format）で出力（ワーカープロセスは別の行に表示される）"""
+        main_pid = os.getpid()
+        process_names = [
+            {
+                'name': 'process_name',
+                'ph': 'M',
+                'pid': pid,
+                'args': {'name': 'generator' if pid == main_pid else f"worker {pid}"}
+            }
+            for pid in sorted({event['pid'] for event in self.events})
+        ]
+        trace = {
+            'traceEvents': process_names + sorted(self.events, key=lambda event: event['ts']),
+            'displayTimeUnit': 'ms',
+            'otherData': {'counters': self.counters}
+        }
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(trace, f, ensure_ascii=False)
+
+
+# ジェネレーター共通の計測（main.py の --stats / --trace 指定時に有効化）
+metrics = Instrumentation(enabled=False)
@@ -8,9 +8,11 @@ import os
 import yaml
 import logging
 import re
-from datetime import datetime
 from pathlib import Path
 from jinja2 import Environment, FileSystemLoader
+from .generation_time import get_generated_at
+from .instrumentation import SCHEMAS_PROCESSED, SPECS_LOADED, metrics
+from .spec_cache import load_openapi_spec
 
 logger = logging.getLogger(__name__)
 
@@ -36,6 +38,8 @@ class JavaEnumGenerator:
             self.openapi_files = openapi_files
             
         self.config_path = config_path
+        # パース済みOpenAPI仕様のキャッシュ（SpecCache。main.py・常駐モードが設定し、未設定時は毎回パースする）
+        self.spec_cache = None
         self.project_root = Path(__file__).parent.parent.parent
         
         # Jinja2環境の初期化
@@ -51,9 +55,10 @@ class JavaEnumGenerator:
         specs = {}
         for api_name, file_path in self.openapi_files.items():
             try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    specs[api_name] = yaml.safe_load(f)
+                with metrics.stage('java_enum.load_spec', api=api_name):
+                    specs[api_name] = load_openapi_spec(file_path, self.spec_cache)
                     logger.info(f"{api_name} API仕様を読み込みました: {file_path}")
+                metrics.count(SPECS_LOADED)
             except Exception as e:
                 logger.error(f"{api_name} API仕様ファイルの読み込みに失敗: {e}")
                 raise
@@ -94,6 +99,7 @@ class JavaEnumGenerator:
                 
             schemas = spec['components']['schemas']
             for schema_name, schema_def in schemas.items():
+                metrics.count(SCHEMAS_PROCESSED)
                 # enumかつx-makeEnumJava=trueの場合
                 if (isinstance(schema_def, dict) and 
                     schema_def.get('type') == 'string' and
@@ -153,11 +159,12 @@ class JavaEnumGenerator:
             'description': enum_info['description'],
             'enum_values': enum_info['enum_values'],
             'original_name': enum_info['original_name'],
-            'generated_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'generated_at': get_generated_at(config, fmt='%Y-%m-%d %H:%M:%S'),
             'api_name': enum_info.get('api_name', 'unknown')
         }
         
-        return template.render(**template_vars)
+        with metrics.stage('java_enum.render', enum=enum_info['class_name']):
+            return template.render(**template_vars)
         
     def write_enum_files(self, java_enums, config):
         """Java Enumファイルを出力"""
@@ -180,8 +187,7 @@ class JavaEnumGenerator:
             file_path = package_path / file_name
             
             # ファイルを書き出し
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(java_content)
+            metrics.write_file(file_path, java_content, stage='java_enum.write')
                 
             generated_files.append(str(file_path))
             logger.info(f"Java Enumファイルを生成: {file_path}")
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+JMH Benchmark Generator - JMHマイクロベンチマーク生成スクリプト
+OpenAPI仕様から生成DTOごとにBean Validation・Jackson (de)serializationのJMHベンチマークを生成
+"""
+
+import os
+import json
+import yaml
+import logging
+from pathlib import Path
+from jinja2 import Environment, FileSystemLoader
+from .schema_graph import SchemaGraph
+from .instrumentation import SCHEMAS_PROCESSED, SPECS_LOADED, metrics
+from .spec_cache import load_openapi_spec
+
+logger = logging.getLogger(__name__)
+
+
+class JmhBenchmarkGenerator:
+    """JMHベンチマーク生成クラス"""
+
+    def __init__(self, openapi_files, config_path=None):
+        """
+        Args:
+            openapi_files: dict または str
+                dict: {api_name: file_path} の形式（マルチAPIモード）
+                str: 単一ファイルパス（レガシーモード）
+        """
+        if isinstance(openapi_files, str):
+            # レガシーモード：単一ファイル
+            api_name = Path(openapi_files).stem
+            if api_name == 'openapi':
+                api_name = 'main'
+            self.openapi_files = {api_name: openapi_files}
+        else:
+            # マルチAPIモード
+            self.openapi_files = openapi_files
+
+        self.config_path = config_path
+        # パース済みOpenAPI仕様のキャッシュ（SpecCache。main.py・常駐モードが設定し、未設定時は毎回パースする）
+        self.spec_cache = None
+        self.project_root = Path(__file__).parent.parent.parent
+
+        # Jinja2環境の初期化
+        template_dir = Path(__file__).parent.parent / "templates" / "jmh"
+        self.jinja_env = Environment(
+            loader=FileSystemLoader(str(template_dir)),
+            trim_blocks=True,
+            lstrip_blocks=True
+        )
+
+        # 処理中のAPI仕様のスキーマグラフ（$ref・allOf解決用）
+        self.schema_graph = SchemaGraph()
+
+    def load_multiple_openapi_specs(self):
+        """複数のOpenAPI仕様ファイルを読み込み"""
+        specs = {}
+        for api_name, file_path in self.openapi_files.items():
+            try:
+                with metrics.stage('jmh.load_spec', api=api_name):
+                    specs[api_name] = load_openapi_spec(file_path, self.spec_cache)
+                    logger.info(f"{api_name} API仕様を読み込みました: {file_path}")
+                metrics.count(SPECS_LOADED)
+            except Exception as e:
+                logger.error(f"{api_name} API仕様ファイルの読み込みに失敗: {e}")
+                raise
+        return specs
+
+    def load_config(self):
+        """設定ファイルを読み込み"""
+        if not self.config_path or not os.path.exists(self.config_path):
+            return self.get_default_config()
+
+        try:
+            with open(self.config_path, 'r', encoding='utf-8') as f:
+                return yaml.safe_load(f)
+        except Exception as e:
+            logger.warning(f"設定ファイルの読み込みに失敗、デフォルト設定を使用: {e}")
+            return self.get_default_config()
+
+    def get_default_config(self):
+        """デフォルト設定を返す"""
+        return {
+            'spring': {
+                'base_package': 'com.example.api',
+                'dto_package': 'dto'
+            },
+            'jmh': {
+                'output_dir': 'output/backend/src/jmh/java',
+                'benchmark_package': 'benchmark',
+                'warmup_iterations': 3,
+                'measurement_iterations': 5,
+                'forks': 1,
+                'max_sample_string_length': 1024
+            }
+        }
+
+    def get_api_package_name(self, api_name, config):
+        """API別のパッケージ名を取得（SpringGeneratorと同じ規則）"""
+        if 'apis' in config and api_name in config['apis']:
+            api_config = config['apis'][api_name]
+            if 'spring' in api_config and 'base_package' in api_config['spring']:
+                return api_config['spring']['base_package']
+        return config.get('spring', {}).get('base_package', 'com.example.api')
+
+    def is_java_enum(self, schema_def):
+        """@makeEnumJava付きのenum（DTOではなくJava Enumとして生成される）かどうか"""
+        return (
+            schema_def.get('type') == 'string' and
+            'enum' in schema_def and
+            schema_def.get('x-makeEnumJava') is True
+        )
+
+    def to_java_enum_constant(self, schema_def):
+        """Java Enumの先頭定数名（Jacksonは定数名で(de)serializeする）"""
+        if schema_def.get('x-enumMembers'):
+            return schema_def['x-enumMembers'][0]['key']
+        value = str(schema_def['enum'][0])
+        java_name = value.replace('-', '_').replace(' ', '_').upper()
+        return f"VALUE_{java_name}" if java_name[:1].isdigit() else java_name
+
+    def build_sample_string(self, schema, config):
+        """文字列のサンプル値（正規表現のコストを測るため、長さ制限がある場合は上限の長さで生成）"""
+        string_format = schema.get('format')
+        if string_format == 'date-time':
+            return '2024-01-01T00:00:00Z'
+        if string_format == 'date':
+            return '2024-01-01'
+        if string_format == 'email':
+            return 'benchmark@example.com'
+        if string_format == 'uuid':
+            return '123e4567-e89b-12d3-a456-426614174000'
+
+        max_sample_length = config.get('jmh', {}).get('max_sample_string_length', 1024)
+        length = min(schema.get('maxLength', 16), max_sample_length)
+        length = max(length, schema.get('minLength', 1))
+        return ('abc123' * (length // 6 + 1))[:length]
+
+    def build_sample_value(self, schema, config, stack=()):
+        """スキーマからJSONのサンプル値を生成（example・default・enumを優先）"""
+        type_name = self.schema_graph.type_name(schema)
+        schema = self.schema_graph.compose(schema)
+
+        if type_name:
+            if self.is_java_enum(schema):
+                return self.to_java_enum_constant(schema)
+            # 循環参照のモデルはnullで打ち切る
+            if type_name in stack:
+                return None
+            stack = stack + (type_name,)
+            # DTOクラスとして生成される型はオブジェクトで表す
+            if not schema.get('properties'):
+                return {}
+
+        for key in ('example', 'default'):
+            if key in schema:
+                return schema[key]
+        if schema.get('enum'):
+            return schema['enum'][0]
+
+        schema_type = schema.get('type')
+        if schema_type == 'string':
+            return self.build_sample_string(schema, config)
+        if schema_type == 'integer':
+            return int(schema.get('minimum', 1))
+        if schema_type == 'number':
+            return float(schema.get('minimum', 1.5))
+        if schema_type == 'boolean':
+            return True
+        if schema_type == 'array':
+            item = self.build_sample_value(schema.get('items', {}), config, stack)
+            return [item] * max(schema.get('minItems', 1), 1)
+        if schema_type == 'object' or schema.get('properties'):
+            return {
+                name: self.build_sample_value(prop_def, config, stack)
+                for name, prop_def in (schema.get('properties') or {}).items()
+            }
+        return 'sample'
+
+    def to_java_string_literal(self, value):
+        """JSON文字列をJavaの文字列リテラルに変換"""
+        return json.dumps(value)
+
+    def extract_benchmark_targets(self, api_name, openapi_spec, config):
+        """ベンチマーク対象のDTO（Spring生成対象のモデル）とサンプルペイロードを抽出"""
+        self.schema_graph = SchemaGraph(openapi_spec)
+        dto_package = f"{self.get_api_package_name(api_name, config)}.{config.get('spring', {}).get('dto_package', 'dto')}"
+
+        targets = []
+        for schema_name, schema_def in self.schema_graph.schemas.items():
+            metrics.count(SCHEMAS_PROCESSED)
+            if self.is_java_enum(schema_def):
+                continue
+            sample = self.build_sample_value({'$ref': f"#/components/schemas/{schema_name}"}, config)
+            if not isinstance(sample, dict) or not sample:
+                logger.debug(f"フィールドのないモデルはベンチマーク対象外: {schema_name}")
+                continue
+            targets.append({
+                'api_name': api_name,
+                'class_name': schema_name,
+                'dto_package': dto_package,
+                'sample_json': self.to_java_string_literal(json.dumps(sample, ensure_ascii=False, separators=(',', ':')))
+            })
+        return targets
+
+    def get_benchmark_package_name(self, api_name, config):
+        """ベンチマーククラスのパッケージ名を取得"""
+        benchmark_package = config.get('jmh', {}).get('benchmark_package', 'benchmark')
+        return f"{self.get_api_package_name(api_name, config)}.{benchmark_package}"
+
+    def generate_benchmark(self, target, package_name, config):
+        """DTOのベンチマーククラスを生成"""
+        template = self.jinja_env.get_template('dto_benchmark.java.j2')
+        jmh_config = config.get('jmh', {})
+        with metrics.stage('jmh.render', benchmark=target['class_name']):
+            return template.render(
+                target=target,
+                package_name=package_name,
+                warmup_iterations=jmh_config.get('warmup_iterations', 3),
+                measurement_iterations=jmh_config.get('measurement_iterations', 5),
+                forks=jmh_config.get('forks', 1)
+            )
+
+    def generate(self):
+        """JMHベンチマーク生成のメイン処理"""
+        logger.info("JMHベンチマーク生成を開始...")
+
+        try:
+            config = self.load_config()
+            specs = self.load_multiple_openapi_specs()
+            output_base = Path(config.get('jmh', {}).get('output_dir', 'output/backend/src/jmh/java'))
+
+            generated_files = []
+            for api_name, openapi_spec in specs.items():
+                with metrics.stage('jmh.extract', api=api_name):
+                    targets = self.extract_benchmark_targets(api_name, openapi_spec, config)
+                if not targets:
+                    logger.warning(f"{api_name} API: ベンチマーク対象のDTOが見つかりませんでした")
+                    continue
+
+                package_name = self.get_benchmark_package_name(api_name, config)
+                package_path = output_base / package_name.replace('.', '/')
+                package_path.mkdir(parents=True, exist_ok=True)
+
+                for target in targets:
+                    content = self.generate_benchmark(target, package_name, config)
+                    benchmark_file = package_path / f"{target['class_name']}Benchmark.java"
+                    metrics.write_file(benchmark_file, content, stage='jmh.write')
+                    generated_files.append(str(benchmark_file))
+                    logger.info(f"JMHベンチマークを生成: {benchmark_file}")
+
+            logger.info(f"JMHベンチマーク生成完了: {len(generated_files)}ファイル")
+            return generated_files
+
+        except Exception as e:
+            logger.error(f"JMHベンチマーク生成中にエラーが発生: {e}")
+            raise
@@ -7,13 +7,46 @@ Spring Generatorで生成されたメタデータからJUnit 5テストコード
 import os
 import json
 import yaml
+import hashlib
 import logging
-from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from jinja2 import Environment, FileSystemLoader
+from .generation_manifest import MANIFEST_FILE_NAME, iter_manifest
+from .generation_time import get_generated_at
+from .profiling import get_parallel_workers
+from .instrumentation import CACHE_HITS, Instrumentation, metrics
 
 logger = logging.getLogger(__name__)
 
+# 並列ワーカー用のJinja2環境（プロセスごとに1度だけ初期化）
+_worker_jinja_envs = {}
+
+
+def render_test_file(template_dir, template_name, test_file, context):
+    """テストクラスを描画し、内容が変わった場合のみ書き込み（並列生成のワーカー）
+
+    Returns:
+        (テストファイルパス, 書き込んだかどうか, 計測結果): 計測結果は親プロセスの metrics に取り込む
+    """
+    worker_metrics = Instrumentation()
+    if template_dir not in _worker_jinja_envs:
+        _worker_jinja_envs[template_dir] = Environment(
+            loader=FileSystemLoader(template_dir),
+            trim_blocks=True,
+            lstrip_blocks=True
+        )
+    with worker_metrics.stage('junit.render', test=Path(test_file).stem):
+        content = _worker_jinja_envs[template_dir].get_template(template_name).render(**context)
+    
+    test_path = Path(test_file)
+    if test_path.exists() and test_path.read_text(encoding='utf-8') == content:
+        worker_metrics.count(CACHE_HITS)
+        return test_file, False, worker_metrics.snapshot()
+    test_path.parent.mkdir(parents=True, exist_ok=True)
+    worker_metrics.write_file(test_path, content, stage='junit.write')
+    return test_file, True, worker_metrics.snapshot()
+
 
 class JunitTestGenerator:
     """JUnit 5テスト生成クラス"""
@@ -24,6 +57,7 @@ class JunitTestGenerator:
         
         # Jinja2環境の初期化
         template_dir = Path(__file__).parent.parent / "templates" / "junit"
+        self.template_dir = template_dir
         self.jinja_env = Environment(
             loader=FileSystemLoader(str(template_dir)),
             trim_blocks=True,
@@ -50,10 +84,19 @@ class JunitTestGenerator:
                 'base_package': 'com.example.api',
                 'output_dir': 'output/backend/src/test/java',
                 'include_integration_tests': True,
-                'mock_external_dependencies': True
+                'mock_external_dependencies': True,
+                'include_timestamp': False,
+                'parallel_workers': 0
             }
         }
         
+    def load_spring_manifest(self):
+        """Spring生成マニフェストをレコード単位で読み込み（存在しない場合はNone）"""
+        manifest_file = self.project_root / "output" / "metadata" / MANIFEST_FILE_NAME
+        if not manifest_file.exists():
+            return None
+        return iter_manifest(manifest_file)
+        
     def load_spring_metadata(self):
         """Spring生成メタデータを読み込み"""
         metadata_file = self.project_root / "output" / "metadata" / "spring_metadata.json"
@@ -64,35 +107,43 @@ class JunitTestGenerator:
         with open(metadata_file, 'r', encoding='utf-8') as f:
             return json.load(f)
             
-    def generate_controller_test(self, controller_info, config):
-        """Controller テストクラスを生成"""
-        template = self.jinja_env.get_template('controller_test.java.j2')
+    def get_generated_at(self, config):
+        """生成日時（junit.include_timestamp、未指定時は generation.include_timestamp が有効な場合のみ。無効時は出力を決定的にするためNone）"""
+        return get_generated_at(config, 'junit', fmt='%Y-%m-%d %H:%M:%S')
         
-        # エンドポイント情報を解析
-        endpoints = self.parse_endpoints(controller_info.get('endpoints', {}))
+    def build_controller_test_context(self, controller_info, config):
+        """Controller テストテンプレートの描画データを作成"""
+        # エンドポイント情報を解析（マニフェストのエンドポイントは解析済みのリスト）
+        endpoints = controller_info.get('endpoints', {})
+        if isinstance(endpoints, dict):
+            endpoints = self.parse_endpoints(endpoints)
         
-        template_vars = {
+        return {
             'controller_info': controller_info,
             'endpoints': endpoints,
             'config': config,
-            'generated_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'generated_at': self.get_generated_at(config),
             'package_name': controller_info['package']
         }
         
-        return template.render(**template_vars)
-        
-    def generate_dto_validation_test(self, dto_info, config):
-        """DTO バリデーションテストクラスを生成"""
-        template = self.jinja_env.get_template('dto_validation_test.java.j2')
-        
-        template_vars = {
+    def build_dto_test_context(self, dto_info, config):
+        """DTO バリデーションテストテンプレートの描画データを作成"""
+        return {
             'dto_info': dto_info,
             'config': config,
-            'generated_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'generated_at': self.get_generated_at(config),
             'package_name': dto_info['package']
         }
         
-        return template.render(**template_vars)
+    def generate_controller_test(self, controller_info, config):
+        """Controller テストクラスを生成"""
+        template = self.jinja_env.get_template('controller_test.java.j2')
+        return template.render(**self.build_controller_test_context(controller_info, config))
+        
+    def generate_dto_validation_test(self, dto_info, config):
+        """DTO バリデーションテストクラスを生成"""
+        template = self.jinja_env.get_template('dto_validation_test.java.j2')
+        return template.render(**self.build_dto_test_context(dto_info, config))
         
     def parse_endpoints(self, endpoints_data):
         """エンドポイント情報を解析してテスト生成用に整形"""
@@ -119,7 +170,8 @@ class JunitTestGenerator:
         
         for param in parameters:
             if isinstance(param, dict) and '$ref' in param:
-                # $ref は簡略化して処理
+                # SpringGeneratorがスキーマグラフで解決済みのため通常は通らない
+                # （$ref未解決の旧形式メタデータ向けに簡略化して処理）
                 ref_name = param['$ref'].split('/')[-1]
                 parsed_params.append({
                     'name': ref_name,
@@ -164,68 +216,176 @@ class JunitTestGenerator:
             
         return java_type
         
-    def write_test_files(self, controllers, dtos, config):
-        """テストファイルを出力"""
-        output_base = config.get('junit', {}).get('output_dir', 'output/backend/src/test/java')
-        base_path = Path(output_base)
+    def get_test_output_base(self, config):
+        """テスト出力先のベースディレクトリ"""
+        return Path(config.get('junit', {}).get('output_dir', 'output/backend/src/test/java'))
+        
+    def get_test_file_path(self, info, base_path):
+        """テストファイルのパス（パッケージ名のディレクトリ + <クラス名>Test.java）"""
+        package_path = base_path / '/'.join(info['package'].split('.'))
+        return package_path / f"{info['class_name']}Test.java"
         
-        generated_files = []
+    def plan_controller_test(self, controller_info, config, base_path):
+        """Controller テストの生成ジョブを作成"""
+        return (
+            'controller_test.java.j2',
+            self.get_test_file_path(controller_info, base_path),
+            self.build_controller_test_context(controller_info, config)
+        )
         
-        # Controller テストを生成
-        for controller_info in controllers:
-            test_content = self.generate_controller_test(controller_info, config)
+    def plan_dto_test(self, dto_info, config, base_path):
+        """DTO テストの生成ジョブを作成（バリデーションがないDTOはNone）"""
+        # バリデーションがあるDTOのみテスト生成
+        if not any(field.get('validations') for field in dto_info.get('fields', [])):
+            return None
+        return (
+            'dto_validation_test.java.j2',
+            self.get_test_file_path(dto_info, base_path),
+            self.build_dto_test_context(dto_info, config)
+        )
+        
+    def get_cache_path(self):
+        """前回生成時のフィンガープリントを保存するファイル"""
+        return self.project_root / "output" / "metadata" / "junit_test_cache.json"
+        
+    def load_fingerprints(self):
+        """前回生成時のフィンガープリントを読み込み"""
+        cache_path = self.get_cache_path()
+        if not cache_path.exists():
+            return {}
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"JUnitテストのキャッシュを読み込めませんでした（全件生成します）: {e}")
+            return {}
             
-            # パッケージパスを生成
-            package_parts = controller_info['package'].split('.')
-            # .controllerをそのまま使用
-            package_path = base_path / '/'.join(package_parts)
-            package_path.mkdir(parents=True, exist_ok=True)
+    def save_fingerprints(self, fingerprints):
+        """フィンガープリントを保存"""
+        cache_path = self.get_cache_path()
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(cache_path, 'w', encoding='utf-8') as f:
+            json.dump(fingerprints, f, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
             
-            # ファイル名生成
-            test_file_name = f"{controller_info['class_name']}Test.java"
-            test_file_path = package_path / test_file_name
+    def get_template_fingerprint(self):
+        """テンプレートの内容のハッシュ（テンプレート変更時は全件再生成）"""
+        digest = hashlib.sha256()
+        for template_file in sorted(self.template_dir.glob("*.j2")):
+            digest.update(template_file.name.encode('utf-8'))
+            digest.update(template_file.read_bytes())
+        return digest.hexdigest()
+        
+    def get_job_fingerprint(self, template_name, context, template_fingerprint):
+        """生成ジョブのフィンガープリント（メタデータ・設定・テンプレートのハッシュ）"""
+        payload = {key: value for key, value in context.items() if key != 'generated_at'}
+        digest = hashlib.sha256(template_fingerprint.encode('utf-8'))
+        digest.update(template_name.encode('utf-8'))
+        digest.update(json.dumps(payload, ensure_ascii=False, sort_keys=True, default=str).encode('utf-8'))
+        return digest.hexdigest()
+        
+    def run_test_jobs(self, jobs, config):
+        """生成ジョブを実行（メタデータが変わったテストのみ、ワーカープールで並列に描画）
+
+        Returns:
+            生成対象の全テストファイルパスのリスト
+        """
+        previous = self.load_fingerprints()
+        template_fingerprint = self.get_template_fingerprint()
+        
+        # 同じテストファイルのジョブを1つにまとめる（API間で共有するDTOは各APIのマニフェストに含まれる）。
+        # SpringGeneratorはAPI順に上書きするため、最後のAPIのDTOが出力に残る。テストも最後のジョブに合わせる
+        unique_jobs = {}
+        fingerprints = {}
+        for template_name, test_file, context in jobs:
+            key = str(test_file)
+            fingerprint = self.get_job_fingerprint(template_name, context, template_fingerprint)
+            if key in fingerprints and fingerprints[key] != fingerprint:
+                logger.warning(f"同じテストファイルに異なる定義があります（後のAPIの定義で生成します）: {key}")
+            unique_jobs.pop(key, None)
+            unique_jobs[key] = (template_name, test_file, context)
+            fingerprints[key] = fingerprint
             
-            # ファイル書き出し
-            with open(test_file_path, 'w', encoding='utf-8') as f:
-                f.write(test_content)
-                
-            generated_files.append(str(test_file_path))
-            logger.info(f"Controller テストを生成: {test_file_path}")
+        test_files = []
+        pending = []
+        for key, (template_name, test_file, context) in unique_jobs.items():
+            fingerprint = fingerprints[key]
+            test_files.append(key)
             
-        # DTO テストを生成
-        for dto_info in dtos:
-            # バリデーションがあるDTOのみテスト生成
-            if not any(field.get('validations') for field in dto_info.get('fields', [])):
+            # メタデータ・テンプレートが前回と同じで、ファイルも残っている場合はスキップ
+            if previous.get(key) == fingerprint and test_file.exists():
+                metrics.count(CACHE_HITS)
                 continue
-                
-            test_content = self.generate_dto_validation_test(dto_info, config)
-            
-            # パッケージパスを生成
-            package_parts = dto_info['package'].split('.')
-            # .dtoをそのまま使用
-            package_path = base_path / '/'.join(package_parts)
-            package_path.mkdir(parents=True, exist_ok=True)
+            pending.append((str(self.template_dir), template_name, key, context))
             
-            # ファイル名生成
-            test_file_name = f"{dto_info['class_name']}Test.java"
-            test_file_path = package_path / test_file_name
+        workers = get_parallel_workers(config.get('junit', {}).get('parallel_workers'))
+        if len(pending) > 1 and workers > 1:
+            with ProcessPoolExecutor(max_workers=min(workers, len(pending))) as executor:
+                results = list(executor.map(render_test_file, *zip(*pending), chunksize=16))
+        else:
+            results = [render_test_file(*job) for job in pending]
             
-            # ファイル書き出し
-            with open(test_file_path, 'w', encoding='utf-8') as f:
-                f.write(test_content)
+        written = 0
+        for test_file, changed, worker_snapshot in results:
+            metrics.merge(worker_snapshot)
+            if changed:
+                written += 1
+                logger.info(f"テストを生成: {test_file}")
                 
-            generated_files.append(str(test_file_path))
-            logger.info(f"DTO テストを生成: {test_file_path}")
+        self.save_fingerprints(fingerprints)
+        logger.info(
+            f"JUnit テスト: {written}ファイルを更新（{len(test_files) - len(pending)}ファイルはメタデータ未変更のためスキップ）"
+        )
+        return test_files
+        
+    def write_test_files(self, controllers, dtos, config):
+        """テストファイルを出力"""
+        base_path = self.get_test_output_base(config)
+        
+        jobs = [self.plan_controller_test(controller_info, config, base_path) for controller_info in controllers]
+        jobs.extend(job for job in (self.plan_dto_test(dto_info, config, base_path) for dto_info in dtos) if job)
+        
+        return self.run_test_jobs(jobs, config)
+        
+    def write_test_files_from_manifest(self, records, config):
+        """マニフェストのレコードを1件ずつ読みながらテストファイルを出力"""
+        base_path = self.get_test_output_base(config)
+        
+        jobs = []
+        counts = {'controller': 0, 'dto': 0}
+        
+        for record in records:
+            kind = record.get('kind')
+            if kind == 'controller':
+                jobs.append(self.plan_controller_test(record, config, base_path))
+            elif kind == 'dto':
+                job = self.plan_dto_test(record, config, base_path)
+                if job:
+                    jobs.append(job)
+            else:
+                continue
+            counts[kind] += 1
             
-        return generated_files
+        logger.info(f"テスト生成対象: Controller {counts['controller']}個, DTO {counts['dto']}個")
+        return self.run_test_jobs(jobs, config)
         
     def generate(self):
         """JUnit テスト生成のメイン処理"""
         logger.info("JUnit テスト生成を開始...")
         
         try:
-            # 設定とメタデータを読み込み
+            # 設定を読み込み
             config = self.load_config()
+            
+            # マニフェストがある場合はストリーミングで処理
+            manifest_records = self.load_spring_manifest()
+            if manifest_records is not None:
+                generated_files = self.write_test_files_from_manifest(manifest_records, config)
+                if not generated_files:
+                    logger.warning("テスト生成対象が見つかりませんでした")
+                logger.info(f"JUnit テスト生成完了: {len(generated_files)}ファイル")
+                return generated_files
+                
+            # マニフェストがない場合は詳細メタデータから生成
             metadata = self.load_spring_metadata()
             
             controllers = metadata.get('controllers', [])
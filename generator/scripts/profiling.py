@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+プロファイリング - 生成処理のプロファイル取得
+cProfile（決定的プロファイラー、.prof）または pyinstrument（サンプリング、speedscope形式）で
+生成処理を計測し、output/metadata/ への保存とジェネレーター内のホットな関数の一覧表示を行う
+"""
+
+import os
+import sys
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import Any, List, NamedTuple, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+# プロファイルの取得方式（cprofile: 全関数呼び出しを記録 / sampling: pyinstrumentで低オーバーヘッドにサンプリング）
+PROFILE_MODES = ('cprofile', 'sampling')
+
+# ホットな関数の集計対象（SpringGenerator・AngularGenerator・XExtensionParser等のジェネレーター本体）
+SCRIPTS_DIR = Path(__file__).resolve().parent
+
+# サンプリング間隔（秒）
+SAMPLING_INTERVAL = 0.001
+
+# プロファイル取得中か（GenerationProfilerのwith文の範囲でTrue）
+_active = False
+
+
+def get_parallel_workers(configured: Optional[int]) -> int:
+    """並列生成のワーカー数（未指定・0はCPU数）
+
+    プロセスプールのワーカー内の処理はプロファイルに含まれないため、プロファイル取得中は1（逐次生成）とする
+    """
+    if _active:
+        return 1
+    return configured or os.cpu_count() or 1
+
+
+class HotFunction(NamedTuple):
+    """ホットな関数の集計結果（サンプリング時の呼び出し回数はNone）"""
+    location: str
+    calls: Optional[int]
+    self_seconds: float
+    total_seconds: float
+
+
+class GenerationProfiler:
+    """生成処理のプロファイラー（with文の範囲を計測）"""
+
+    def __init__(self, mode: str, output_dir: Union[str, Path], target: str, top: int = 20):
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"未対応のプロファイル方式です: {mode}（対応: {', '.join(PROFILE_MODES)}）")
+        self.mode = mode
+        self.output_dir = Path(output_dir)
+        self.target = target
+        self.top = top
+        self._profiler: Any = None
+
+    def __enter__(self) -> 'GenerationProfiler':
+        global _active
+        _active = True
+        # cProfile・pstatsは --profile 指定時のみ読み込む（main.pyの起動時間に含めない）
+        if self.mode == 'cprofile':
+            import cProfile
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        else:
+            try:
+                from pyinstrument import Profiler
+            except ImportError:
+                raise RuntimeError(
+                    "--profile sampling には pyinstrument が必要です（pip install pyinstrument）"
+                ) from None
+            self._profiler = Profiler(interval=SAMPLING_INTERVAL)
+            self._profiler.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        global _active
+        _active = False
+        if self.mode == 'cprofile':
+            self._profiler.disable()
+        else:
+            self._profiler.stop()
+
+    def get_output_file(self) -> Path:
+        """プロファイルの出力先（output/metadata/profile_[対象]_[日時].prof / .speedscope.json）"""
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        suffix = '.prof' if self.mode == 'cprofile' else '.speedscope.json'
+        return self.output_dir / f"profile_{self.target}_{timestamp}{suffix}"
+
+    def save(self) -> Path:
+        """プロファイルを保存（.prof は snakeviz・pstats、speedscope は https://www.speedscope.app で表示）"""
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        output_file = self.get_output_file()
+        if self.mode == 'cprofile':
+            self._profiler.dump_stats(str(output_file))
+        else:
+            from pyinstrument.renderers import SpeedscopeRenderer
+            with open(output_file, 'w', encoding='utf-8') as f:
+                f.write(self._profiler.output(renderer=SpeedscopeRenderer()))
+        logger.info(f"プロファイルを保存しました: {output_file}")
+        return output_file
+
+    def is_generator_code(self, file_path: str) -> bool:
+        """ジェネレーター本体（generator/scripts）の関数かどうか"""
+        try:
+            return Path(file_path).resolve().is_relative_to(SCRIPTS_DIR)
+        except (OSError, ValueError):
+            return False
+
+    def to_location(self, file_path: str, line_no: int, function: str) -> str:
+        return f"{Path(file_path).name}:{line_no}({function})"
+
+    def collect_hot_functions(self) -> List[HotFunction]:
+        """ジェネレーター本体の関数を自己時間の降順で集計"""
+        if self.mode == 'cprofile':
+            import pstats
+            stats = pstats.Stats(self._profiler)
+            functions = [
+                HotFunction(self.to_location(file_path, line_no, function), calls, self_seconds, total_seconds)
+                for (file_path, line_no, function), (_, calls, self_seconds, total_seconds, _) in stats.stats.items()
+                if self.is_generator_code(file_path)
+            ]
+        else:
+            functions = self.collect_sampled_functions()
+        return sorted(functions, key=lambda item: item.self_seconds, reverse=True)[:self.top]
+
+    def collect_sampled_functions(self) -> List[HotFunction]:
+        """pyinstrumentのフレームツリーから関数ごとの自己時間・合計時間を集計（再帰呼び出しの合計時間は外側のみ加算）"""
+        totals = {}
+        root = self._profiler.last_session.root_frame() if self._profiler.last_session else None
+
+        def visit(frame, ancestors):
+            key = (frame.file_path or '', frame.line_no or 0, frame.function or '')
+            if frame.file_path and self.is_generator_code(frame.file_path):
+                self_seconds, total_seconds = totals.get(key, (0.0, 0.0))
+                totals[key] = (
+                    self_seconds + frame.self_time,
+                    total_seconds + (0.0 if key in ancestors else frame.time)
+                )
+            for child in frame.children:
+                visit(child, ancestors | {key})
+
+        if root is not None:
+            visit(root, frozenset())
+        return [
+            HotFunction(self.to_location(*key), None, self_seconds, total_seconds)
+            for key, (self_seconds, total_seconds) in totals.items()
+        ]
+
+    def print_hot_functions(self, stream=None) -> None:
+        """ジェネレーター本体のホットな関数の上位N件を表示（標準出力は --stats json 用に空けておく）"""
+        stream = stream or sys.stderr
+        functions = self.collect_hot_functions()
+        print(f"ジェネレーターのホットな関数（自己時間の上位{self.top}件, {self.mode}）", file=stream)
+        print(f"{'self(s)':>9} {'total(s)':>9} {'calls':>9}  function", file=stream)
+        for item in functions:
+            calls = '-' if item.calls is None else str(item.calls)
+            print(f"{item.self_seconds:>9.3f} {item.total_seconds:>9.3f} {calls:>9}  {item.location}", file=stream)
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+スキーマグラフ - OpenAPI仕様の$ref・allOf解決用インデックス
+仕様ごとに1度だけ構築し、各ジェネレーターから参照解決・allOf展開・型名の取得に利用する
+"""
+
+import logging
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class SchemaGraph:
+    """OpenAPI仕様の$ref・allOf解決用インデックス
+
+    components配下の全要素を '#/components/<セクション>/<名前>' をキーに索引化し、
+    $refの解決とallOfの展開結果をキャッシュする。循環参照は警告を出して空スキーマとして扱う。
+    """
+
+    def __init__(self, spec: Optional[Dict[str, Any]] = None):
+        self.spec = spec or {}
+
+        # '#/components/schemas/User' -> スキーマ定義
+        self.components: Dict[str, Any] = {}
+        for section, entries in (self.spec.get('components') or {}).items():
+            if isinstance(entries, dict):
+                for name, node in entries.items():
+                    self.components[f"#/components/{section}/{name}"] = node
+
+        self._resolved: Dict[str, Any] = {}  # $ref -> 解決済みの実体
+        self._composed: Dict[int, Dict[str, Any]] = {}  # id(スキーマ) -> allOf展開済みスキーマ
+        self.cycles: List[List[str]] = []  # 検出した循環参照
+
+    @property
+    def schemas(self) -> Dict[str, Any]:
+        """components/schemas"""
+        return (self.spec.get('components') or {}).get('schemas') or {}
+
+    @staticmethod
+    def ref_name(ref: str) -> str:
+        """$refから名前を取得（例: #/components/schemas/User -> User）"""
+        return ref.rsplit('/', 1)[-1]
+
+    def lookup(self, ref: str) -> Optional[Any]:
+        """$refの参照先を取得（components外のJSONポインタにも対応）"""
+        if ref in self.components:
+            return self.components[ref]
+        if not ref.startswith('#/'):
+            logger.warning(f"外部ファイルへの$refは解決できません: {ref}")
+            return None
+
+        node: Any = self.spec
+        for token in ref[2:].split('/'):
+            token = token.replace('~1', '/').replace('~0', '~')
+            if not isinstance(node, dict) or token not in node:
+                return None
+            node = node[token]
+        self.components[ref] = node
+        return node
+
+    def resolve(self, node: Any) -> Any:
+        """$refを末端まで辿った実体を返す（$refでない場合はそのまま返す）"""
+        if not isinstance(node, dict) or '$ref' not in node:
+            return node
+
+        ref = node['$ref']
+        if ref in self._resolved:
+            return self._resolved[ref]
+
+        chain: List[str] = []
+        current: Any = node
+        while isinstance(current, dict) and '$ref' in current:
+            current_ref = current['$ref']
+            if current_ref in self._resolved:
+                current = self._resolved[current_ref]
+                break
+            if current_ref in chain:
+                cycle = chain[chain.index(current_ref):] + [current_ref]
+                self.cycles.append(cycle)
+                logger.warning(f"$refの循環参照を検出しました: {' -> '.join(cycle)}")
+                current = {}
+                break
+            chain.append(current_ref)
+
+            target = self.lookup(current_ref)
+            if target is None:
+                logger.warning(f"$refの参照先が見つかりません: {current_ref}")
+                current = {}
+                break
+            current = target
+
+        for chain_ref in chain:
+            self._resolved[chain_ref] = current
+        return current
+
+    def compose(self, schema: Any) -> Dict[str, Any]:
+        """allOfを展開し、properties・requiredを統合したスキーマを返す"""
+        schema = self.resolve(schema)
+        if not isinstance(schema, dict):
+            return {}
+        return self._compose(schema, [])
+
+    def _compose(self, schema: Dict[str, Any], stack: List[int]) -> Dict[str, Any]:
+        members = schema.get('allOf')
+        if not members:
+            return schema
+
+        key = id(schema)
+        if key in self._composed:
+            return self._composed[key]
+        if key in stack:
+            self.cycles.append(['allOf'])
+            logger.warning("allOfの循環参照を検出しました（展開を打ち切ります）")
+            return {}
+
+        stack.append(key)
+        composed: Dict[str, Any] = {}
+        properties: Dict[str, Any] = {}
+        required: List[str] = []
+
+        # 継承元（allOfの各要素）→ 自身の定義の順に統合（後勝ち）
+        parts = [self._compose(self.resolve(member) or {}, stack) for member in members]
+        parts.append({k: v for k, v in schema.items() if k != 'allOf'})
+        for part in parts:
+            composed.update({k: v for k, v in part.items() if k not in ('properties', 'required')})
+            properties.update(part.get('properties') or {})
+            required.extend(name for name in part.get('required') or [] if name not in required)
+        stack.pop()
+
+        if properties:
+            composed['properties'] = properties
+            composed.setdefault('type', 'object')
+        if required:
+            composed['required'] = required
+
+        self._composed[key] = composed
+        return composed
+
+    def type_name(self, schema: Any) -> Optional[str]:
+        """スキーマが表す名前付き型（components/schemasの名前）を返す
+
+        $refの場合は参照先の名前、allOfの場合は最初の$ref要素の名前。
+        名前付き型でない場合はNone。
+        """
+        if not isinstance(schema, dict):
+            return None
+        if '$ref' in schema:
+            return self.ref_name(schema['$ref'])
+        for member in schema.get('allOf') or []:
+            if isinstance(member, dict) and '$ref' in member:
+                return self.ref_name(member['$ref'])
+        return None
+
+    def operation_parameters(self, path_def: Dict[str, Any], method_def: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """パス共通とオペレーションのパラメータを$ref解決して統合（同名・同位置はオペレーション側が優先）"""
+        merged: Dict[Any, Dict[str, Any]] = {}
+        for param in list(path_def.get('parameters') or []) + list(method_def.get('parameters') or []):
+            resolved = self.resolve(param)
+            if not isinstance(resolved, dict) or not resolved:
+                continue
+            merged[(resolved.get('name'), resolved.get('in'))] = resolved
+        return list(merged.values())
+
+    def json_schema(self, container: Any, media_type: str = 'application/json') -> Optional[Dict[str, Any]]:
+        """requestBody・responseの$refを解決し、指定メディアタイプのスキーマを返す"""
+        container = self.resolve(container)
+        if not isinstance(container, dict):
+            return None
+        media = (container.get('content') or {}).get(media_type)
+        if not media:
+            return None
+        return media.get('schema')
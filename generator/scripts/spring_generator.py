@@ -5,16 +5,207 @@ OpenAPI仕様からSpring Bootのコントローラーとドメインオブジ
 """
 
 import os
+import re
 import yaml
 import json
 import logging
-from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
 from jinja2 import Environment, FileSystemLoader
-from .x_extension_parser import XExtensionParser
+from .x_extension_parser import ValidationRule, ValidationTypeEnum, XExtensionParser
+from .schema_graph import SchemaGraph
+from .generation_manifest import MANIFEST_FILE_NAME, ManifestWriter, iter_manifest
+from .generation_time import get_generated_at
+from .profiling import get_parallel_workers
+from .instrumentation import ANNOTATIONS_BUILT, SCHEMAS_PROCESSED, SPECS_LOADED, Instrumentation, metrics
+from .spec_cache import load_openapi_spec
 
 logger = logging.getLogger(__name__)
 
+# コントローラーの分割方式
+CONTROLLER_SPLIT_MODES = ('none', 'tag', 'path')
+
+# 配列レスポンスの返却方式（none: 従来どおり / page: Pageableでページ分割 / stream: NDJSONで逐次出力）
+LIST_RESPONSE_MODES = ('none', 'page', 'stream')
+
+# 並列ワーカー用のJinja2環境（プロセスごとに1度だけ初期化）
+_worker_jinja_envs = {}
+
+
+def render_controller_file(template_dir, controller_file, context):
+    """Controllerを描画してファイルに書き込み（シャード並列生成のワーカー）
+
+    Returns:
+        (Controllerファイルパス, 計測結果): 計測結果は親プロセスの metrics に取り込む
+    """
+    worker_metrics = Instrumentation()
+    if template_dir not in _worker_jinja_envs:
+        _worker_jinja_envs[template_dir] = Environment(
+            loader=FileSystemLoader(template_dir),
+            trim_blocks=True,
+            lstrip_blocks=True
+        )
+    with worker_metrics.stage('spring.render_controller', controller=context['controller_name']):
+        content = _worker_jinja_envs[template_dir].get_template("controller.java.j2").render(**context)
+    worker_metrics.write_file(controller_file, content, stage='spring.write')
+    return controller_file, worker_metrics.snapshot()
+
+
+class PatternRegistry:
+    """正規表現パターンの定数登録簿（パッケージ単位で生成するPatternsクラスの内容）
+
+    同じ正規表現は1つの定数にまとめ、DTO・recordの @Pattern とカスタムバリデーターから
+    Patterns.<定数名> として参照する（リクエストごとの正規表現コンパイルを避ける）。
+    """
+
+    def __init__(self, package: str):
+        self.package = package
+        self.constants: Dict[str, Dict[str, Any]] = {}  # 正規表現 -> {'name', 'regex', 'usages'}
+        self._names: Dict[str, str] = {}  # 定数名 -> 正規表現
+
+    @property
+    def class_name(self) -> str:
+        """Patternsクラスの完全修飾名"""
+        return f"{self.package}.Patterns"
+
+    @staticmethod
+    def to_constant_name(hint: str) -> str:
+        """フィールド名などから定数名を生成（例: userName -> USER_NAME）"""
+        name = re.sub(r'([a-z0-9])([A-Z])', r'\1_\2', hint)
+        name = re.sub(r'[^0-9A-Za-z]+', '_', name).strip('_').upper() or 'PATTERN'
+        return f"P_{name}" if name[0].isdigit() else name
+
+    def register(self, regex: str, hint: str, usage: str) -> str:
+        """正規表現を登録して定数名を返す（登録済みの正規表現は既存の定数を返す）"""
+        if regex in self.constants:
+            constant = self.constants[regex]
+        else:
+            base_name = self.to_constant_name(hint)
+            name = base_name
+            suffix = 2
+            while name in self._names:
+                name = f"{base_name}_{suffix}"
+                suffix += 1
+            self._names[name] = regex
+            constant = self.constants[regex] = {'name': name, 'regex': regex, 'usages': []}
+        if usage not in constant['usages']:
+            constant['usages'].append(usage)
+        return constant['name']
+
+    def to_template_constants(self):
+        """テンプレート用の定数一覧（Javaの文字列リテラルに変換済み）"""
+        return [
+            {
+                'name': constant['name'],
+                'literal': json.dumps(constant['regex']),
+                'usages': constant['usages']
+            }
+            for constant in sorted(self.constants.values(), key=lambda c: c['name'])
+        ]
+
+
+@dataclass(frozen=True)
+class ParameterDescriptor:
+    """パス・クエリパラメータ（Java型変換済み）"""
+    name: str
+    type: str
+    required: bool = False
+    description: str = ''
+
+
+@dataclass(frozen=True)
+class CacheDescriptor:
+    """GETレスポンスのHTTPキャッシュ設定（x-cache）"""
+    max_age: int
+    scope: str = 'private'  # public（CDN・共有キャッシュ可） / private（ブラウザのみ）
+    must_revalidate: bool = False
+    body_type: str = 'String'  # ResponseEntityで包む前のレスポンス型
+
+    @property
+    def cache_control(self) -> str:
+        """Cache-Controlヘッダーを組み立てるJava式"""
+        if self.max_age <= 0:
+            expression = 'CacheControl.noCache()'
+        else:
+            expression = f"CacheControl.maxAge({self.max_age}, TimeUnit.SECONDS)"
+            expression += '.cachePublic()' if self.scope == 'public' else '.cachePrivate()'
+        if self.must_revalidate:
+            expression += '.mustRevalidate()'
+        return expression
+
+
+@dataclass(frozen=True)
+class EndpointDescriptor:
+    """オペレーション単位の前処理済みエンドポイント情報
+
+    オペレーションごとに1度だけ構築し、Controller・UseCase・メタデータ生成で共有する。
+    parameters / request_body / responses は$ref解決済みのOpenAPI定義（読み取り専用として扱う）。
+    """
+    key: str
+    api_name: str
+    path: str
+    method: str
+    operation_id: str
+    summary: str
+    description: str
+    tags: Tuple[str, ...]
+    response_type: str
+    request_type: Optional[str]
+    path_params: Tuple[ParameterDescriptor, ...]
+    query_params: Tuple[ParameterDescriptor, ...]
+    primary_field: str
+    result_constructor: str
+    parameters: Tuple[Dict[str, Any], ...]
+    request_body: Optional[Dict[str, Any]]
+    responses: Dict[str, Any]
+    list_mode: Optional[str] = None  # 配列レスポンスの返却方式（page / stream、対象外はNone）
+    item_type: Optional[str] = None  # 配列レスポンスの要素型
+    page_size: int = 20
+    cache: Optional[CacheDescriptor] = None  # ETag・Cache-Controlを付与するGET（x-cache）
+
+    @property
+    def spring_method(self) -> str:
+        """Springのマッピングアノテーション名（POST -> Post）"""
+        return self.method.title()
+
+    @property
+    def method_name(self) -> str:
+        return self.operation_id
+
+    @property
+    def request_param(self) -> str:
+        return self.operation_id + 'InDto'
+
+    @property
+    def usecase_class_name(self) -> str:
+        return f"{self.api_name.title()}UseCase"
+
+    @property
+    def usecase_var_name(self) -> str:
+        return f"{self.api_name.lower()}UseCase"
+
+    def to_metadata(self) -> Dict[str, Any]:
+        """spring_metadata.json 用の辞書に変換"""
+        return {
+            'path': self.path,
+            'method': self.method,
+            'operation_id': self.operation_id,
+            'summary': self.summary,
+            'description': self.description,
+            'parameters': list(self.parameters),
+            'request_body': self.request_body,
+            'responses': self.responses,
+            'tags': list(self.tags),
+            'api_name': self.api_name,
+            'response_type': self.response_type,
+            'request_type': self.request_type,
+            'list_mode': self.list_mode,
+            'item_type': self.item_type,
+            'cache': {'max_age': self.cache.max_age, 'scope': self.cache.scope} if self.cache else None
+        }
+
 
 class SpringGenerator:
     """Spring Boot生成クラス - マルチAPI対応"""
@@ -35,28 +226,50 @@ class SpringGenerator:
             self.openapi_files = openapi_files
             
         self.config_path = config_path
+        # パース済みOpenAPI仕様のキャッシュ（SpecCache。main.py・常駐モードが設定し、未設定時は毎回パースする）
+        self.spec_cache = None
         self.project_root = Path(__file__).parent.parent.parent
         self.base_output_dir = self.project_root / "output" / "backend" / "src"
         
         # Jinja2環境の初期化
         template_dir = Path(__file__).parent.parent / "templates" / "spring"
+        self.template_dir = template_dir
         self.jinja_env = Environment(
             loader=FileSystemLoader(str(template_dir)),
             trim_blocks=True,
             lstrip_blocks=True
         )
         
+        # Enum用のJinja2環境（java_enum_generatorと共通のテンプレート。Enumごとに作り直さない）
+        self.java_jinja_env = Environment(
+            loader=FileSystemLoader(str(Path(__file__).parent.parent / "templates" / "java")),
+            trim_blocks=True,
+            lstrip_blocks=True
+        )
+        
         # x-拡張フィールドパーサーの初期化
         self.x_parser = XExtensionParser()
         
+        # 処理中のAPI仕様のスキーマグラフ（$ref・allOf解決用）
+        self.schema_graph = SchemaGraph()
+
+        # パッケージ別の正規表現定数（同じパッケージのAPI間でも重複をまとめる）
+        self.pattern_registries: Dict[str, PatternRegistry] = {}
+        self.pattern_registry: Optional[PatternRegistry] = None
+        # 正規表現を @Pattern アノテーションとしても出力するか（spring.pattern_annotations）
+        self.pattern_annotations = False
+        # 生成物に埋め込む生成日時（generation.include_timestamp が無効な場合はNone）
+        self.generated_at = None
+        
     def load_multiple_openapi_specs(self):
         """複数のOpenAPI仕様ファイルを読み込み"""
         specs = {}
         for api_name, file_path in self.openapi_files.items():
             try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    specs[api_name] = yaml.safe_load(f)
+                with metrics.stage('spring.load_spec', api=api_name):
+                    specs[api_name] = load_openapi_spec(file_path, self.spec_cache)
                     logger.info(f"{api_name} API仕様を読み込みました: {file_path}")
+                metrics.count(SPECS_LOADED)
             except Exception as e:
                 logger.error(f"{api_name} API仕様ファイルの読み込みに失敗: {e}")
                 raise
@@ -99,10 +312,19 @@ class SpringGenerator:
         
     def extract_models_and_paths_for_api(self, api_name, openapi_spec, config):
         """API別にモデルとAPIパスを抽出"""
+        # $ref・allOf解決用のスキーマグラフを構築
+        self.schema_graph = SchemaGraph(openapi_spec)
+
+        # 正規表現定数の登録先（Patternsクラスはパッケージ単位）
+        validation_package = f"{self.get_api_package_name(api_name, config)}.{config.get('spring', {}).get('validation_package', 'validation')}"
+        self.pattern_registry = self.pattern_registries.setdefault(
+            validation_package, PatternRegistry(validation_package)
+        )
+        
         # スキーマからモデルを抽出
         models = {}
         enums = {}
-        schemas = openapi_spec.get('components', {}).get('schemas', {})
+        schemas = self.schema_graph.schemas
 
         for schema_name, schema_def in schemas.items():
             # enum型かどうかを判定（@makeEnumJavaデコレーター必須）
@@ -145,9 +367,9 @@ class SpringGenerator:
             for method, method_def in path_def.items():
                 if method.upper() in ['GET', 'POST', 'PUT', 'DELETE', 'PATCH']:
                     endpoint_key = f"{method.upper()}_{path.replace('/', '_').replace('{', '').replace('}', '')}"
-                    endpoint_data = self.convert_path_to_endpoint(path, method, method_def)
-                    endpoint_data['api_name'] = api_name
-                    endpoints[endpoint_key] = endpoint_data
+                    endpoints[endpoint_key] = self.build_endpoint_descriptor(
+                        endpoint_key, api_name, path, method, method_def, path_def, config
+                    )
 
         return models, endpoints, enums
 
@@ -159,6 +381,9 @@ class SpringGenerator:
 
     def convert_schema_to_model(self, schema_name, schema_def, api_name, config):
         """OpenAPIスキーマをJavaモデルに変換"""
+        metrics.count(SCHEMAS_PROCESSED)
+        # allOfで合成されたスキーマは継承元のプロパティを統合
+        schema_def = self.schema_graph.compose(schema_def)
         properties = schema_def.get('properties', {})
         required = schema_def.get('required', [])
         
@@ -174,7 +399,8 @@ class SpringGenerator:
                 'required': prop_name in required,
                 'description': prop_def.get('description', ''),
                 'validation': validation_info['annotations'],
-                'validation_imports': validation_info['imports']
+                'validation_imports': validation_info['imports'],
+                'pattern_constant': validation_info['pattern_constant']
             }
             fields.append(field)
             all_imports.update(validation_info['imports'])
@@ -189,34 +415,86 @@ class SpringGenerator:
             'description': schema_def.get('description', ''),
             'package': f"{base_package}.{dto_package}",
             'api_name': api_name,
-            'validation_imports': list(all_imports)
+            'validation_imports': sorted(all_imports),
+            'uses_patterns': any(field['pattern_constant'] for field in fields)
         }
         
-    def convert_path_to_endpoint(self, path, method, method_def):
-        """OpenAPIパスをSpringコントローラーメソッドに変換"""
-        return {
-            'path': path,
-            'method': method.upper(),
-            'operation_id': method_def.get('operationId', f"{method}_{path.replace('/', '_')}"),
-            'summary': method_def.get('summary', ''),
-            'description': method_def.get('description', ''),
-            'parameters': method_def.get('parameters', []),
-            'request_body': method_def.get('requestBody'),
-            'responses': method_def.get('responses', {}),
-            'tags': method_def.get('tags', [])
+    def build_endpoint_descriptor(self, endpoint_key, api_name, path, method, method_def, path_def=None, config=None):
+        """OpenAPIオペレーションから前処理済みのエンドポイント情報を構築（パラメータ・リクエスト・レスポンスの$refは解決済み）"""
+        operation_id = method_def.get('operationId', f"{method}_{path.replace('/', '_')}")
+        parameters = tuple(self.schema_graph.operation_parameters(path_def or {}, method_def))
+        request_body = self.schema_graph.resolve(method_def.get('requestBody'))
+        responses = {
+            code: self.schema_graph.resolve(response)
+            for code, response in method_def.get('responses', {}).items()
         }
         
+        # 配列を返すオペレーションはページ分割・ストリーミングに切り替え
+        list_mode, item_type, page_size = self.get_list_response(method_def, responses, config)
+
+        # パラメーターを処理
+        path_params = []
+        query_params = []
+        for param in parameters:
+            if param.get('in') == 'path':
+                path_params.append(ParameterDescriptor(
+                    name=param['name'],
+                    type=self.openapi_type_to_java_type(param.get('schema', {})),
+                    description=param.get('description', '')
+                ))
+            elif param.get('in') == 'query':
+                # ページ番号・件数はPageableで受け取る
+                if list_mode == 'page' and param.get('name') in ('page', 'size', 'sort'):
+                    continue
+                query_params.append(ParameterDescriptor(
+                    name=param['name'],
+                    type=self.openapi_type_to_java_type(param.get('schema', {})),
+                    required=param.get('required', False),
+                    description=param.get('description', '')
+                ))
+                
+        response_type = self.extract_response_type(responses)
+        if list_mode == 'page':
+            response_type = f"Page<{item_type}>"
+        elif list_mode == 'stream':
+            response_type = 'ResponseEntity<StreamingResponseBody>'
+
+        # x-cacheが指定されたGETはETag・Cache-Control付きのResponseEntityで返す
+        cache = self.get_cache_descriptor(method, method_def, list_mode, response_type)
+        if cache:
+            response_type = f"ResponseEntity<{cache.body_type}>"
+        request_type = self.extract_request_type(request_body)
+        
+        return EndpointDescriptor(
+            key=endpoint_key,
+            api_name=api_name,
+            path=path,
+            method=method.upper(),
+            operation_id=operation_id,
+            summary=method_def.get('summary', ''),
+            description=method_def.get('description', ''),
+            tags=tuple(method_def.get('tags', [])),
+            response_type=response_type,
+            request_type=request_type,
+            path_params=tuple(path_params),
+            query_params=tuple(query_params),
+            primary_field=self.get_primary_field_access(operation_id, request_type),
+            result_constructor=self.build_result_constructor(operation_id, request_type, response_type),
+            parameters=parameters,
+            request_body=request_body,
+            responses=responses,
+            list_mode=list_mode,
+            item_type=item_type,
+            page_size=page_size,
+            cache=cache
+        )
+        
     def openapi_type_to_java_type(self, prop_def):
         """OpenAPIの型をJavaの型に変換"""
-        # $refがある場合は参照先の型名を返す
-        if '$ref' in prop_def:
-            return prop_def['$ref'].split('/')[-1]
-
-        # allOfがある場合は最初の$refの型名を返す
-        if 'allOf' in prop_def and len(prop_def['allOf']) > 0:
-            first_item = prop_def['allOf'][0]
-            if '$ref' in first_item:
-                return first_item['$ref'].split('/')[-1]
+        # $ref・allOfの場合は参照先の型名を返す
+        type_name = self.schema_graph.type_name(prop_def)
+        if type_name:
+            return type_name
 
         prop_type = prop_def.get('type')
         prop_format = prop_def.get('format')
@@ -255,10 +533,11 @@ class SpringGenerator:
     def generate_validation_annotations(self, prop_def, is_required, field_name=None, schema_name=None):
         """バリデーションアノテーションを生成（x-拡張フィールド対応版）"""
         # x-拡張フィールドパーサーを使用してバリデーションルールを解析
-        validation_rules = self.x_parser.parse_property_extensions(prop_def, field_name)
+        with metrics.stage('spring.parse_x_extensions'):
+            validation_rules = self.x_parser.parse_property_extensions(prop_def, field_name)
 
-        # Spring Bootアノテーションに変換
-        spring_annotations = self.x_parser.to_spring_boot_annotations(validation_rules)
+            # Spring Bootアノテーションに変換
+            spring_annotations = self.x_parser.to_spring_boot_annotations(validation_rules)
 
         # アノテーション文字列のリストを生成
         annotations = []
@@ -298,80 +577,257 @@ class SpringGenerator:
                 if 'maximum' in prop_def:
                     annotations.append(f"@Max({prop_def['maximum']})")
                     import_statements.add('import javax.validation.constraints.Max;')
+
+        # 正規表現はPatternsクラスの定数を参照（同じ正規表現は定数を共有）
+        pattern_constant = None
+        if prop_def.get('type') == 'string' and prop_def.get('pattern') and self.pattern_registry:
+            # x-unitCheckStringの文字種指定がある場合はバリデーター名（例: ALPHANUMERIC_PATTERN）を定数名にする
+            custom_validators = [
+                ValidationRule(validation_type=ValidationTypeEnum.STRING, value=rule.value).custom_validator
+                for rule in validation_rules
+                if rule.validation_type == ValidationTypeEnum.STRING and rule.value
+            ]
+            pattern_constant = self.pattern_registry.register(
+                prop_def['pattern'],
+                custom_validators[0] if custom_validators else (field_name or 'pattern'),
+                f"{schema_name}.{field_name}" if schema_name else (field_name or '')
+            )
+            # customValidation() はコンパイル済みの定数で検証する。@Pattern はリクエスト時の検証が
+            # 新たに有効になるため、spring.pattern_annotations: true の場合のみ出力する
+            import_statements.add(f'import {self.pattern_registry.class_name};')
+            if self.pattern_annotations:
+                annotations.append(f'@Pattern(regexp = Patterns.{pattern_constant}_REGEX)')
+                import_statements.add('import javax.validation.constraints.Pattern;')
         
+        metrics.count(ANNOTATIONS_BUILT, len(annotations))
         return {
             'annotations': annotations,
-            'imports': list(import_statements)
+            'imports': sorted(import_statements),
+            'pattern_constant': pattern_constant
         }
         
     
         
-    def generate_api_controller(self, api_name, models, endpoints, config, package_name, enums):
+    def generate_api_controller(self, api_name, models, endpoints, config, package_name, enums, controller_name=None):
         """API別Controllerクラスを生成"""
 
         # record内包型テンプレートを使用（全API共通）
         template = self.jinja_env.get_template("controller.java.j2")
-
+        return template.render(
+            **self.build_controller_context(api_name, models, endpoints, config, enums, controller_name)
+        )
+        
+    def build_controller_context(self, api_name, models, endpoints, config, enums, controller_name=None):
+        """Controllerテンプレートの描画データを作成"""
         # テンプレート用データを準備（動的生成）
-        controller_name = f"{api_name.title()}Controller"
+        controller_name = controller_name or f"{api_name.title()}Controller"
 
-        # 動的テンプレート用の前処理済みデータを生成
-        processed_endpoints = self.process_endpoints_for_template(endpoints, models, api_name)
+        # 動的テンプレート用の前処理済みデータを生成（エンドポイントは構築済みのものをそのまま使用）
+        processed_endpoints = list(endpoints.values())
         processed_models = self.process_models_for_template(models)
         processed_enums = list(enums.values()) if enums else []
         processed_usecases = self.process_usecases_for_template(endpoints, api_name)
 
-        return template.render(
-            api_name=api_name,
-            controller_name=controller_name,
-            models=models,
-            endpoints=endpoints,
-            processed_endpoints=processed_endpoints,
-            processed_models=processed_models,
-            processed_enums=processed_enums,
-            processed_usecases=processed_usecases,
-            config=config,
-            generated_at=datetime.now().isoformat()
+        return {
+            'api_name': api_name,
+            'controller_name': controller_name,
+            'processed_endpoints': processed_endpoints,
+            'processed_models': processed_models,
+            'processed_enums': processed_enums,
+            'processed_usecases': processed_usecases,
+            'has_paging': any(endpoint.list_mode == 'page' for endpoint in processed_endpoints),
+            'has_streaming': any(endpoint.list_mode == 'stream' for endpoint in processed_endpoints),
+            'has_caching': any(endpoint.cache for endpoint in processed_endpoints),
+            'patterns_class': self.get_patterns_class(api_name, models, config),
+            'config': config,
+            'generated_at': self.generated_at
+        }
+        
+    def get_patterns_class(self, api_name, models, config):
+        """recordが正規表現定数を参照する場合のPatternsクラスの完全修飾名（参照しない場合はNone）"""
+        # recordは @Pattern アノテーションでのみ参照する
+        if not self.pattern_annotations or not any(model.get('uses_patterns') for model in models.values()):
+            return None
+        validation_package = config.get('spring', {}).get('validation_package', 'validation')
+        return f"{self.get_api_package_name(api_name, config)}.{validation_package}.Patterns"
+
+    def write_patterns_classes(self):
+        """パッケージ別のPatternsクラスを生成（正規表現を含まないパッケージは出力しない）"""
+        template = self.jinja_env.get_template("patterns.java.j2")
+        for package, registry in self.pattern_registries.items():
+            if not registry.constants:
+                continue
+            patterns_dir = self.base_output_dir / "main" / "java" / package.replace('.', '/')
+            patterns_dir.mkdir(parents=True, exist_ok=True)
+            patterns_file = patterns_dir / "Patterns.java"
+            with metrics.stage('spring.render_patterns', package=package):
+                content = template.render(
+                    package_name=package,
+                    constants=registry.to_template_constants(),
+                    generated_at=self.generated_at
+                )
+            metrics.write_file(patterns_file, content, stage='spring.write')
+            logger.info(f"正規表現定数クラスを生成しました: {patterns_file}（{len(registry.constants)}パターン）")
+
+    def get_shard_key(self, endpoint, split_mode):
+        """エンドポイントの分割キーを取得（tag: 先頭タグ / path: パスの先頭セグメント）"""
+        if split_mode == 'tag':
+            return endpoint.tags[0] if endpoint.tags else 'default'
+        
+        # /api/users/{id} -> users
+        segments = [s for s in endpoint.path.strip('/').split('/') if s and not s.startswith('{')]
+        if segments and segments[0] == 'api':
+            segments = segments[1:]
+        return segments[0] if segments else 'root'
+        
+    def to_class_name_part(self, value):
+        """分割キーをクラス名の一部に変換（例: order-items -> OrderItems）"""
+        parts = [part for part in re.split(r'[^0-9A-Za-z]+', value) if part]
+        name = ''.join(part[:1].upper() + part[1:] for part in parts) or 'Default'
+        return f"_{name}" if name[0].isdigit() else name
+        
+    def shard_endpoints(self, api_name, endpoints, config):
+        """エンドポイントをController単位に分割
+
+        Returns:
+            {controller_name: {endpoint_key: EndpointDescriptor}}（分割なしの場合は従来の1Controller）
+        """
+        spring_config = config.get('spring', {})
+        split_mode = spring_config.get('controller_split', 'none')
+        if split_mode not in CONTROLLER_SPLIT_MODES:
+            logger.warning(f"不明なcontroller_split指定のため分割しません: {split_mode}")
+            split_mode = 'none'
+        max_operations = spring_config.get('max_operations_per_controller') or 0
+        
+        groups = {}
+        for endpoint_key, endpoint in endpoints.items():
+            group_name = '' if split_mode == 'none' else self.to_class_name_part(self.get_shard_key(endpoint, split_mode))
+            groups.setdefault(group_name, {})[endpoint_key] = endpoint
+        if not groups:
+            groups[''] = {}
+            
+        shards = {}
+        for group_name, group_endpoints in groups.items():
+            items = list(group_endpoints.items())
+            chunk_size = max_operations if max_operations > 0 else max(len(items), 1)
+            chunks = [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)] or [[]]
+            for number, chunk in enumerate(chunks, start=1):
+                suffix = str(number) if number > 1 else ''
+                shards[f"{api_name.title()}{group_name}{suffix}Controller"] = dict(chunk)
+        return shards
+        
+    def collect_referenced_models(self, endpoints, models, enums):
+        """エンドポイントが参照するrecord・列挙型を推移的に収集"""
+        type_names = set()
+        pending = []
+        for endpoint in endpoints.values():
+            pending.extend([endpoint.response_type, endpoint.request_type or '', endpoint.item_type or ''])
+            pending.extend(param.type for param in endpoint.path_params + endpoint.query_params)
+            
+        while pending:
+            for name in re.findall(r'[A-Za-z_][A-Za-z0-9_]*', pending.pop()):
+                if name in type_names or (name not in models and name not in enums):
+                    continue
+                type_names.add(name)
+                if name in models:
+                    pending.extend(field['type'] for field in models[name]['fields'])
+                    
+        return (
+            {name: model for name, model in models.items() if name in type_names},
+            {name: enum for name, enum in enums.items() if name in type_names}
         )
         
+    def write_controller_shards(self, api_name, shards, models, enums, config, controller_dir):
+        """分割したControllerを出力（複数ある場合はプロセスプールで並列生成）"""
+        jobs = []
+        for controller_name, shard_endpoints in shards.items():
+            # 分割時は各Controllerが参照するrecordのみを内包する
+            if len(shards) > 1:
+                shard_models, shard_enums = self.collect_referenced_models(shard_endpoints, models, enums)
+            else:
+                shard_models, shard_enums = models, enums
+            context = self.build_controller_context(
+                api_name, shard_models, shard_endpoints, config, shard_enums, controller_name
+            )
+            jobs.append((str(self.template_dir), str(controller_dir / f"{controller_name}.java"), context))
+            
+        workers = get_parallel_workers(config.get('spring', {}).get('parallel_workers'))
+        if len(jobs) > 1 and workers > 1:
+            with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as executor:
+                written = list(executor.map(render_controller_file, *zip(*jobs)))
+        else:
+            written = [render_controller_file(*job) for job in jobs]
+            
+        for controller_file, worker_snapshot in written:
+            metrics.merge(worker_snapshot)
+            logger.info(f"Controllerを生成しました: {controller_file}")
+        if len(shards) > 1:
+            logger.info(f"{api_name} API: Controllerを{len(shards)}ファイルに分割しました")
+        
     def generate_dto(self, model_name, model, config):
         """DTOクラスを生成（Jinja2テンプレートファイル使用）"""
         # Jinja2テンプレートファイルを使用
         template = self.jinja_env.get_template("dto.java.j2")
-        return template.render(
-            model=model,
-            generated_at=datetime.now().isoformat()
-        )
+        with metrics.stage('spring.render_dto', model=model_name):
+            return template.render(
+                model=model,
+                generated_at=self.generated_at
+            )
 
     def generate_enum(self, enum_data, package_name, config):
         """Enumクラスを生成（既存のenumテンプレートを使用）"""
-        # Jinja2テンプレートディレクトリをjavaに変更してenumテンプレートを取得
-        java_template_dir = Path(__file__).parent.parent / "templates" / "java"
-        java_env = Environment(
-            loader=FileSystemLoader(str(java_template_dir)),
-            trim_blocks=True,
-            lstrip_blocks=True
-        )
-        template = java_env.get_template("enum.java.j2")
-        return template.render(
-            package_name=f"{package_name}.entity.item",
-            class_name=enum_data['name'],
-            description=enum_data['description'],
-            original_name=enum_data['name'],
-            api_name="generated",
-            enum_values=enum_data['values'],
-            config=config,
-            generated_at=datetime.now().isoformat()
-        )
+        template = self.java_jinja_env.get_template("enum.java.j2")
+        with metrics.stage('spring.render_enum', enum=enum_data['name']):
+            return template.render(
+                package_name=f"{package_name}.entity.item",
+                class_name=enum_data['name'],
+                description=enum_data['description'],
+                original_name=enum_data['name'],
+                api_name="generated",
+                enum_values=enum_data['values'],
+                config=config,
+                generated_at=self.generated_at
+            )
     
-    def collect_controller_metadata(self, api_name, endpoints, package_name, config):
+    def collect_controller_metadata(self, api_name, endpoints, package_name, config, controller_name=None):
         """Controllerのメタデータを収集"""
-        controller_name = f"{api_name.title()}Controller"
+        controller_name = controller_name or f"{api_name.title()}Controller"
         return {
             "api_name": api_name,
             "class_name": controller_name,
             "package": f"{package_name}.{config['spring']['controller_package']}",
-            "endpoints": endpoints  # 実際のエンドポイント情報はextract_models_and_paths_for_apiで取得
+            "endpoints": {key: endpoint.to_metadata() for key, endpoint in endpoints.items()}
+        }
+    
+    def build_controller_manifest_record(self, api_name, endpoints, package_name, config, controller_name=None):
+        """マニフェスト用のControllerレコードを作成（後続ジェネレーターが使う項目のみ）"""
+        controller_name = controller_name or f"{api_name.title()}Controller"
+        return {
+            "api_name": api_name,
+            "class_name": controller_name,
+            "package": f"{package_name}.{config['spring']['controller_package']}",
+            "endpoints": [
+                {
+                    "key": key,
+                    "method": endpoint.method,
+                    "path": endpoint.path,
+                    "operation_id": endpoint.operation_id,
+                    "description": endpoint.description,
+                    "parameters": [
+                        {
+                            "name": param.get('name', 'unknown'),
+                            "type": self.openapi_type_to_java_type(param.get('schema', {})),
+                            "location": param.get('in', 'query'),
+                            "required": param.get('required', False)
+                        }
+                        for param in endpoint.parameters
+                    ],
+                    "request_type": endpoint.request_type,
+                    "response_type": endpoint.response_type,
+                    "list_mode": endpoint.list_mode
+                }
+                for key, endpoint in endpoints.items()
+            ]
         }
     
     def collect_dto_metadata(self, models, package_name, config):
@@ -398,14 +854,44 @@ class SpringGenerator:
         
         return dto_metadata
     
+    def load_previous_controller_files(self, manifest_file):
+        """前回のマニフェストからAPIごとのControllerファイルを取得（{api_name: {ファイルパス}}）"""
+        controller_files = {}
+        if not manifest_file.exists():
+            return controller_files
+        try:
+            for record in iter_manifest(manifest_file):
+                if record.get('kind') == 'controller':
+                    controller_files.setdefault(record['api_name'], set()).add(
+                        self.get_controller_file(record['package'], record['class_name'])
+                    )
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"前回のSpring生成マニフェストを読み込めませんでした: {e}")
+        return controller_files
+        
+    def get_controller_file(self, controller_package, class_name):
+        """Controllerのパッケージ名・クラス名から出力ファイルのパスを取得"""
+        return self.base_output_dir / "main" / "java" / controller_package.replace('.', '/') / f"{class_name}.java"
+        
+    def remove_stale_controllers(self, api_name, previous_files, current_files, controller_dir):
+        """controller_split の変更等で生成されなくなったAPIのControllerファイルを削除
+
+        残すとマッピングが重複してSpringの起動に失敗するため、前回のマニフェストに記録された
+        ファイルと分割なしの既定名（{Api}Controller.java）のうち、今回生成しなかったものを削除する
+        """
+        candidates = set(previous_files) | {controller_dir / f"{api_name.title()}Controller.java"}
+        for stale_file in sorted(candidates - set(current_files)):
+            if stale_file.exists():
+                stale_file.unlink()
+                logger.info(f"生成されなくなったControllerを削除しました: {stale_file}")
+                
     def save_generation_metadata(self, metadata):
         """生成メタデータをJSONファイルに保存"""
         metadata_dir = self.project_root / "output" / "metadata"
         metadata_dir.mkdir(parents=True, exist_ok=True)
         
         metadata_file = metadata_dir / "spring_metadata.json"
-        with open(metadata_file, 'w', encoding='utf-8') as f:
-            json.dump(metadata, f, ensure_ascii=False, indent=2)
+        metrics.write_file(metadata_file, json.dumps(metadata, ensure_ascii=False, indent=2), stage='spring.write')
         
         logger.info(f"Spring生成メタデータを保存しました: {metadata_file}")
         
@@ -416,79 +902,101 @@ class SpringGenerator:
             openapi_specs = self.load_multiple_openapi_specs()
             config = self.load_config()
             
+            self.pattern_registries = {}
+            self.pattern_annotations = config.get('spring', {}).get('pattern_annotations', False)
+            self.generated_at = get_generated_at(config)
+
             # メタデータ収集用
+            full_metadata = config.get('spring', {}).get('full_metadata', True)
             all_metadata = {
-                "generated_at": datetime.now().isoformat(),
+                "generated_at": self.generated_at,
                 "controllers": [],
                 "dtos": []
             }
             
-            # 各APIごとに生成
-            for api_name, openapi_spec in openapi_specs.items():
-                logger.info(f"{api_name} APIのSpring Bootコードを生成中...")
+            # 各APIごとに生成（後続ジェネレーター向けのマニフェストはAPIごとに追記）
+            manifest_file = self.project_root / "output" / "metadata" / MANIFEST_FILE_NAME
+            previous_controller_files = self.load_previous_controller_files(manifest_file)
+            with ManifestWriter(manifest_file, all_metadata["generated_at"]) as manifest:
+                for api_name, openapi_spec in openapi_specs.items():
+                    logger.info(f"{api_name} APIのSpring Bootコードを生成中...")
                 
-                # モデルとエンドポイントを抽出
-                models, endpoints, enums = self.extract_models_and_paths_for_api(api_name, openapi_spec, config)
+                    # モデルとエンドポイントを抽出
+                    with metrics.stage('spring.extract', api=api_name):
+                        models, endpoints, enums = self.extract_models_and_paths_for_api(api_name, openapi_spec, config)
                 
-                if not models:
-                    logger.warning(f"{api_name} API: モデル定義が見つかりませんでした")
-                    continue
+                    if not models:
+                        logger.warning(f"{api_name} API: モデル定義が見つかりませんでした")
+                        continue
                     
-                # API別のパッケージ名と出力ディレクトリを取得
-                package_name = self.get_api_package_name(api_name, config)
-                output_dir = self.get_api_output_dir(api_name, package_name)
-                
-                # 出力ディレクトリを作成
-                output_dir.mkdir(parents=True, exist_ok=True)
+                    # API別のパッケージ名と出力ディレクトリを取得
+                    package_name = self.get_api_package_name(api_name, config)
+                    output_dir = self.get_api_output_dir(api_name, package_name)
                 
-                # Controllerを生成
-                controller_dir = output_dir / config['spring']['controller_package']
-                controller_dir.mkdir(exist_ok=True)
+                    # 出力ディレクトリを作成
+                    output_dir.mkdir(parents=True, exist_ok=True)
                 
-                controller_name = f"{api_name.title()}Controller"
-                controller_content = self.generate_api_controller(api_name, models, endpoints, config, package_name, enums)
-                controller_file = controller_dir / f"{controller_name}.java"
+                    # Controllerを生成（分割時はシャードごとに並列生成）
+                    controller_dir = output_dir / config['spring']['controller_package']
+                    controller_dir.mkdir(exist_ok=True)
                 
-                with open(controller_file, 'w', encoding='utf-8') as f:
-                    f.write(controller_content)
-                logger.info(f"Controllerを生成しました: {controller_file}")
+                    # 設定に応じてタグ・パスプレフィックス・最大オペレーション数で分割
+                    shards = self.shard_endpoints(api_name, endpoints, config)
+                    self.write_controller_shards(api_name, shards, models, enums, config, controller_dir)
+                    self.remove_stale_controllers(
+                        api_name, previous_controller_files.get(api_name, ()),
+                        [controller_dir / f"{controller_name}.java" for controller_name in shards], controller_dir
+                    )
                 
-                # DTOクラスを生成
-                dto_dir = output_dir / config['spring']['dto_package']
-                dto_dir.mkdir(exist_ok=True)
-
-                for model_name, model in models.items():
-                    dto_content = self.generate_dto(model_name, model, config)
-                    dto_file = dto_dir / f"{model_name}.java"
-
-                    with open(dto_file, 'w', encoding='utf-8') as f:
-                        f.write(dto_content)
-                    logger.info(f"DTOを生成しました: {dto_file}")
-
-                # Enumクラスを分離して生成
-                if enums:
-                    entity_dir = self.get_entity_output_dir(api_name, package_name)
-                    entity_dir.mkdir(parents=True, exist_ok=True)
-
-                    for enum_name, enum_data in enums.items():
-                        enum_content = self.generate_enum(enum_data, package_name, config)
-                        enum_file = entity_dir / f"{enum_data['name']}.java"
-
-                        with open(enum_file, 'w', encoding='utf-8') as f:
-                            f.write(enum_content)
-                        logger.info(f"Enumを生成しました: {enum_file}")
+                    # DTOクラスを生成
+                    dto_dir = output_dir / config['spring']['dto_package']
+                    dto_dir.mkdir(exist_ok=True)
+
+                    for model_name, model in models.items():
+                        dto_content = self.generate_dto(model_name, model, config)
+                        dto_file = dto_dir / f"{model_name}.java"
+
+                        metrics.write_file(dto_file, dto_content, stage='spring.write')
+                        logger.info(f"DTOを生成しました: {dto_file}")
+
+                    # Enumクラスを分離して生成
+                    if enums:
+                        entity_dir = self.get_entity_output_dir(api_name, package_name)
+                        entity_dir.mkdir(parents=True, exist_ok=True)
+
+                        for enum_name, enum_data in enums.items():
+                            enum_content = self.generate_enum(enum_data, package_name, config)
+                            enum_file = entity_dir / f"{enum_data['name']}.java"
+
+                            metrics.write_file(enum_file, enum_content, stage='spring.write')
+                            logger.info(f"Enumを生成しました: {enum_file}")
                     
-                # メタデータを収集
-                controller_metadata = self.collect_controller_metadata(api_name, endpoints, package_name, config)
-                dto_metadata = self.collect_dto_metadata(models, package_name, config)
+                    # メタデータを収集
+                    for controller_name, shard_endpoints in shards.items():
+                        manifest.write('controller', self.build_controller_manifest_record(
+                            api_name, shard_endpoints, package_name, config, controller_name
+                        ))
+                        if full_metadata:
+                            all_metadata["controllers"].append(
+                                self.collect_controller_metadata(api_name, shard_endpoints, package_name, config, controller_name)
+                            )
+                    dto_metadata = self.collect_dto_metadata(models, package_name, config)
+                    for dto_info in dto_metadata:
+                        manifest.write('dto', dto_info)
                 
-                all_metadata["controllers"].append(controller_metadata)
-                all_metadata["dtos"].extend(dto_metadata)
+                    if full_metadata:
+                        all_metadata["dtos"].extend(dto_metadata)
                 
-                logger.info(f"{api_name} API生成完了: {len(models)}モデル, {len(endpoints)}エンドポイント")
+                    logger.info(f"{api_name} API生成完了: {len(models)}モデル, {len(endpoints)}エンドポイント")
+            
+            logger.info(f"Spring生成マニフェストを保存しました: {manifest_file}（{manifest.count}レコード）")
+
+            # 全APIのDTO・recordで使用した正規表現の定数クラスを生成
+            self.write_patterns_classes()
             
-            # メタデータを保存
-            self.save_generation_metadata(all_metadata)
+            # メタデータを保存（詳細メタデータは spring.full_metadata: false で省略可能）
+            if full_metadata:
+                self.save_generation_metadata(all_metadata)
             logger.info("Spring Boot生成完了")
                 
         except Exception as e:
@@ -542,49 +1050,6 @@ class SpringGenerator:
             }
         }
     
-    def process_endpoints_for_template(self, endpoints, models, api_name):
-        """エンドポイントをテンプレート用に前処理"""
-        processed = []
-        
-        for endpoint_key, endpoint in endpoints.items():
-            operation_id = endpoint['operation_id']
-
-            # パラメーターを処理
-            path_params = []
-            query_params = []
-            for param in endpoint.get('parameters', []):
-                if param.get('in') == 'path':
-                    path_params.append({
-                        'name': param['name'],
-                        'type': self.openapi_type_to_java_type(param.get('schema', {})),
-                        'description': param.get('description', '')
-                    })
-                elif param.get('in') == 'query':
-                    query_params.append({
-                        'name': param['name'],
-                        'type': self.openapi_type_to_java_type(param.get('schema', {})),
-                        'required': param.get('required', False),
-                        'description': param.get('description', '')
-                    })
-
-            processed_endpoint = {
-                'path': endpoint['path'],
-                'spring_method': endpoint['method'].title(),  # POST -> Post
-                'method_name': operation_id,
-                'response_type': self.extract_response_type(endpoint.get('responses', {})),
-                'request_type': self.extract_request_type(endpoint.get('request_body')),
-                'request_param': operation_id + 'InDto',
-                'path_params': path_params,
-                'query_params': query_params,
-                'usecase_class_name': f"{api_name.title()}UseCase",
-                'usecase_var_name': f"{api_name.lower()}UseCase",
-                'primary_field': self.get_primary_field_access(endpoint, models),
-                'result_constructor': self.build_result_constructor(endpoint, models)
-            }
-            processed.append(processed_endpoint)
-            
-        return processed
-    
     def process_models_for_template(self, models):
         """モデルをテンプレート用に前処理"""
         processed = []
@@ -637,8 +1102,8 @@ class SpringGenerator:
         processed_usecases = []
         unique_usecases = set()
 
-        for endpoint_key, endpoint in endpoints.items():
-            operation_id = endpoint['operation_id']
+        for endpoint in endpoints.values():
+            operation_id = endpoint.operation_id
 
             # API名からユースケース名を生成
             usecase_name = f"{api_name.title()}UseCase"
@@ -658,45 +1123,82 @@ class SpringGenerator:
     def extract_response_type(self, responses):
         """レスポンス型を抽出"""
         if '200' in responses:
-            response = responses['200']
-            if 'content' in response and 'application/json' in response['content']:
-                schema = response['content']['application/json'].get('schema', {})
-                if '$ref' in schema:
-                    return schema['$ref'].split('/')[-1]
+            type_name = self.schema_graph.type_name(self.schema_graph.json_schema(responses['200']))
+            if type_name:
+                return type_name
         return 'ResponseEntity<String>'
     
+    def get_list_response(self, method_def, responses, config=None):
+        """配列レスポンスの返却方式・要素型・既定ページサイズを取得
+
+        x-listResponse（@listResponseデコレーター）の指定を優先し、
+        未指定の場合は list_endpoints.mode の設定を配列を返す全オペレーションに適用する。
+        """
+        list_config = (config or {}).get('list_endpoints', {})
+        extension = method_def.get('x-listResponse') or {}
+        mode = extension.get('mode') or list_config.get('mode', 'none')
+        page_size = extension.get('pageSize') or list_config.get('page_size', 20)
+        if mode not in LIST_RESPONSE_MODES:
+            logger.warning(f"未対応の配列レスポンス方式です（none として扱います）: {mode}")
+            mode = 'none'
+
+        schema = self.schema_graph.json_schema(responses['200']) if '200' in responses else None
+        items = self.schema_graph.compose(schema).get('items') if schema else None
+        if items is None:
+            if extension:
+                logger.warning(f"x-listResponseが指定されていますが、200レスポンスが配列ではありません: {method_def.get('operationId')}")
+            return None, None, page_size
+        if mode == 'none':
+            return None, None, page_size
+
+        item_type = self.schema_graph.type_name(items) or self.openapi_type_to_java_type(items)
+        return mode, item_type, page_size
+
+    def get_cache_descriptor(self, method, method_def, list_mode, response_type):
+        """x-cache（@cacheableデコレーター）からHTTPキャッシュ設定を作成（GET以外・ストリーミングは対象外）"""
+        extension = method_def.get('x-cache')
+        if not extension:
+            return None
+        operation_id = method_def.get('operationId', '')
+        if method.upper() != 'GET' or list_mode == 'stream':
+            logger.warning(f"x-cacheはストリーミング以外のGETのみ対応しています（無視します）: {operation_id}")
+            return None
+        if not isinstance(extension, dict):
+            extension = {}
+
+        body_type = response_type
+        if body_type.startswith('ResponseEntity<'):
+            body_type = body_type[len('ResponseEntity<'):-1]
+        return CacheDescriptor(
+            max_age=int(extension.get('maxAge', 60)),
+            scope=extension.get('scope', 'private'),
+            must_revalidate=bool(extension.get('mustRevalidate', False)),
+            body_type=body_type
+        )
+
     def extract_request_type(self, request_body):
         """リクエスト型を抽出"""
         if not request_body:
             return None
             
-        if 'content' in request_body and 'application/json' in request_body['content']:
-            schema = request_body['content']['application/json'].get('schema', {})
-            if '$ref' in schema:
-                return schema['$ref'].split('/')[-1]
-        return None
+        return self.schema_graph.type_name(self.schema_graph.json_schema(request_body))
     
-    def get_primary_field_access(self, endpoint, models):
+    def get_primary_field_access(self, operation_id, request_type):
         """主要フィールドのアクセス方法を生成（DTOオブジェクト全体を渡す）"""
-        request_body = endpoint.get('request_body')
-        request_type = self.extract_request_type(request_body)
         if not request_type:
             return "null"
         
         # DTOオブジェクト全体を渡すため、パラメーター名を返す
         # operation_idから動的に変数名を生成
-        param_name = endpoint['operation_id'] + 'InDto'
+        param_name = operation_id + 'InDto'
         return param_name
     
-    def build_result_constructor(self, endpoint, models):
+    def build_result_constructor(self, operation_id, request_type, response_type):
         """結果オブジェクトのコンストラクタを生成"""
-        response_type = self.extract_response_type(endpoint.get('responses', {}))
-        request_type = self.extract_request_type(endpoint.get('request_body'))
-        
         if not request_type or not response_type:
             return 'null'
         
-        param_name = endpoint['operation_id'] + 'Request'
+        param_name = operation_id + 'Request'
         
         # 簡単な例（実際は型の構造に基づいて生成する必要がある）
         return f"""new {response_type}(
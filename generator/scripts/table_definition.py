@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+テーブル定義モデル
+CSVGeneratorが生成し、DDLGeneratorが消費するテーブル定義の共通データ構造
+"""
+
+import csv
+import json
+import logging
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+# table_definitions.csv のヘッダー
+CSV_HEADER = [
+    'api_name', 'table_name', 'column_name', 'data_type', 'nullable',
+    'primary_key', 'unique', 'default_value', 'description', 'references', 'table_options'
+]
+
+# テーブルオプションのキー（TableDefinition.options）
+#   partition_key / partition_interval / partition_precreate / partition_start
+#   fillfactor / unlogged
+
+
+@dataclass
+class ColumnDefinition:
+    """カラム定義"""
+    name: str
+    data_type: str
+    nullable: bool = True
+    primary_key: bool = False
+    unique: bool = False
+    default: Optional[str] = None
+    description: str = ''
+    references: Optional[str] = None  # 外部キー参照先テーブル名（参照先の主キーidを参照）
+
+    def to_csv_row(self, api_name: str, table_name: str) -> List[str]:
+        """CSV行に変換"""
+        return [
+            api_name,
+            table_name,
+            self.name,
+            self.data_type,
+            'true' if self.nullable else 'false',
+            'true' if self.primary_key else 'false',
+            'true' if self.unique else 'false',
+            self.default or '',
+            self.description,
+            self.references or ''
+        ]
+
+
+@dataclass
+class TableDefinition:
+    """テーブル定義"""
+    name: str
+    api_name: str = ''
+    model_name: Optional[str] = None
+    columns: List[ColumnDefinition] = field(default_factory=list)
+    options: Dict[str, Any] = field(default_factory=dict)  # パーティション・fillfactor等のテーブルオプション
+
+    def to_csv_rows(self) -> List[List[str]]:
+        """テーブルの全カラムをCSV行に変換（テーブルオプションは各行にJSONで付与）"""
+        options = json.dumps(self.options, ensure_ascii=False, sort_keys=True) if self.options else ''
+        return [column.to_csv_row(self.api_name, self.name) + [options] for column in self.columns]
+
+    @property
+    def partition_key(self) -> Optional[str]:
+        """レンジパーティションのキーカラム（パーティションなしの場合はNone）"""
+        return self.options.get('partition_key')
+
+    def get_column(self, column_name: str) -> Optional[ColumnDefinition]:
+        """カラム名からカラム定義を取得"""
+        for column in self.columns:
+            if column.name == column_name:
+                return column
+        return None
+
+    @property
+    def dependencies(self) -> List[str]:
+        """外部キーで参照しているテーブル名（自己参照を除く）"""
+        return [c.references for c in self.columns if c.references and c.references != self.name]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON保存用の辞書に変換"""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'TableDefinition':
+        """to_dict()で保存した辞書から復元"""
+        columns = [ColumnDefinition(**column) for column in data.get('columns', [])]
+        return cls(
+            name=data['name'],
+            api_name=data.get('api_name', ''),
+            model_name=data.get('model_name'),
+            columns=columns,
+            options=data.get('options', {})
+        )
+
+
+@dataclass
+class IndexDefinition:
+    """インデックス定義"""
+    name: str
+    table: str
+    columns: List[str]
+    unique: bool = False
+    method: Optional[str] = None  # btree / hash / gin / gist / brin
+    include: List[str] = field(default_factory=list)  # INCLUDE句のカラム（カバリングインデックス）
+    where: Optional[str] = None  # 部分インデックスの条件式
+    concurrently: bool = False
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON保存用の辞書に変換"""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'IndexDefinition':
+        """to_dict()で保存した辞書から復元"""
+        return cls(**data)
+
+
+def table_definitions_to_csv_rows(tables: Dict[str, TableDefinition]) -> List[List[str]]:
+    """テーブル定義をヘッダー付きのCSV行リストに変換"""
+    rows = [list(CSV_HEADER)]
+    for table in tables.values():
+        rows.extend(table.to_csv_rows())
+    return rows
+
+
+def load_table_definitions_from_csv(csv_path: Union[str, Path]) -> Dict[str, TableDefinition]:
+    """table_definitions.csv からテーブル定義を読み込み（CSVのみが手元にある場合用）"""
+    tables: Dict[str, TableDefinition] = {}
+    with open(csv_path, 'r', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+
+        for row in reader:
+            table_name = row['table_name']
+
+            # テーブルが未登録の場合は初期化
+            if table_name not in tables:
+                tables[table_name] = TableDefinition(
+                    name=table_name,
+                    api_name=row.get('api_name', ''),
+                    options=json.loads(row['table_options']) if row.get('table_options') else {}
+                )
+
+            tables[table_name].columns.append(ColumnDefinition(
+                name=row['column_name'],
+                data_type=row['data_type'],
+                nullable=row['nullable'].lower() == 'true',
+                primary_key=row['primary_key'].lower() == 'true',
+                unique=row['unique'].lower() == 'true',
+                default=row['default_value'] or None,
+                description=row.get('description', ''),
+                references=row.get('references') or None
+            ))
+
+    return tables
+
+
+def sort_tables_by_dependency(tables: Dict[str, TableDefinition]) -> List[str]:
+    """外部キーの参照先が先に来るようにテーブル名を並べ替え
+
+    循環参照がある場合は、解決できなかったテーブルを元の順序のまま末尾に追加する。
+    """
+    ordered: List[str] = []
+    remaining = list(tables.keys())
+
+    while remaining:
+        ready = [
+            name for name in remaining
+            if all(dep in ordered or dep not in tables for dep in tables[name].dependencies)
+        ]
+        if not ready:
+            logger.warning(f"テーブル間に循環参照があります: {', '.join(remaining)}")
+            ordered.extend(remaining)
+            break
+        ordered.extend(ready)
+        remaining = [name for name in remaining if name not in ready]
+
+    return ordered
@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+"""
+常駐生成デーモン - main.py watch
+OpenAPI仕様（output/openapi）・テンプレート（generator/templates）・設定ファイルの変更を監視し、
+影響する生成対象・APIのみを再生成する。ジェネレーター・コンパイル済みテンプレート・パース済み仕様は
+プロセス内に保持するため、再生成ごとのインタープリター起動・import・テンプレートのコンパイルが不要になる。
+
+エディター連携用に Unix ソケット（1接続1コマンド、1行のJSON）で再生成・状態取得・停止を受け付ける:
+    {"command": "regenerate", "targets": ["spring"], "apis": ["user"]}
+    {"command": "status"}
+    {"command": "stop"}
+"""
+
+import os
+import json
+import time
+import socket
+import select
+import signal
+import logging
+import yaml
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from .artifact_store import record_generation
+from .instrumentation import metrics
+from .spec_cache import SpecCache
+
+logger = logging.getLogger(__name__)
+
+# 生成順（main.py と同じ。後続の対象は前の対象の出力を使用する）
+TARGET_ORDER = ('csv', 'ddl', 'spring', 'angular', 'java-enum', 'junit-test', 'jmh')
+
+# --target all で常駐させる対象（main.py と同じく jmh は含めない）
+ALL_TARGETS = ('csv', 'ddl', 'spring', 'angular', 'java-enum', 'junit-test')
+
+# OpenAPI仕様を読み込む対象
+SPEC_TARGETS = ('csv', 'spring', 'angular', 'java-enum', 'jmh')
+
+# 前の対象の出力を入力とする対象（csv -> テーブル定義 -> ddl / spring -> マニフェスト -> junit-test）
+DOWNSTREAM_TARGETS = {
+    'csv': ('ddl',),
+    'spring': ('junit-test',)
+}
+
+# API単位で出力が独立している対象（変更されたAPIのみ再生成する）
+# それ以外の対象はAPI横断の出力（CSV・マニフェスト・共有モデル・Patternsクラス）を持つため、
+# パース済み仕様を再利用して全APIを再生成する
+API_SCOPED_TARGETS = ('java-enum', 'jmh')
+
+# テンプレートディレクトリ -> 使用する対象
+TEMPLATE_TARGETS = {
+    'angular': ('angular',),
+    'ddl': ('ddl',),
+    'java': ('spring', 'java-enum'),
+    'jmh': ('jmh',),
+    'junit': ('junit-test',),
+    'spring': ('spring',)
+}
+
+# 変更検出の既定値（秒）
+DEFAULT_POLL_INTERVAL = 0.2
+DEFAULT_DEBOUNCE = 0.1
+
+# ソケットから受け付けるコマンドの最大長（バイト）
+MAX_COMMAND_BYTES = 64 * 1024
+
+
+def expand_targets(target: str) -> List[str]:
+    """--target の値を常駐させる対象のリストに展開"""
+    return list(ALL_TARGETS) if target == 'all' else [target]
+
+
+class GeneratorDaemon:
+    """ジェネレーターを常駐させ、変更に応じて再生成するデーモン"""
+
+    def __init__(self, input_path, config_path, targets: Iterable[str], socket_path=None,
+                 poll_interval: float = DEFAULT_POLL_INTERVAL, debounce: float = DEFAULT_DEBOUNCE):
+        self.input_path = Path(input_path)
+        self.config_path = config_path
+        self.targets = [target for target in TARGET_ORDER if target in set(targets)]
+        self.socket_path = Path(socket_path) if socket_path else None
+        self.poll_interval = poll_interval
+        self.debounce = debounce
+        self.template_root = (Path(__file__).parent.parent / "templates").resolve()
+
+        # 再生成間で保持する状態
+        self.spec_cache = SpecCache()
+        self.generators: Dict[str, Any] = {}
+        self.table_definitions = None
+        self.last_result: Optional[Dict[str, Any]] = None
+        self.running = False
+        # 再生成ごとに生成物の履歴を記録するか（複数回の再生成をまとめて記録する呼び出し元は無効にする）
+        self.record_artifacts = True
+
+    def discover_openapi_files(self) -> Dict[str, str]:
+        """監視対象のOpenAPI仕様ファイル（main.py の discover_openapi_files と同じ規則）"""
+        if self.input_path.is_file():
+            api_name = self.input_path.stem
+            return {'main' if api_name == 'openapi' else api_name: str(self.input_path)}
+        if not self.input_path.is_dir():
+            return {}
+        yaml_files = sorted(list(self.input_path.glob("*.yaml")) + list(self.input_path.glob("*.yml")))
+        return {yaml_file.stem: str(yaml_file) for yaml_file in yaml_files}
+
+    def snapshot(self) -> Dict[str, Tuple[int, int]]:
+        """監視対象ファイルの署名（更新時刻・サイズ）"""
+        paths = [Path(file_path) for file_path in self.discover_openapi_files().values()]
+        if self.template_root.is_dir():
+            paths.extend(path for path in self.template_root.rglob('*') if path.is_file())
+        if self.config_path:
+            paths.append(Path(self.config_path))
+
+        signatures = {}
+        for path in paths:
+            try:
+                signatures[str(path.resolve())] = SpecCache.get_signature(path)
+            except OSError:
+                # 監視中に削除されたファイルは次回のスナップショットで削除として扱う
+                continue
+        return signatures
+
+    def plan(self, changed_paths: Iterable[str]) -> Tuple[List[str], Optional[Set[str]]]:
+        """変更されたファイルから再生成する対象とAPIを決定
+
+        Returns:
+            (対象のリスト, API名の集合): API名がNoneの場合は全API
+        """
+        spec_paths = {str(Path(path).resolve()): api_name for api_name, path in self.discover_openapi_files().items()}
+        config_path = str(Path(self.config_path).resolve()) if self.config_path else None
+        targets: Set[str] = set()
+        apis: Set[str] = set()
+        all_apis = False
+
+        for changed in changed_paths:
+            changed_path = Path(changed)
+            if changed == config_path:
+                targets.update(self.targets)
+                all_apis = True
+            elif changed_path.is_relative_to(self.template_root):
+                template_dir = changed_path.relative_to(self.template_root).parts[0]
+                template_targets = set(TEMPLATE_TARGETS.get(template_dir, ()))
+                targets.update(template_targets)
+                # テンプレートを使用するAPI単位の対象は全APIを再生成
+                all_apis = all_apis or bool(template_targets & set(API_SCOPED_TARGETS))
+            else:
+                # 追加・変更・削除された仕様（削除時は対象のAPIが特定できないため全APIで再生成）
+                self.spec_cache.invalidate(changed)
+                targets.update(SPEC_TARGETS)
+                if changed in spec_paths:
+                    apis.add(spec_paths[changed])
+                else:
+                    all_apis = True
+
+        for target in list(targets):
+            targets.update(DOWNSTREAM_TARGETS.get(target, ()))
+        return [target for target in self.targets if target in targets], None if all_apis or not apis else apis
+
+    def get_generator(self, target: str, openapi_files: Dict[str, str]):
+        """対象のジェネレーターを取得（初回のみ生成し、以降はテンプレート環境・キャッシュごと再利用）"""
+        generator = self.generators.get(target)
+        if generator is None:
+            # main.py と同じく対象のジェネレーターのみ読み込む
+            if target == 'csv':
+                from .csv_generator import CSVGenerator
+                generator = CSVGenerator(openapi_files, self.config_path)
+            elif target == 'ddl':
+                from .ddl_generator import DDLGenerator
+                generator = DDLGenerator(config_path=self.config_path)
+            elif target == 'spring':
+                from .spring_generator import SpringGenerator
+                generator = SpringGenerator(openapi_files, self.config_path)
+            elif target == 'angular':
+                from .angular_generator import AngularGenerator
+                generator = AngularGenerator(openapi_files, self.config_path)
+            elif target == 'java-enum':
+                from .java_enum_generator import JavaEnumGenerator
+                generator = JavaEnumGenerator(openapi_files, self.config_path)
+            elif target == 'junit-test':
+                from .junit_test_generator import JunitTestGenerator
+                generator = JunitTestGenerator(self.config_path)
+            elif target == 'jmh':
+                from .jmh_benchmark_generator import JmhBenchmarkGenerator
+                generator = JmhBenchmarkGenerator(openapi_files, self.config_path)
+            else:
+                raise ValueError(f"常駐モードで未対応の生成対象です: {target}")
+            if hasattr(generator, 'spec_cache'):
+                generator.spec_cache = self.spec_cache
+            self.generators[target] = generator
+
+        # 仕様ファイルの追加・削除を反映
+        if hasattr(generator, 'openapi_files'):
+            generator.openapi_files = openapi_files
+        return generator
+
+    def regenerate(self, targets: Optional[Iterable[str]] = None, apis: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """指定された対象を再生成（API単位の対象は apis のみ、それ以外は全API）"""
+        started = time.perf_counter()
+        targets = self.targets if targets is None else [target for target in self.targets if target in set(targets)]
+        apis = None if apis is None else set(apis)
+        openapi_files = self.discover_openapi_files()
+        metrics.reset()
+
+        generated = []
+        errors = {}
+        for index, target in enumerate(targets):
+            files = openapi_files
+            if apis is not None and target in API_SCOPED_TARGETS:
+                files = {api_name: path for api_name, path in openapi_files.items() if api_name in apis}
+                if not files:
+                    continue
+            if target in SPEC_TARGETS and not files:
+                logger.warning(f"OpenAPI仕様ファイルが見つかりません: {self.input_path}")
+                continue
+            # 進捗通知（metrics.set_progress で受け取り先を設定した場合のみ送られる）
+            target_started = time.perf_counter()
+            metrics.notify('stage', target=target, state='started', index=index, total=len(targets))
+            try:
+                generator = self.get_generator(target, files)
+                if target == 'csv':
+                    self.table_definitions = generator.generate()
+                elif target == 'ddl':
+                    # 同じデーモン内で生成したテーブル定義を使用（未生成時はCSVから読み込む）
+                    generator.table_definitions = self.table_definitions
+                    generator.generate()
+                else:
+                    generator.generate()
+                generated.append(target)
+            except Exception as e:
+                # 1つの対象の失敗でデーモンを止めない（後続の対象は前回の出力で生成する）
+                logger.error(f"{target} の再生成でエラーが発生しました: {e}")
+                errors[target] = str(e)
+            metrics.report_progress(force=True)
+            metrics.notify(
+                'stage',
+                target=target,
+                state='failed' if target in errors else 'finished',
+                index=index,
+                total=len(targets),
+                elapsed_ms=round((time.perf_counter() - target_started) * 1000, 3)
+            )
+
+        if generated and self.record_artifacts:
+            self.record_artifacts_run(generated)
+
+        elapsed_ms = round((time.perf_counter() - started) * 1000, 3)
+        self.last_result = {
+            'ok': not errors,
+            'targets': generated,
+            'apis': sorted(apis) if apis is not None else 'all',
+            'elapsed_ms': elapsed_ms,
+            'errors': errors,
+            'counters': metrics.to_stats()['counters']
+        }
+        logger.info(
+            f"再生成完了: 対象={','.join(generated) or 'なし'} API={self.last_result['apis']} "
+            f"{elapsed_ms:.0f}ms（エラー{len(errors)}件）"
+        )
+        return self.last_result
+
+    def record_artifacts_run(self, targets: Iterable[str]) -> Optional[Dict[str, Any]]:
+        """生成物の履歴を記録（設定ファイルは変更を反映するため毎回読み込む）"""
+        config = {}
+        if self.config_path and Path(self.config_path).exists():
+            with open(self.config_path, 'r', encoding='utf-8') as f:
+                config = yaml.safe_load(f) or {}
+        return record_generation(Path(__file__).parent.parent.parent, config, targets)
+
+    def handle_command(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """ソケットから受け付けたコマンドを実行"""
+        command = request.get('command')
+        if command == 'regenerate':
+            targets = request.get('targets')
+            unknown = [target for target in targets or () if target not in self.targets]
+            if unknown:
+                return {'ok': False, 'error': f"常駐していない生成対象です: {', '.join(unknown)}（常駐中: {', '.join(self.targets)}）"}
+            return self.regenerate(targets, request.get('apis'))
+        if command == 'status':
+            return {
+                'ok': True,
+                'pid': os.getpid(),
+                'targets': self.targets,
+                'apis': sorted(self.discover_openapi_files()),
+                'warm_generators': sorted(self.generators),
+                'last_result': self.last_result
+            }
+        if command == 'stop':
+            self.stop()
+            return {'ok': True}
+        return {'ok': False, 'error': f"未対応のコマンドです: {command}（regenerate / status / stop）"}
+
+    def open_socket(self) -> Optional[socket.socket]:
+        """制御用のUnixソケットを作成（同じユーザーのみ接続可能）"""
+        if not self.socket_path:
+            return None
+        if not hasattr(socket, 'AF_UNIX'):
+            logger.warning("このプラットフォームはUnixソケットに対応していないため、制御インターフェースは無効です")
+            return None
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        if self.socket_path.exists():
+            # 前回異常終了したデーモンのソケットファイル
+            self.socket_path.unlink()
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(str(self.socket_path))
+        os.chmod(self.socket_path, 0o600)
+        server.listen()
+        logger.info(f"制御ソケットで待ち受けています: {self.socket_path}")
+        return server
+
+    def serve_client(self, server: socket.socket) -> None:
+        """1接続分のコマンドを受け付けて結果を返す"""
+        connection, _ = server.accept()
+        with connection:
+            connection.settimeout(5)
+            data = b''
+            try:
+                while b'\n' not in data and len(data) < MAX_COMMAND_BYTES:
+                    chunk = connection.recv(4096)
+                    if not chunk:
+                        break
+                    data += chunk
+                request = json.loads(data.decode('utf-8') or '{}')
+                response = self.handle_command(request if isinstance(request, dict) else {})
+            except (OSError, ValueError) as e:
+                response = {'ok': False, 'error': f"コマンドを読み取れませんでした: {e}"}
+            try:
+                connection.sendall((json.dumps(response, ensure_ascii=False) + '\n').encode('utf-8'))
+            except OSError:
+                # 応答を待たずに切断したクライアント
+                pass
+
+    def wait(self, server: Optional[socket.socket], timeout: float) -> None:
+        """ソケットのコマンドを処理しながら指定時間待機"""
+        if server is None:
+            time.sleep(timeout)
+            return
+        readable, _, _ = select.select([server], [], [], timeout)
+        if readable:
+            self.serve_client(server)
+
+    def stop(self, *_args) -> None:
+        """監視を終了（実行中の再生成は完了させる）"""
+        self.running = False
+
+    def run(self) -> int:
+        """初回の全生成を行い、停止（Ctrl+C / SIGTERM / stop コマンド）まで変更を監視"""
+        if not self.targets:
+            logger.error("常駐させる生成対象がありません")
+            return 1
+
+        logger.info(f"常駐モードを開始します: 対象={','.join(self.targets)} 入力={self.input_path}")
+        # 初回の全生成でジェネレーター・テンプレート・仕様のキャッシュを作成
+        self.regenerate()
+
+        server = self.open_socket()
+        self.running = True
+        # docker compose stop 等のSIGTERMでもソケットファイルを削除して終了する
+        signal.signal(signal.SIGTERM, self.stop)
+        previous = self.snapshot()
+        try:
+            while self.running:
+                self.wait(server, self.poll_interval)
+                current = self.snapshot()
+                if current == previous:
+                    continue
+
+                # TypeSpecコンパイル等で複数ファイルが書き換わるため、変更が落ち着くまで待つ
+                while True:
+                    time.sleep(self.debounce)
+                    settled = self.snapshot()
+                    if settled == current:
+                        break
+                    current = settled
+
+                changed = {path for path in previous.keys() | current.keys() if previous.get(path) != current.get(path)}
+                previous = current
+                targets, apis = self.plan(changed)
+                logger.info(f"変更を検出しました: {', '.join(sorted(Path(path).name for path in changed))}")
+                if targets:
+                    self.regenerate(targets, apis)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if server is not None:
+                server.close()
+                if self.socket_path.exists():
+                    self.socket_path.unlink()
+        logger.info("常駐モードを終了しました")
+        return 0
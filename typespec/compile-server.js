@@ -0,0 +1,77 @@
+/**
+ * TypeSpecコンパイルサーバー（web-serviceのコンパイルジョブ用）
+ *
+ * POST /compile/{apiName} で npm run compile --workspace=@typespec-gen/{apiName}-api を実行し、
+ * 出力をそのまま返す（最終行に終了コードの行 "__TYPESPEC_COMPILE_EXIT__ <code>" を付与）。
+ * Composeの内部ネットワークでのみ待ち受ける（ポートは公開しない）
+ */
+const http = require('http');
+const { spawn } = require('child_process');
+
+const PORT = Number(process.env.COMPILE_SERVER_PORT || 3000);
+
+// API名の形式（web-serviceの API_NAME_PATTERN と同じ。コマンド引数に使用するため厳密に検証）
+const API_NAME_PATTERN = /^[a-z][a-z0-9-]*$/;
+
+// 終了コードを通知する行の接頭辞
+const EXIT_MARKER = '__TYPESPEC_COMPILE_EXIT__';
+
+function sendText(res, status, message) {
+  res.writeHead(status, { 'Content-Type': 'text/plain; charset=utf-8' });
+  res.end(`${message}\n`);
+}
+
+const server = http.createServer((req, res) => {
+  const match = /^\/compile\/([^/?]+)$/.exec(req.url);
+  if (!match) {
+    sendText(res, 404, 'Not Found');
+    return;
+  }
+  if (req.method !== 'POST') {
+    sendText(res, 405, 'Method Not Allowed');
+    return;
+  }
+  const apiName = match[1];
+  if (!API_NAME_PATTERN.test(apiName)) {
+    sendText(res, 400, `API名が不正です: ${apiName}`);
+    return;
+  }
+
+  console.log(`コンパイルを開始します: ${apiName}`);
+  res.writeHead(200, { 'Content-Type': 'text/plain; charset=utf-8' });
+  // npm から起動される tsp 等もまとめて停止できるようにプロセスグループを分ける
+  const child = spawn('npm', ['run', 'compile', `--workspace=@typespec-gen/${apiName}-api`], {
+    cwd: __dirname,
+    detached: true
+  });
+  let finished = false;
+  const finish = (code) => {
+    if (finished) return;
+    finished = true;
+    console.log(`コンパイルが終了しました: ${apiName}（終了コード ${code}）`);
+    res.end(`\n${EXIT_MARKER} ${code}\n`);
+  };
+
+  child.stdout.pipe(res, { end: false });
+  child.stderr.pipe(res, { end: false });
+  child.on('error', (error) => {
+    res.write(`${error.message}\n`);
+    finish(127);
+  });
+  child.on('close', (code) => finish(code === null ? 1 : code));
+
+  // 呼び出し元が切断した場合（タイムアウト等）はコンパイルを停止する
+  res.on('close', () => {
+    if (!finished && child.pid) {
+      try {
+        process.kill(-child.pid, 'SIGKILL');
+      } catch (error) {
+        // 既に終了している
+      }
+    }
+  });
+});
+
+server.listen(PORT, () => {
+  console.log(`TypeSpecコンパイルサーバーを起動しました: ポート ${PORT}`);
+});
@@ -8,6 +8,7 @@ import {
   Enum,
   Model,
   ModelProperty,
+  Operation,
 } from "@typespec/compiler";
 import { setExtension } from "@typespec/openapi";
 
@@ -25,6 +26,28 @@ export function $tableName(ctx: DecoratorContext, target: Model, name: string) {
   setExtension(ctx.program, target, "x-tableName", name);
 }
 
+export function $partitionBy(
+  ctx: DecoratorContext,
+  target: Model,
+  column: string,
+  interval?: string,
+  precreate?: number
+) {
+  setExtension(ctx.program, target, "x-partitionBy", {
+    column,
+    interval: interval ?? "month",
+    precreate: precreate ?? 3,
+  });
+}
+
+export function $fillfactor(ctx: DecoratorContext, target: Model, value: number) {
+  setExtension(ctx.program, target, "x-fillfactor", value);
+}
+
+export function $unlogged(ctx: DecoratorContext, target: Model) {
+  setExtension(ctx.program, target, "x-unlogged", true);
+}
+
 // ===== プロパティ系 =====
 // pk と unique は標準デコレータとの衝突のためコメントアウト
 // export function $pk(ctx: DecoratorContext, target: ModelProperty) {
@@ -85,6 +108,35 @@ export function $makeEnumJava(ctx: DecoratorContext, target: Enum) {
   setExtension(ctx.program, target, "x-enumMembers", members);
 }
 
+// ===== オペレーション系 =====
+export function $listResponse(
+  ctx: DecoratorContext,
+  target: Operation,
+  mode?: string,
+  pageSize?: number
+) {
+  setExtension(ctx.program, target, "x-listResponse", {
+    mode: mode ?? "page",
+    // 未指定の場合はジェネレーター設定（list_endpoints.page_size）を使用
+    ...(pageSize !== undefined ? { pageSize } : {}),
+  });
+}
+
+export function $cacheable(
+  ctx: DecoratorContext,
+  target: Operation,
+  maxAge?: number,
+  scope?: string,
+  clientTtl?: number
+) {
+  setExtension(ctx.program, target, "x-cache", {
+    maxAge: maxAge ?? 60,
+    scope: scope ?? "private",
+    // Angularサービスのクライアントキャッシュ（angular_features.request_cache）のTTL秒
+    ...(clientTtl !== undefined ? { clientTtl } : {}),
+  });
+}
+
 // ===== バリデーション系 =====
 export function $unitCheckString(ctx: DecoratorContext, target: ModelProperty, pattern?: string) {
   setExtension(ctx.program, target, "x-unitCheckString", pattern || "all");
@@ -1,79 +1,43 @@
 -- サンプルデータ挿入
 -- 作成日: 2025-09-11
+-- 外部キーの依存関係順（models → model_values → model_value_validations）に
+-- COPYで一括ロードします（初期化時の空データベースが前提のため、IDは明示指定）
 
--- 共通モデルの例
-INSERT INTO models (name, description, is_common, is_active, api_id) VALUES
-    ('BaseEntity', '共通基底エンティティ', true, true, NULL),
-    ('ErrorResponse', '標準エラーレスポンス', true, true, NULL),
-    ('PaginationInfo', 'ページネーション情報', true, true, NULL)
-ON CONFLICT DO NOTHING;
+\set ON_ERROR_STOP on
+
+BEGIN;
 
--- BaseEntityのフィールド
-WITH base_model AS (SELECT id FROM models WHERE name = 'BaseEntity' AND is_common = true)
-INSERT INTO model_values (model_id, name, field_type, description, is_required, sort_order)
-SELECT 
-    base_model.id,
-    field_data.name,
-    field_data.field_type,
-    field_data.description,
-    field_data.is_required,
-    field_data.sort_order
-FROM base_model, (VALUES
-    ('id', 'string', 'エンティティID', true, 1),
-    ('createdAt', 'datetime', '作成日時', true, 2),
-    ('updatedAt', 'datetime', '更新日時', true, 3)
-) AS field_data(name, field_type, description, is_required, sort_order);
+-- 共通モデルの例
+COPY models (id, name, description, is_common, is_active, api_id) FROM STDIN WITH (FORMAT csv, NULL '\N');
+1,BaseEntity,共通基底エンティティ,true,true,\N
+2,ErrorResponse,標準エラーレスポンス,true,true,\N
+3,PaginationInfo,ページネーション情報,true,true,\N
+\.
 
--- ErrorResponseのフィールド  
-WITH error_model AS (SELECT id FROM models WHERE name = 'ErrorResponse' AND is_common = true)
-INSERT INTO model_values (model_id, name, field_type, description, is_required, sort_order)
-SELECT 
-    error_model.id,
-    field_data.name,
-    field_data.field_type,
-    field_data.description,
-    field_data.is_required,
-    field_data.sort_order
-FROM error_model, (VALUES
-    ('code', 'string', 'エラーコード', true, 1),
-    ('message', 'string', 'エラーメッセージ', true, 2),
-    ('details', 'string', 'エラー詳細', false, 3)
-) AS field_data(name, field_type, description, is_required, sort_order);
+-- BaseEntity(1) / ErrorResponse(2) / PaginationInfo(3) のフィールド
+COPY model_values (id, model_id, name, field_type, description, is_required, sort_order) FROM STDIN WITH (FORMAT csv, NULL '\N');
+1,1,id,string,エンティティID,true,1
+2,1,createdAt,datetime,作成日時,true,2
+3,1,updatedAt,datetime,更新日時,true,3
+4,2,code,string,エラーコード,true,1
+5,2,message,string,エラーメッセージ,true,2
+6,2,details,string,エラー詳細,false,3
+7,3,page,integer,ページ番号,true,1
+8,3,size,integer,ページサイズ,true,2
+9,3,total,integer,総件数,true,3
+10,3,totalPages,integer,総ページ数,true,4
+\.
 
--- PaginationInfoのフィールド
-WITH pagination_model AS (SELECT id FROM models WHERE name = 'PaginationInfo' AND is_common = true)
-INSERT INTO model_values (model_id, name, field_type, description, is_required, sort_order)
-SELECT 
-    pagination_model.id,
-    field_data.name,
-    field_data.field_type,
-    field_data.description,
-    field_data.is_required,
-    field_data.sort_order
-FROM pagination_model, (VALUES
-    ('page', 'integer', 'ページ番号', true, 1),
-    ('size', 'integer', 'ページサイズ', true, 2),
-    ('total', 'integer', '総件数', true, 3),
-    ('totalPages', 'integer', '総ページ数', true, 4)
-) AS field_data(name, field_type, description, is_required, sort_order);
+-- バリデーション制約の例（PaginationInfo.page / PaginationInfo.size）
+COPY model_value_validations (id, model_value_id, validation_type, validation_value) FROM STDIN WITH (FORMAT csv, NULL '\N');
+1,7,minimum,1
+2,8,minimum,1
+3,8,maximum,100
+\.
 
--- バリデーション制約の例
-WITH page_field AS (
-    SELECT mv.id FROM model_values mv
-    JOIN models m ON mv.model_id = m.id
-    WHERE m.name = 'PaginationInfo' AND mv.name = 'page'
-)
-INSERT INTO model_value_validations (model_value_id, validation_type, validation_value)
-SELECT page_field.id, 'minimum', '1' FROM page_field;
+-- 明示指定したIDの後からSERIALが採番されるようにシーケンスを進める
+SELECT setval(pg_get_serial_sequence('models', 'id'), COALESCE(MAX(id), 0) + 1, false) FROM models;
+SELECT setval(pg_get_serial_sequence('model_values', 'id'), COALESCE(MAX(id), 0) + 1, false) FROM model_values;
+SELECT setval(pg_get_serial_sequence('model_value_validations', 'id'), COALESCE(MAX(id), 0) + 1, false) FROM model_value_validations;
 
-WITH size_field AS (
-    SELECT mv.id FROM model_values mv
-    JOIN models m ON mv.model_id = m.id
-    WHERE m.name = 'PaginationInfo' AND mv.name = 'size'
-)
-INSERT INTO model_value_validations (model_value_id, validation_type, validation_value)
-SELECT size_field.id, validation_type, validation_value
-FROM size_field, (VALUES
-    ('minimum', '1'),
-    ('maximum', '100')
-) AS validation_data(validation_type, validation_value);
\ No newline at end of file
+COMMIT;
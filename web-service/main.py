@@ -1,7 +1,7 @@
 from fastapi import FastAPI, Request, Form, HTTPException, Depends
 from fastapi.templating import Jinja2Templates
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse
 from typing import List, Optional, Dict, Any
 import json
 import os
@@ -11,6 +11,7 @@ from database import get_db
 from services.database_api_service import DatabaseApiService
 from services.database_common_models_service import DatabaseCommonModelsService
 from services.database_enum_service import DatabaseEnumService
+from services.generation_job_service import GenerationJobService
 
 app = FastAPI(
     title="TypeSpec Generator Web Service",
@@ -29,6 +30,15 @@ logger = logging.getLogger(__name__)
 # Workspace path from environment
 WORKSPACE_PATH = os.getenv("WORKSPACE_PATH", "/workspace")
 
+# TypeSpecコンパイル・Spring Boot生成の非同期ジョブ
+job_service = GenerationJobService(WORKSPACE_PATH)
+
+
+@app.on_event("shutdown")
+async def shutdown_job_service():
+    """生成ワーカーを停止"""
+    job_service.shutdown()
+
 
 @app.get("/", response_class=HTMLResponse)
 async def index(request: Request, db: Session = Depends(get_db)):
@@ -116,6 +126,59 @@ async def get_status():
     except Exception as e:
         return {"error": str(e)}
 
+def submit_job(kind: str, api_name: str) -> JSONResponse:
+    """ジョブを登録して202を返す（同じAPIの待機中ジョブがあれば合流）"""
+    try:
+        job, coalesced = job_service.submit(kind, api_name)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return JSONResponse(status_code=202, content={**job.to_dict(), "coalesced": coalesced})
+
+@app.post("/api/compile/{api_name}")
+async def compile_api(api_name: str):
+    """TypeSpecコンパイルジョブを登録"""
+    return submit_job("compile", api_name)
+
+@app.post("/api/generate-spring/{api_name}")
+async def generate_spring(api_name: str):
+    """Spring Boot生成ジョブを登録"""
+    return submit_job("generate-spring", api_name)
+
+@app.get("/api/jobs")
+async def get_jobs():
+    """ジョブ一覧を取得（新しい順）"""
+    return job_service.list_jobs()
+
+@app.get("/api/jobs/{job_id}")
+async def get_job(job_id: str):
+    """ジョブの状態・結果を取得（ポーリング用）"""
+    job = job_service.get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="ジョブが見つかりません")
+    return job.to_dict()
+
+@app.get("/api/jobs/{job_id}/events")
+async def get_job_events(job_id: str):
+    """ジョブのイベントをServer-Sent Eventsで配信（完了イベントの送信後に切断）"""
+    job = job_service.get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="ジョブが見つかりません")
+
+    async def event_stream():
+        async for event in job_service.stream_events(job):
+            if event is None:
+                # プロキシに切断されないよう接続維持のコメントを送る
+                yield ": keepalive\n\n"
+                continue
+            data = {key: value for key, value in event.items() if key != "event"}
+            yield f"event: {event['event']}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @app.get("/api/common-models")
 async def get_common_models(db: Session = Depends(get_db)):
     """既存の共通モデル一覧を取得"""
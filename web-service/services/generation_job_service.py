@@ -0,0 +1,492 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+import re
+import shlex
+import sys
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+# ジョブの種類（compile: TypeSpecコンパイル / generate-spring: Spring Boot・JUnit生成）
+JOB_KINDS = ('compile', 'generate-spring')
+
+# 完了状態
+FINISHED_STATUSES = ('succeeded', 'failed')
+
+# API名の形式（app.js の validateApiName と同じ。コマンド引数・ファイルパスに使用するため厳密に検証）
+API_NAME_PATTERN = re.compile(r'^[a-z][a-z0-9-]*$')
+
+# TypeSpecコンパイルの実行先（web-serviceコンテナにはNode.js・TypeSpecがないため、どちらも未指定の場合はコンパイルできない）
+#   TYPESPEC_COMPILE_URL    : typespecコンテナのコンパイルサーバー（typespec/compile-server.js、docker-compose.yml で指定）
+#   TYPESPEC_COMPILE_COMMAND: コマンド（{api_name} を置換し、ワークスペースの typespec/ で実行。指定時はこちらを優先）
+COMPILE_EXIT_MARKER = "__TYPESPEC_COMPILE_EXIT__"
+DEFAULT_COMPILE_TIMEOUT = 300
+DEFAULT_COMPILE_CONCURRENCY = 2
+
+# Spring Boot生成ジョブで再生成する対象（spring のマニフェストから junit-test を生成）
+GENERATION_TARGETS = ('spring', 'junit-test')
+
+# 保持する完了済みジョブ数・コマンド出力の最大長
+MAX_FINISHED_JOBS = 100
+MAX_OUTPUT_CHARS = 20000
+
+# SSEの接続維持コメントを送る間隔（秒）
+KEEPALIVE_SECONDS = 15
+
+# 生成ワーカーの最後の進捗イベントを待つ時間（秒）
+PROGRESS_DRAIN_SECONDS = 5
+
+# ワーカープロセス内で保持する常駐ジェネレーター（プロセスごとに1度だけ初期化）
+_worker_daemons = {}
+
+# ワーカープロセスから親プロセスへ進捗イベントを送るキュー（ジョブID, イベント名, データ）
+_progress_queue = None
+
+
+def init_generation_worker(workspace_path: str, progress_queue=None):
+    """生成ワーカーの初期化（generatorパッケージを読み込めるようにし、相対パスの出力先をワークスペース基準にする）"""
+    global _progress_queue
+    os.chdir(workspace_path)
+    if workspace_path not in sys.path:
+        sys.path.insert(0, workspace_path)
+    logging.basicConfig(level=logging.INFO)
+    _progress_queue = progress_queue
+
+
+def run_generation_job(workspace_path: str, api_name: str, job_id: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+    """Spring Boot・JUnit生成（ワーカープロセスで実行）
+
+    ジェネレーター・コンパイル済みテンプレート・パース済み仕様はワーカー内に保持し、次のジョブで再利用する。
+    生成対象の開始・終了とファイル書き込みの進捗は進捗キューで親プロセスへ送る
+    """
+    from generator.scripts.instrumentation import metrics
+    from generator.scripts.watch_daemon import GeneratorDaemon
+
+    daemon = _worker_daemons.get(workspace_path)
+    if daemon is None:
+        workspace = Path(workspace_path)
+        daemon = _worker_daemons[workspace_path] = GeneratorDaemon(
+            workspace / "output" / "openapi",
+            str(workspace / "config" / "generator_config.yaml"),
+            GENERATION_TARGETS
+        )
+        # Spring・JUnitの生成後に1回だけ履歴を記録する
+        daemon.record_artifacts = False
+
+    if _progress_queue is not None and job_id is not None:
+        metrics.set_progress(lambda event, data: _progress_queue.put((job_id, event, data)))
+    try:
+        results = {}
+        for target in GENERATION_TARGETS:
+            results[target] = daemon.regenerate([target], [api_name])
+            if not results[target]['ok']:
+                # Spring生成に失敗した場合は古いマニフェストからテストを生成しない
+                break
+        generated = [target for target, result in results.items() if result['targets']]
+        if generated:
+            daemon.record_artifacts_run(generated)
+    finally:
+        metrics.set_progress(None)
+        if _progress_queue is not None and job_id is not None:
+            # キューは送信順に届くため、この終端イベントの受信後に完了を通知すれば進捗が欠けない
+            _progress_queue.put((job_id, 'end', {}))
+    return results
+
+
+@dataclass
+class GenerationJob:
+    """生成ジョブ"""
+    id: str
+    kind: str
+    api_name: str
+    created_at: str
+    status: str = 'queued'  # queued / running / succeeded / failed
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+    requests: int = 1  # 合流したリクエスト数
+    result: Optional[Dict[str, Any]] = None  # app.js の showResultModal 形式
+    events: List[Dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATUSES
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "api_name": self.api_name,
+            "status": self.status,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "requests": self.requests,
+            "result": self.result,
+            "status_url": f"/api/jobs/{self.id}",
+            "events_url": f"/api/jobs/{self.id}/events"
+        }
+
+
+class GenerationJobService:
+    """TypeSpecコンパイル・Spring Boot生成の非同期ジョブ管理サービス
+
+    同じ種類・同じAPIの待機中ジョブがあれば新しいジョブを作らずに合流させる。
+    Spring Boot生成は出力先（マニフェスト・Patternsクラス等）を全APIで共有するため1件ずつ実行する。
+    """
+
+    def __init__(self, workspace_path: str):
+        self.workspace_path = Path(workspace_path)
+        self.compile_command = os.getenv("TYPESPEC_COMPILE_COMMAND", "")
+        self.compile_url = os.getenv("TYPESPEC_COMPILE_URL", "")
+        self.compile_timeout = int(os.getenv("TYPESPEC_COMPILE_TIMEOUT", DEFAULT_COMPILE_TIMEOUT))
+
+        self.jobs: Dict[str, GenerationJob] = {}
+        self._queued: Dict[Tuple[str, str], GenerationJob] = {}
+        self._key_locks: Dict[Tuple[str, str], asyncio.Lock] = {}
+        self._slots = {
+            'compile': asyncio.Semaphore(int(os.getenv("TYPESPEC_COMPILE_CONCURRENCY", DEFAULT_COMPILE_CONCURRENCY))),
+            'generate-spring': asyncio.Semaphore(1)
+        }
+        self._changed = asyncio.Condition()
+        self._tasks = set()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._progress_queue = None
+        self._progress_done: Dict[str, asyncio.Event] = {}
+
+    def submit(self, kind: str, api_name: str) -> Tuple[GenerationJob, bool]:
+        """ジョブを登録（同じ種類・APIの待機中ジョブがあれば合流）
+
+        Returns:
+            (ジョブ, 既存ジョブに合流したか)
+        """
+        if kind not in JOB_KINDS:
+            raise ValueError(f"未対応のジョブです: {kind}")
+        if not API_NAME_PATTERN.match(api_name):
+            raise ValueError(f"API名が不正です: {api_name}（英小文字で始まる英小文字・数字・ハイフン）")
+
+        key = (kind, api_name)
+        queued = self._queued.get(key)
+        if queued is not None:
+            queued.requests += 1
+            return queued, True
+
+        job = GenerationJob(id=uuid.uuid4().hex, kind=kind, api_name=api_name, created_at=datetime.now().isoformat())
+        self.jobs[job.id] = job
+        self._queued[key] = job
+        job.events.append({"event": "status", "job": job.to_dict()})
+        self.prune_jobs()
+
+        task = asyncio.create_task(self.run_job(job))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        logger.info(f"ジョブを登録しました: {kind} {api_name} ({job.id})")
+        return job, False
+
+    def get_job(self, job_id: str) -> Optional[GenerationJob]:
+        return self.jobs.get(job_id)
+
+    def list_jobs(self) -> List[Dict[str, Any]]:
+        """ジョブ一覧（新しい順）"""
+        return [job.to_dict() for job in sorted(self.jobs.values(), key=lambda job: job.created_at, reverse=True)]
+
+    def prune_jobs(self):
+        """古い完了済みジョブを破棄"""
+        finished = sorted((job for job in self.jobs.values() if job.finished), key=lambda job: job.created_at)
+        for job in finished[:max(len(finished) - MAX_FINISHED_JOBS, 0)]:
+            del self.jobs[job.id]
+
+    async def publish(self, job: GenerationJob, event: str, data: Dict[str, Any]):
+        """ジョブのイベントを記録し、SSEの購読者に通知"""
+        job.events.append({"event": event, **data})
+        async with self._changed:
+            self._changed.notify_all()
+
+    async def set_status(self, job: GenerationJob, status: str, result: Optional[Dict[str, Any]] = None):
+        job.status = status
+        if status == 'running':
+            job.started_at = datetime.now().isoformat()
+        if status in FINISHED_STATUSES:
+            job.finished_at = datetime.now().isoformat()
+            job.result = result
+        await self.publish(job, "status", {"job": job.to_dict()})
+
+    async def run_job(self, job: GenerationJob):
+        """ジョブを実行（同じ種類・APIのジョブは順番に、種類ごとの同時実行数の範囲で実行）"""
+        key = (job.kind, job.api_name)
+        async with self._key_locks.setdefault(key, asyncio.Lock()), self._slots[job.kind]:
+            # 実行開始後のリクエストは、実行中の入力より新しい変更を含みうるため次のジョブに合流させる
+            if self._queued.get(key) is job:
+                del self._queued[key]
+            await self.set_status(job, 'running')
+            try:
+                if job.kind == 'compile':
+                    result = await self.compile_api(job)
+                else:
+                    result = await self.generate_spring(job)
+            except Exception as e:
+                logger.exception(f"ジョブの実行でエラーが発生しました: {job.kind} {job.api_name}")
+                result = {"status": "error", "message": f"ジョブの実行でエラーが発生しました: {e}"}
+        await self.set_status(job, 'succeeded' if result["status"] == "success" else 'failed', result)
+        logger.info(f"ジョブが完了しました: {job.kind} {job.api_name} ({job.id}) -> {job.status}")
+
+    async def compile_api(self, job: GenerationJob) -> Dict[str, Any]:
+        """TypeSpecコンパイル（OpenAPI仕様を output/openapi/ に出力）"""
+        if self.compile_command:
+            output_source = self.iter_compile_command_output
+        elif self.compile_url:
+            output_source = self.iter_compile_server_output
+        else:
+            return {
+                "status": "error",
+                "message": "TypeSpecコンパイルが設定されていません"
+                           "（TYPESPEC_COMPILE_URL または TYPESPEC_COMPILE_COMMAND を指定してください）"
+            }
+
+        started = time.perf_counter()
+        await self.publish(job, "stage", {"target": "compile", "state": "started", "index": 0, "total": 1})
+        outcome: Dict[str, Any] = {"returncode": None, "error": None}
+        output_lines = output_source(job.api_name, outcome)
+        lines = deque()
+        line_chars = 0
+
+        async def read_output():
+            # 出力を1行ずつSSEで配信し、結果表示用に末尾のみ保持する
+            nonlocal line_chars
+            async for line in output_lines:
+                lines.append(line)
+                line_chars += len(line)
+                while line_chars > MAX_OUTPUT_CHARS and len(lines) > 1:
+                    line_chars -= len(lines.popleft())
+                await self.publish(job, "output", {"line": line.rstrip("\n")})
+
+        try:
+            await asyncio.wait_for(read_output(), timeout=self.compile_timeout)
+        except asyncio.TimeoutError:
+            await self.publish_stage_end(job, "compile", False, started)
+            return {
+                "status": "error",
+                "message": f"TypeSpecコンパイルが{self.compile_timeout}秒以内に完了しませんでした",
+                "output": "".join(lines)
+            }
+        finally:
+            # コンパイルプロセスの停止・サーバーとの接続の切断
+            await output_lines.aclose()
+
+        output = "".join(lines)[-MAX_OUTPUT_CHARS:]
+        returncode = outcome["returncode"]
+        await self.publish_stage_end(job, "compile", returncode == 0, started)
+        if outcome["error"]:
+            return {"status": "error", "message": outcome["error"], "output": output}
+        if returncode != 0:
+            return {
+                "status": "error",
+                "message": f"TypeSpecコンパイルに失敗しました（終了コード {returncode}）",
+                "output": output
+            }
+        return {"status": "success", "message": f"{job.api_name} APIをコンパイルしました", "output": output}
+
+    async def iter_compile_command_output(self, api_name: str, outcome: Dict[str, Any]) -> AsyncIterator[str]:
+        """TYPESPEC_COMPILE_COMMAND を実行し、出力を1行ずつ返す（終了コードは outcome に設定）"""
+        command = shlex.split(self.compile_command.format(api_name=api_name))
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *command,
+                cwd=str(self.workspace_path / "typespec"),
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.STDOUT
+            )
+        except FileNotFoundError:
+            outcome["error"] = (
+                f"TypeSpecのコンパイルコマンドが見つかりません: {command[0]}"
+                "（TYPESPEC_COMPILE_COMMAND の指定を確認してください）"
+            )
+            return
+
+        try:
+            async for raw_line in process.stdout:
+                yield raw_line.decode("utf-8", errors="replace")
+            outcome["returncode"] = await process.wait()
+        finally:
+            if process.returncode is None:
+                process.kill()
+                await process.wait()
+
+    async def iter_compile_server_output(self, api_name: str, outcome: Dict[str, Any]) -> AsyncIterator[str]:
+        """typespecコンテナのコンパイルサーバーでコンパイルし、出力を1行ずつ返す（終了コードは outcome に設定）
+
+        応答は出力をそのまま流し、最終行で終了コードを通知する（HTTP/1.0で送信し、チャンク形式にしない）。
+        切断するとサーバー側でコンパイルを停止する
+        """
+        url = urlsplit(self.compile_url)
+        try:
+            reader, writer = await asyncio.open_connection(url.hostname, url.port or 80)
+        except OSError as e:
+            outcome["error"] = f"TypeSpecコンパイルサーバーに接続できません: {self.compile_url}（{e}）"
+            return
+
+        try:
+            path = f"{url.path.rstrip('/')}/compile/{api_name}"
+            writer.write(f"POST {path} HTTP/1.0\r\nHost: {url.netloc}\r\nContent-Length: 0\r\n\r\n".encode("ascii"))
+            await writer.drain()
+
+            status_line = (await reader.readline()).decode("latin-1").split()
+            while (await reader.readline()).strip():
+                pass  # ヘッダーは使用しない
+            status = int(status_line[1]) if len(status_line) > 1 and status_line[1].isdigit() else 0
+            if status != 200:
+                body = (await reader.read(MAX_OUTPUT_CHARS)).decode("utf-8", errors="replace").strip()
+                outcome["error"] = f"TypeSpecコンパイルサーバーがエラーを返しました（{status}）: {body}"
+                return
+
+            async for raw_line in reader:
+                line = raw_line.decode("utf-8", errors="replace")
+                if line.startswith(COMPILE_EXIT_MARKER):
+                    outcome["returncode"] = int(line.split()[1])
+                    continue
+                yield line
+            if outcome["returncode"] is None:
+                outcome["error"] = "TypeSpecコンパイルサーバーとの接続がコンパイルの完了前に切断されました"
+        except OSError as e:
+            outcome["error"] = f"TypeSpecコンパイルサーバーとの通信に失敗しました: {e}"
+        finally:
+            writer.close()
+
+    async def publish_stage_end(self, job: GenerationJob, target: str, ok: bool, started: float):
+        """ステージの終了イベント（生成ワーカーの watch_daemon と同じ形式）"""
+        await self.publish(job, "stage", {
+            "target": target,
+            "state": "finished" if ok else "failed",
+            "index": 0,
+            "total": 1,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 3)
+        })
+
+    def get_executor(self) -> ProcessPoolExecutor:
+        """生成ワーカーを取得（初回のみ起動。Webサーバーのスレッド・DB接続を引き継がないよう spawn で起動）"""
+        if self._executor is None:
+            context = multiprocessing.get_context("spawn")
+            self._progress_queue = context.Queue()
+            self._executor = ProcessPoolExecutor(
+                max_workers=1,
+                mp_context=context,
+                initializer=init_generation_worker,
+                initargs=(str(self.workspace_path), self._progress_queue)
+            )
+            task = asyncio.create_task(self.pump_progress(self._progress_queue))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        return self._executor
+
+    async def pump_progress(self, progress_queue):
+        """生成ワーカーの進捗イベントをジョブのイベントとして配信（None を受け取ると終了）"""
+        loop = asyncio.get_running_loop()
+        while True:
+            item = await loop.run_in_executor(None, progress_queue.get)
+            if item is None:
+                return
+            job_id, event, data = item
+            if event == 'end':
+                done = self._progress_done.get(job_id)
+                if done is not None:
+                    done.set()
+                continue
+            job = self.jobs.get(job_id)
+            if job is not None and not job.finished:
+                await self.publish(job, event, data)
+
+    def stop_progress_pump(self):
+        """進捗キューの読み取りを終了"""
+        if self._progress_queue is not None:
+            self._progress_queue.put(None)
+            self._progress_queue = None
+
+    async def generate_spring(self, job: GenerationJob) -> Dict[str, Any]:
+        """Spring Boot・JUnit生成（ワーカープロセスの常駐ジェネレーターで実行）"""
+        spec_file = self.workspace_path / "output" / "openapi" / f"{job.api_name}.yaml"
+        if not spec_file.exists():
+            return {
+                "status": "error",
+                "message": f"OpenAPI仕様が見つかりません: output/openapi/{spec_file.name}（先にTypeSpecコンパイルを実行してください）"
+            }
+
+        loop = asyncio.get_running_loop()
+        done = self._progress_done[job.id] = asyncio.Event()
+        try:
+            results = await loop.run_in_executor(
+                self.get_executor(), run_generation_job, str(self.workspace_path), job.api_name, job.id
+            )
+            # 完了イベントより前に進捗イベントを配信し終える
+            try:
+                await asyncio.wait_for(done.wait(), timeout=PROGRESS_DRAIN_SECONDS)
+            except asyncio.TimeoutError:
+                logger.warning(f"生成ワーカーの進捗イベントを受信しきれませんでした: {job.id}")
+        except BrokenProcessPool:
+            # ワーカーが異常終了した場合は次のジョブで起動し直す
+            self._executor = None
+            self.stop_progress_pump()
+            return {"status": "error", "message": "生成ワーカーが異常終了しました。もう一度実行してください"}
+        finally:
+            del self._progress_done[job.id]
+
+        failed = [result for result in results.values() if not result['ok']]
+        result = {
+            "status": "error" if failed else "success",
+            "message": (
+                f"{job.api_name} APIのSpring Boot生成に失敗しました" if failed
+                else f"{job.api_name} APIのSpring Boot・JUnitコードを生成しました"
+            ),
+            "spring_output": self.describe_generation(results.get('spring'))
+        }
+        if 'junit-test' in results:
+            result["junit_output"] = self.describe_generation(results['junit-test'])
+        return result
+
+    def describe_generation(self, result: Optional[Dict[str, Any]]) -> str:
+        """生成結果の表示用テキスト"""
+        if result is None:
+            return ""
+        counters = result.get('counters', {})
+        lines = [
+            f"書き込みファイル: {counters.get('files_written', 0)}件（{counters.get('bytes_written', 0):,}バイト）",
+            f"処理時間: {result['elapsed_ms']:.0f}ms"
+        ]
+        if counters.get('cache_hits'):
+            lines.append(f"キャッシュ利用: {counters['cache_hits']}件")
+        lines.extend(f"エラー（{target}）: {error}" for target, error in result.get('errors', {}).items())
+        return "\n".join(lines)
+
+    async def stream_events(self, job: GenerationJob) -> AsyncIterator[Optional[Dict[str, Any]]]:
+        """ジョブのイベントを順に返す（完了イベントで終了。一定時間イベントがない場合はNoneを返す）"""
+        index = 0
+        while True:
+            while index < len(job.events):
+                yield job.events[index]
+                index += 1
+            if job.finished:
+                return
+            try:
+                async with self._changed:
+                    await asyncio.wait_for(
+                        self._changed.wait_for(lambda: len(job.events) > index),
+                        timeout=KEEPALIVE_SECONDS
+                    )
+            except asyncio.TimeoutError:
+                yield None
+
+    def shutdown(self):
+        """生成ワーカーを停止"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        self.stop_progress_pump()
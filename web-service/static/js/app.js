@@ -52,28 +52,58 @@ async function checkSystemStatus() {
  * TypeSpecコンパイル実行
  */
 async function compileApi(apiName) {
-    const button = event.target;
+    await runJobFromButton(event.target, `/api/compile/${apiName}`, 'TypeSpecコンパイル結果', 'コンパイル中...');
+}
+
+/**
+ * Spring Boot生成実行
+ */
+async function generateSpring(apiName) {
+    await runJobFromButton(event.target, `/api/generate-spring/${apiName}`, 'Spring Boot生成結果', '生成中...');
+}
+
+/**
+ * ボタンからジョブを登録し、実行中は進捗を、完了後は結果を結果モーダルに表示
+ */
+async function runJobFromButton(button, url, title, runningText) {
     const originalText = button.textContent;
+    const setButtonText = (text) => {
+        button.innerHTML = `<span class="spinner-border spinner-border-sm me-1"></span>${text}`;
+    };
+    const progress = createJobProgress(title);
     
     try {
         // ボタン状態変更
         button.disabled = true;
-        button.innerHTML = '<span class="spinner-border spinner-border-sm me-1"></span>コンパイル中...';
+        setButtonText(runningText);
         
-        const response = await fetch(`/api/compile/${apiName}`, {
+        const response = await fetch(url, {
             method: 'POST'
         });
+        const job = await response.json();
+        if (!response.ok) {
+            throw new Error(job.detail || `HTTP ${response.status}`);
+        }
         
-        const data = await response.json();
+        // 同じAPIのジョブ実行中は待機中と表示
+        const finishedJob = await waitForJob(job, (current) => {
+            setButtonText(current.status === 'queued' ? '待機中...' : runningText);
+            progress.update('status', current);
+        }, progress.update);
         
         // 結果表示
-        showResultModal('TypeSpecコンパイル結果', data);
+        showResultModal(title, finishedJob.result || {
+            status: 'error',
+            message: 'ジョブの結果を取得できませんでした'
+        }, progress.stages);
         
     } catch (error) {
-        console.error('コンパイルエラー:', error);
-        showResultModal('TypeSpecコンパイル結果', {
+        console.error(`${title}エラー:`, error);
+        // 進捗表示を終了してからエラーを表示
+        progress.update('status', { status: 'failed' });
+        showResultModal(title, {
             status: 'error',
-            message: `コンパイルエラー: ${error.message}`
+            message: `エラー: ${error.message}`
         });
     } finally {
         // ボタン状態復元
@@ -83,44 +113,186 @@ async function compileApi(apiName) {
 }
 
 /**
- * Spring Boot生成実行
+ * ジョブの完了を待機（Server-Sent Eventsで状態・進捗を受信し、接続できない場合は状態のみポーリング）
  */
-async function generateSpring(apiName) {
-    const button = event.target;
-    const originalText = button.textContent;
-    
-    try {
-        // ボタン状態変更
-        button.disabled = true;
-        button.innerHTML = '<span class="spinner-border spinner-border-sm me-1"></span>生成中...';
+function waitForJob(job, onStatus, onProgress = () => {}) {
+    return new Promise((resolve, reject) => {
+        if (!window.EventSource) {
+            pollJob(job, onStatus).then(resolve, reject);
+            return;
+        }
         
-        const response = await fetch(`/api/generate-spring/${apiName}`, {
-            method: 'POST'
+        const source = new EventSource(job.events_url);
+        source.addEventListener('status', (event) => {
+            const current = JSON.parse(event.data).job;
+            onStatus(current);
+            if (isJobFinished(current)) {
+                source.close();
+                resolve(current);
+            }
+        });
+        // ステージの開始・終了、書き込み済みファイル数、コマンド出力
+        ['stage', 'progress', 'output'].forEach((type) => {
+            source.addEventListener(type, (event) => onProgress(type, JSON.parse(event.data)));
         });
+        source.onerror = () => {
+            source.close();
+            pollJob(job, onStatus).then(resolve, reject);
+        };
+    });
+}
+
+/**
+ * ジョブの状態をポーリング
+ */
+async function pollJob(job, onStatus, intervalMs = 1000) {
+    while (true) {
+        const response = await fetch(job.status_url);
+        if (!response.ok) {
+            throw new Error(`ジョブの状態を取得できませんでした（HTTP ${response.status}）`);
+        }
+        const current = await response.json();
+        onStatus(current);
+        if (isJobFinished(current)) {
+            return current;
+        }
+        await new Promise(resolve => setTimeout(resolve, intervalMs));
+    }
+}
+
+/**
+ * ジョブが完了したか
+ */
+function isJobFinished(job) {
+    return job.status === 'succeeded' || job.status === 'failed';
+}
+
+/**
+ * ジョブの進捗表示（結果モーダルに表示し、完了時に showResultModal で結果に置き換える）
+ */
+function createJobProgress(title, maxLines = 200) {
+    const state = {
+        status: 'queued',
+        stages: [],
+        progress: null,
+        lines: [],
+        startedAt: Date.now(),
+        renderPending: false
+    };
+    
+    const render = () => {
+        state.renderPending = false;
+        const contentElement = document.getElementById('resultContent');
+        // 完了後（結果表示済み）は描画しない
+        if (!contentElement || state.status === 'succeeded' || state.status === 'failed') return;
         
-        const data = await response.json();
+        const elapsed = ((Date.now() - state.startedAt) / 1000).toFixed(1);
+        let contentHtml = `
+            <div class="alert alert-info">
+                <h6>${state.status === 'queued' ? '待機中' : '実行中'}</h6>
+                <p class="mb-0">経過時間: ${elapsed}秒</p>
+            </div>
+        `;
         
-        // 結果表示
-        showResultModal('Spring Boot生成結果', data);
+        if (state.stages.length > 0) {
+            contentHtml += '<ul class="list-group mb-3">';
+            state.stages.forEach((stage) => {
+                const badge = stage.state === 'started' ?
+                    '<span class="spinner-border spinner-border-sm"></span>' :
+                    `<span class="badge ${stage.state === 'finished' ? 'bg-success' : 'bg-danger'}">${formatStageTime(stage)}</span>`;
+                contentHtml += `
+                    <li class="list-group-item d-flex justify-content-between align-items-center">
+                        ${escapeHtml(stage.target)}
+                        ${badge}
+                    </li>
+                `;
+            });
+            contentHtml += '</ul>';
+        }
         
-    } catch (error) {
-        console.error('Spring生成エラー:', error);
-        showResultModal('Spring Boot生成結果', {
-            status: 'error',
-            message: `Spring生成エラー: ${error.message}`
-        });
-    } finally {
-        // ボタン状態復元
-        button.disabled = false;
-        button.textContent = originalText;
-    }
+        if (state.progress) {
+            const file = state.progress.file ? `（${escapeHtml(state.progress.file)}）` : '';
+            contentHtml += `
+                <p class="text-muted">
+                    書き込みファイル: ${state.progress.files_written}件
+                    ${state.progress.bytes_written.toLocaleString()}バイト${file}
+                </p>
+            `;
+        }
+        
+        if (state.lines.length > 0) {
+            contentHtml += `
+                <div class="mt-3">
+                    <h6>出力:</h6>
+                    <div class="code-block">${escapeHtml(state.lines.join('\n'))}</div>
+                </div>
+            `;
+        }
+        
+        contentElement.innerHTML = contentHtml;
+    };
+    
+    // 大量のイベントを受信しても描画は1フレームに1回
+    const scheduleRender = () => {
+        if (state.renderPending) return;
+        state.renderPending = true;
+        requestAnimationFrame(render);
+    };
+    
+    const update = (type, data) => {
+        if (type === 'status') {
+            state.status = data.status;
+        } else if (type === 'stage') {
+            const stage = state.stages.find((item) => item.target === data.target);
+            if (stage) {
+                Object.assign(stage, data);
+            } else {
+                state.stages.push({ ...data });
+            }
+            if (data.state === 'started') {
+                state.progress = null;
+            }
+        } else if (type === 'progress') {
+            state.progress = data;
+        } else if (type === 'output') {
+            state.lines.push(data.line);
+            if (state.lines.length > maxLines) {
+                state.lines.shift();
+            }
+        }
+        scheduleRender();
+    };
+    
+    document.getElementById('resultModalTitle').textContent = title;
+    bootstrap.Modal.getOrCreateInstance(document.getElementById('resultModal')).show();
+    // イベントがなくても経過時間を更新
+    const timer = setInterval(() => {
+        if (state.status === 'succeeded' || state.status === 'failed') {
+            clearInterval(timer);
+            return;
+        }
+        scheduleRender();
+    }, 1000);
+    render();
+    
+    return { stages: state.stages, update };
+}
+
+/**
+ * ステージの処理時間表示
+ */
+function formatStageTime(stage) {
+    if (stage.elapsed_ms === undefined) return stage.state;
+    return stage.elapsed_ms >= 1000 ?
+        `${(stage.elapsed_ms / 1000).toFixed(1)}秒` :
+        `${Math.round(stage.elapsed_ms)}ms`;
 }
 
 /**
  * 結果モーダル表示
  */
-function showResultModal(title, data) {
-    const modal = new bootstrap.Modal(document.getElementById('resultModal'));
+function showResultModal(title, data, stages = []) {
+    const modal = bootstrap.Modal.getOrCreateInstance(document.getElementById('resultModal'));
     const titleElement = document.getElementById('resultModalTitle');
     const contentElement = document.getElementById('resultContent');
     
@@ -135,33 +307,6 @@ function showResultModal(title, data) {
                 <p>${data.message}</p>
             </div>
         `;
-        
-        if (data.output) {
-            contentHtml += `
-                <div class="mt-3">
-                    <h6>出力:</h6>
-                    <div class="code-block">${escapeHtml(data.output)}</div>
-                </div>
-            `;
-        }
-        
-        if (data.spring_output) {
-            contentHtml += `
-                <div class="mt-3">
-                    <h6>Spring Boot出力:</h6>
-                    <div class="code-block">${escapeHtml(data.spring_output)}</div>
-                </div>
-            `;
-        }
-        
-        if (data.junit_output) {
-            contentHtml += `
-                <div class="mt-3">
-                    <h6>JUnit出力:</h6>
-                    <div class="code-block">${escapeHtml(data.junit_output)}</div>
-                </div>
-            `;
-        }
     } else {
         contentHtml = `
             <div class="alert alert-danger">
@@ -171,6 +316,45 @@ function showResultModal(title, data) {
         `;
     }
     
+    // コマンド・生成処理の出力（失敗時も原因の確認用に表示）
+    if (data.output) {
+        contentHtml += `
+            <div class="mt-3">
+                <h6>出力:</h6>
+                <div class="code-block">${escapeHtml(data.output)}</div>
+            </div>
+        `;
+    }
+    
+    if (data.spring_output) {
+        contentHtml += `
+            <div class="mt-3">
+                <h6>Spring Boot出力:</h6>
+                <div class="code-block">${escapeHtml(data.spring_output)}</div>
+            </div>
+        `;
+    }
+    
+    if (data.junit_output) {
+        contentHtml += `
+            <div class="mt-3">
+                <h6>JUnit出力:</h6>
+                <div class="code-block">${escapeHtml(data.junit_output)}</div>
+            </div>
+        `;
+    }
+    
+    // ステージ別の処理時間（ジョブの進捗イベントを受信した場合）
+    if (stages.length > 0) {
+        const stageLines = stages.map((stage) => `${stage.target}: ${formatStageTime(stage)}`);
+        contentHtml += `
+            <div class="mt-3">
+                <h6>処理時間:</h6>
+                <div class="code-block">${escapeHtml(stageLines.join('\n'))}</div>
+            </div>
+        `;
+    }
+    
     contentElement.innerHTML = contentHtml;
     modal.show();
 }